@@ -1,6 +1,11 @@
 """
 Головний файл для запуску гри судоку
 """
+import time
+
+# Момент старту для хронометражу запуску (до імпорту модулів гри)
+STARTED = time.perf_counter()
+
 import os
 import sys
 
@@ -19,7 +24,7 @@ def main():
 
     try:
         # Створення та запуск гри
-        game = Game()
+        game = Game(started=STARTED)
         game.run()
     except Exception as e:
         print(f"Помилка при запуску гри: {e}")
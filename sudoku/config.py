@@ -1,16 +1,22 @@
 """
 Конфігураційні константи для гри Судоку
 """
+import os
 
 # Розміри сітки
 GRID_SIZE = 9
 SUB_GRID_SIZE = 3
+# Базовий розмір клітинки; фактичний залежить від розміру вікна (ui.layout)
 CELL_SIZE = 60
+# Найменший розмір клітинки, до якого масштабується інтерфейс
+MIN_CELL_SIZE = 20
 
-# Розміри вікна
+# Початкові розміри вікна; в цих же одиницях описані всі екрани
 WINDOW_WIDTH = GRID_SIZE * CELL_SIZE + 30
 WINDOW_HEIGHT = GRID_SIZE * CELL_SIZE + 120
 WINDOW_SIZE = (WINDOW_WIDTH, WINDOW_HEIGHT)
+# Для скількох масштабів тримати шрифти, гліфи та статичні шари
+MAX_CACHED_SCALES = 3
 
 # Кольори
 BLACK = (0, 0, 0)
@@ -23,5 +29,23 @@ RED = (255, 0, 0)
 LIGHT_BLUE = (173, 216, 230)
 LIGHT_BLUE_ALT = (230, 240, 250)
 
+# Головний цикл: True — чекати на події та перемальовувати лише змінене,
+# False — перемальовувати з фіксованою частотою кадрів
+EVENT_DRIVEN_LOOP = True
+
+# Файл CSV для журналу часу фаз кожного кадру; без нього журнал не пишеться
+FRAME_PROFILE_LOG = os.environ.get('SUDOKU_FRAME_LOG')
+
+# Каталог даних гри та кеш шляхів до системних шрифтів
+DATA_DIR = os.path.join(os.path.expanduser('~'), '.sudoku_game')
+FONT_CACHE_PATH = os.path.join(DATA_DIR, 'font_cache.json')
+FONT_NAME = 'Comic Sans MS'
+# Базові розміри шрифтів (масштабуються разом з вікном)
+FONT_SIZE = 32
+SMALL_FONT_SIZE = 16
+
 # Налаштування підказок
-MAX_HINTS = 5
\ No newline at end of file
+MAX_HINTS = 5
+
+# Адреса віддаленої таблиці лідерів; без неї синхронізація вимкнена
+SYNC_ENDPOINT = os.environ.get('SUDOKU_SYNC_URL')
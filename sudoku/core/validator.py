@@ -40,16 +40,12 @@ class SudokuValidator:
         return len(values) == len(set(values))
 
     @staticmethod
-    def __is_column_valid_board(grid: List[List[Cell]]) -> bool:
-        return all(SudokuValidator.__has_unique_values(
-            [grid[row][col].value for row in range(GRID_SIZE) if grid[row][col].value != 0])
-                   for col in range(GRID_SIZE))
+    def __is_column_valid_move(grid: List[List[Cell]], row: int, col: int, value: int) -> bool:
+        return all(grid[r][col].value != value for r in range(GRID_SIZE) if r != row)
 
     @staticmethod
-    def __is_row_valid_board(grid: List[List[Cell]]) -> bool:
-        return all(SudokuValidator.__has_unique_values(
-            [grid[row][col].value for col in range(GRID_SIZE) if grid[row][col].value != 0])
-                   for row in range(GRID_SIZE))
+    def __is_row_valid_move(grid: List[List[Cell]], row: int, col: int, value: int) -> bool:
+        return all(grid[row][c].value != value for c in range(GRID_SIZE) if c != col)
 
     @staticmethod
     def __is_block_valid_move(grid: List[List[Cell]], row: int, col: int, value: int) -> bool:
@@ -2,24 +2,56 @@
 """
 Пакет для роботи з базою даних
 """
-from .models import GameRecord, SavedGame, UserSetting
-from .repositories import IGameRecordRepository, ISavedGameRepository, IUserSettingsRepository
-from .sqlite_repositories import SQLiteGameRecordRepository, SQLiteSavedGameRepository, SQLiteUserSettingsRepository
+from .models import (
+    GameRecord, SavedGame, SavedGameSummary, UserSetting, DifficultyStats, Profile, ScoreRank, DEFAULT_PROFILE_ID
+)
+from .repositories import IGameRecordRepository, ISavedGameRepository, IUserSettingsRepository, IProfileRepository
+from .sqlite_repositories import (
+    SQLiteGameRecordRepository, SQLiteSavedGameRepository, SQLiteUserSettingsRepository, SQLiteProfileRepository
+)
+from .memory_repositories import (
+    InMemoryGameRecordRepository, InMemorySavedGameRepository, InMemoryUserSettingsRepository,
+    InMemoryProfileRepository
+)
+from .log_repositories import (
+    AppendLog, LogStore, LogGameRecordRepository, LogSavedGameRepository, LogUserSettingsRepository,
+    LogProfileRepository
+)
 from .database_manager import DatabaseManager
-from .services import GameRecordService, SavedGameService, UserSettingsService
-from .database_factory import DatabaseFactory
+from .instrumentation import QueryMetrics, StatementStats, InstrumentedConnection
+from .backup import online_backup, BackupScheduler
+from .sync import RecordSync, HTTPConnectionPool, SyncError
+from .migrations import Migration, Guarded, MigrationRunner, MIGRATIONS, LATEST_VERSION
+from .maintenance import DatabaseMaintenance, MaintenanceReport
+from .services import GameRecordService, QueryCache, SavedGameService, UserSettingsService, ProfileService
+from .database_factory import DatabaseFactory, BACKENDS, BACKEND_SQLITE, BACKEND_MEMORY, BACKEND_LOG
 
 __all__ = [
     # Models
-    'GameRecord', 'SavedGame', 'UserSetting',
+    'GameRecord', 'SavedGame', 'SavedGameSummary', 'UserSetting', 'DifficultyStats', 'Profile', 'ScoreRank',
+    'DEFAULT_PROFILE_ID',
     # Repository interfaces
-    'IGameRecordRepository', 'ISavedGameRepository', 'IUserSettingsRepository',
+    'IGameRecordRepository', 'ISavedGameRepository', 'IUserSettingsRepository', 'IProfileRepository',
     # Repository implementations
-    'SQLiteGameRecordRepository', 'SQLiteSavedGameRepository', 'SQLiteUserSettingsRepository',
+    'SQLiteGameRecordRepository', 'SQLiteSavedGameRepository', 'SQLiteUserSettingsRepository', 'SQLiteProfileRepository',
+    'InMemoryGameRecordRepository', 'InMemorySavedGameRepository', 'InMemoryUserSettingsRepository',
+    'InMemoryProfileRepository',
+    'AppendLog', 'LogStore', 'LogGameRecordRepository', 'LogSavedGameRepository', 'LogUserSettingsRepository',
+    'LogProfileRepository',
     # Database manager
     'DatabaseManager',
+    # Instrumentation
+    'QueryMetrics', 'StatementStats', 'InstrumentedConnection',
+    # Backup
+    'online_backup', 'BackupScheduler',
+    # Remote sync
+    'RecordSync', 'HTTPConnectionPool', 'SyncError',
+    # Migrations
+    'Migration', 'Guarded', 'MigrationRunner', 'MIGRATIONS', 'LATEST_VERSION',
+    # Maintenance
+    'DatabaseMaintenance', 'MaintenanceReport',
     # Services
-    'GameRecordService', 'SavedGameService', 'UserSettingsService',
+    'GameRecordService', 'QueryCache', 'SavedGameService', 'UserSettingsService', 'ProfileService',
     # Factory
-    'DatabaseFactory'
+    'DatabaseFactory', 'BACKENDS', 'BACKEND_SQLITE', 'BACKEND_MEMORY', 'BACKEND_LOG'
 ]
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+Онлайн-резервне копіювання бази даних через sqlite3 backup API
+"""
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+# Кількість сторінок, що копіюються за один крок
+DEFAULT_BACKUP_PAGES = 64
+# Пауза між кроками, щоб не забирати ресурси в гри
+DEFAULT_STEP_DELAY = 0.005
+
+ProgressCallback = Callable[[int, int], None]  # (скопійовано сторінок, всього сторінок)
+
+
+def online_backup(source_path: str, backup_path: str,
+                  pages: int = DEFAULT_BACKUP_PAGES,
+                  step_delay: float = DEFAULT_STEP_DELAY,
+                  progress: Optional[ProgressCallback] = None,
+                  compress: bool = False,
+                  source: Optional[sqlite3.Connection] = None) -> str:
+    """Створює узгоджену копію живої бази даних і повертає шлях до файлу
+
+    Копіювання йде кроками по ``pages`` сторінок; між кроками потік
+    поступається процесором, тож записи гри не блокуються на весь час
+    копіювання. Копія спершу пишеться у тимчасовий файл і лише потім
+    атомарно підміняє цільовий.
+    """
+    target_path = backup_path + '.gz' if compress and not backup_path.endswith('.gz') else backup_path
+    raw_path = target_path[:-3] if compress else target_path
+    temp_path = raw_path + '.part'
+
+    own_source = source is None
+    if own_source:
+        source = sqlite3.connect(source_path)
+
+    def on_step(status, remaining, total):
+        if progress:
+            progress(total - remaining, total)
+        if step_delay:
+            time.sleep(step_delay)
+
+    try:
+        destination = sqlite3.connect(temp_path)
+        try:
+            source.backup(destination, pages=pages, progress=on_step)
+        finally:
+            destination.close()
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        if own_source:
+            source.close()
+
+    if compress:
+        compressed_temp = target_path + '.part'
+        try:
+            with open(temp_path, 'rb') as src, gzip.open(compressed_temp, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+        finally:
+            os.remove(temp_path)
+        os.replace(compressed_temp, target_path)
+    else:
+        os.replace(temp_path, target_path)
+
+    return target_path
+
+
+class BackupScheduler:
+    """Періодичне резервне копіювання у фоновому потоці з ротацією копій"""
+
+    FILE_PREFIX = 'sudoku-'
+
+    def __init__(self, source_path: str, backup_dir: str,
+                 interval: float = 3600.0,
+                 generations: int = 5,
+                 compress: bool = True,
+                 pages: int = DEFAULT_BACKUP_PAGES,
+                 progress: Optional[ProgressCallback] = None):
+        if generations < 1:
+            raise ValueError("Generations must be at least 1")
+
+        self.source_path = source_path
+        self.backup_dir = Path(backup_dir)
+        self.interval = interval
+        self.generations = generations
+        self.compress = compress
+        self.pages = pages
+        self.progress = progress
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def start(self) -> None:
+        """Запускає фоновий потік резервного копіювання"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='sudoku-backup', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Зупиняє фоновий потік"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self) -> str:
+        """Створює одну копію та видаляє застарілі покоління"""
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        backup_path = str(self.backup_dir / f"{self.FILE_PREFIX}{timestamp}.db")
+
+        path = online_backup(self.source_path, backup_path,
+                             pages=self.pages, progress=self.progress,
+                             compress=self.compress)
+        self.logger.info(f"Database backed up to: {path}")
+        self._rotate()
+        return path
+
+    def list_backups(self) -> List[Path]:
+        """Повертає наявні копії від найновішої до найстарішої"""
+        if not self.backup_dir.exists():
+            return []
+        backups = [path for path in self.backup_dir.iterdir()
+                   if path.name.startswith(self.FILE_PREFIX)
+                   and (path.name.endswith('.db') or path.name.endswith('.db.gz'))]
+        return sorted(backups, key=lambda path: path.name, reverse=True)
+
+    def _rotate(self) -> None:
+        """Залишає лише останні ``generations`` копій"""
+        for path in self.list_backups()[self.generations:]:
+            try:
+                path.unlink()
+            except OSError as e:
+                self.logger.error(f"Error removing old backup {path}: {e}")
+
+    def _run(self) -> None:
+        """Цикл фонового потоку"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                self.logger.error(f"Error creating scheduled backup: {e}")
@@ -1,32 +1,86 @@
 """
 Фабрика для створення та ініціалізації бази даних
 """
-from typing import Tuple
+import os
+from typing import Dict, Optional, Tuple
 from .database_manager import DatabaseManager
+from .models import DEFAULT_PROFILE_ID
+from .repositories import IProfileRepository
 from .sqlite_repositories import (
     SQLiteGameRecordRepository,
     SQLiteSavedGameRepository,
-    SQLiteUserSettingsRepository
+    SQLiteUserSettingsRepository,
+    SQLiteProfileRepository
 )
-from .services import GameRecordService, SavedGameService, UserSettingsService
+from .memory_repositories import (
+    InMemoryGameRecordRepository,
+    InMemorySavedGameRepository,
+    InMemoryUserSettingsRepository,
+    InMemoryProfileRepository
+)
+from .log_repositories import LogStore
+from .services import GameRecordService, SavedGameService, UserSettingsService, ProfileService
+
+# Доступні реалізації сховища
+BACKEND_SQLITE = 'sqlite'
+BACKEND_MEMORY = 'memory'
+BACKEND_LOG = 'log'
+BACKENDS = (BACKEND_SQLITE, BACKEND_MEMORY, BACKEND_LOG)
+
+Services = Tuple[GameRecordService, SavedGameService, UserSettingsService]
 
 
 class DatabaseFactory:
-    """Фабрика для створення всіх компонентів бази даних"""
+    """Фабрика для створення всіх компонентів бази даних
 
-    def __init__(self, db_path: str = None):
-        self.db_manager = DatabaseManager(db_path)
+    ``backend`` обирає сховище: SQLite (за замовчуванням), пам'ять або
+    журнал JSONL. Для журналу ``db_path`` є шляхом до файлу журналу
+    профілю за замовчуванням; інші профілі пишуть у сусідні файли.
+    """
 
-    def initialize(self) -> Tuple[GameRecordService, SavedGameService, UserSettingsService]:
+    def __init__(self, db_path: str = None, backend: str = BACKEND_SQLITE):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown database backend: {backend}")
+
+        self.backend = backend
+        self.db_path = db_path
+        self.db_manager: Optional[DatabaseManager] = DatabaseManager(db_path) if backend == BACKEND_SQLITE else None
+        self.log_store: Optional[LogStore] = None
+        # Репозиторії не-SQLite сховищ, окремі для кожного профілю
+        self._stores: Dict[int, tuple] = {}
+        self._profile_repository: Optional[IProfileRepository] = None
+
+    def initialize(self, profile_id: int = DEFAULT_PROFILE_ID) -> Services:
         """
-        Ініціалізує базу даних та повертає всі сервіси
+        Ініціалізує базу даних та повертає всі сервіси для профілю
         """
-        self.db_manager.connect()
-        self.db_manager.initialize_database()
+        if self.backend == BACKEND_LOG:
+            if self.db_path is None:
+                raise ValueError("Log backend requires a log file path")
+            self.log_store = self._get_store(DEFAULT_PROFILE_ID)
+            self._profile_repository = self.log_store.profiles
+        elif self.backend == BACKEND_MEMORY:
+            self._profile_repository = InMemoryProfileRepository(on_delete=self._drop_store)
+        else:
+            self.db_manager.connect()
+            self.db_manager.initialize_database()
+            self._profile_repository = SQLiteProfileRepository(self.db_manager)
+
+        return self.create_services(profile_id)
 
-        game_record_repo = SQLiteGameRecordRepository(self.db_manager)
-        saved_game_repo = SQLiteSavedGameRepository(self.db_manager)
-        user_settings_repo = SQLiteUserSettingsRepository(self.db_manager)
+    def create_services(self, profile_id: int) -> Services:
+        """Повертає сервіси, обмежені даними одного профілю"""
+        if self.backend == BACKEND_SQLITE:
+            game_record_repo = SQLiteGameRecordRepository(self.db_manager, profile_id)
+            saved_game_repo = SQLiteSavedGameRepository(self.db_manager, profile_id)
+            user_settings_repo = SQLiteUserSettingsRepository(self.db_manager, profile_id)
+        elif self.backend == BACKEND_LOG:
+            store = self._get_store(profile_id)
+            game_record_repo = store.game_records
+            saved_game_repo = store.saved_games
+            user_settings_repo = store.user_settings
+        else:
+            game_record_repo, saved_game_repo, user_settings_repo = self._get_store(profile_id)
 
         game_record_service = GameRecordService(game_record_repo)
         saved_game_service = SavedGameService(saved_game_repo)
@@ -34,7 +88,46 @@ class DatabaseFactory:
 
         return game_record_service, saved_game_service, user_settings_service
 
+    def create_profile_service(self) -> ProfileService:
+        """Повертає сервіс профілів; потребує попереднього initialize()"""
+        if self._profile_repository is None:
+            raise RuntimeError("Database factory is not initialized")
+        return ProfileService(self._profile_repository)
+
+    def _log_path(self, profile_id: int) -> str:
+        """Шлях до журналу профілю"""
+        if profile_id == DEFAULT_PROFILE_ID:
+            return self.db_path
+        root, ext = os.path.splitext(self.db_path)
+        return f"{root}.profile-{profile_id}{ext}"
+
+    def _get_store(self, profile_id: int):
+        """Повертає сховище профілю, створюючи його при першому зверненні"""
+        store = self._stores.get(profile_id)
+        if store is None:
+            defaults = UserSettingsService.DEFAULT_SETTINGS
+            if self.backend == BACKEND_LOG:
+                store = LogStore(self._log_path(profile_id), default_settings=defaults,
+                                 on_profile_delete=self._drop_store)
+            else:
+                store = (InMemoryGameRecordRepository(),
+                         InMemorySavedGameRepository(),
+                         InMemoryUserSettingsRepository(defaults))
+            self._stores[profile_id] = store
+        return store
+
+    def _drop_store(self, profile_id: int) -> None:
+        """Видаляє дані профілю з не-SQLite сховища"""
+        store = self._stores.pop(profile_id, None)
+        if self.backend == BACKEND_LOG:
+            if store is None:
+                store = LogStore(self._log_path(profile_id))
+            store.destroy()
+
     def close(self):
         """Закриває з'єднання з базою даних"""
-        self.db_manager.disconnect()
-
+        if self.db_manager is not None:
+            self.db_manager.disconnect()
+        if self.backend == BACKEND_LOG:
+            for store in self._stores.values():
+                store.close()
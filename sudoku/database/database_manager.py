@@ -4,14 +4,25 @@
 import sqlite3
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Union
 import logging
 
+from .backup import online_backup, BackupScheduler, ProgressCallback, DEFAULT_BACKUP_PAGES
+from .migrations import MigrationRunner
+from .instrumentation import InstrumentedConnection, QueryMetrics, DEFAULT_SLOW_QUERY_MS
+
 
 class DatabaseManager:
-    """Клас для управління базою даних SQLite"""
+    """Клас для управління базою даних SQLite
+
+    База працює в режимі WAL з двома з'єднаннями: з'єднання запису
+    (``get_connection``) і окреме з'єднання лише для читання
+    (``get_read_connection``) для таблиць лідерів, статистики та списків.
+    Читання бачать останній зафіксований стан і не чекають на commit.
+    """
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, instrument: bool = True,
+                 slow_query_ms: float = DEFAULT_SLOW_QUERY_MS):
         if db_path is None:
             # Створюємо папку для даних гри
             data_dir = Path.home() / '.sudoku_game'
@@ -20,126 +31,152 @@ class DatabaseManager:
 
         self.db_path = db_path
         self.connection: Optional[sqlite3.Connection] = None
+        self._instrumented: Optional[InstrumentedConnection] = None
+        self.read_connection: Optional[sqlite3.Connection] = None
+        self._instrumented_reader: Optional[InstrumentedConnection] = None
 
         # Налаштування логування
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
+        # Метрики запитів; None, якщо інструментування вимкнене
+        self.metrics: Optional[QueryMetrics] = QueryMetrics(slow_query_ms, self.logger) if instrument else None
+
     def connect(self) -> sqlite3.Connection:
         """Створює з'єднання з базою даних"""
         try:
             self.connection = sqlite3.connect(self.db_path)
             self.connection.row_factory = sqlite3.Row  # Для роботи з рядками як з словниками
+            if not self.is_memory:
+                # WAL дозволяє читати паралельно із записом
+                self.connection.execute("PRAGMA journal_mode = WAL")
+            if self.metrics is not None:
+                self._instrumented = InstrumentedConnection(self.connection, self.metrics)
             self.logger.info(f"Connected to database: {self.db_path}")
             return self.connection
         except sqlite3.Error as e:
             self.logger.error(f"Error connecting to database: {e}")
             raise
 
+    @property
+    def is_memory(self) -> bool:
+        """Перевіряє, чи база існує лише в пам'яті"""
+        return self.db_path in (':memory:', '')
+
+    def connect_reader(self) -> sqlite3.Connection:
+        """Створює з'єднання лише для читання (mode=ro)"""
+        # Файл бази має існувати і бути в режимі WAL, тож спершу з'єднання запису
+        self.get_connection()
+        try:
+            uri = Path(self.db_path).resolve().as_uri() + '?mode=ro'
+            self.read_connection = sqlite3.connect(uri, uri=True)
+            self.read_connection.row_factory = sqlite3.Row
+            if self.metrics is not None:
+                self._instrumented_reader = InstrumentedConnection(self.read_connection, self.metrics)
+            return self.read_connection
+        except sqlite3.Error as e:
+            self.logger.error(f"Error opening read-only connection: {e}")
+            raise
+
     def disconnect(self):
         """Закриває з'єднання з базою даних"""
+        if self.read_connection:
+            self.read_connection.close()
+            self.read_connection = None
+            self._instrumented_reader = None
         if self.connection:
             self.connection.close()
             self.connection = None
+            self._instrumented = None
             self.logger.info("Database connection closed")
 
-    def get_connection(self) -> sqlite3.Connection:
-        """Повертає поточне з'єднання або створює нове"""
+    def get_connection(self) -> Union[sqlite3.Connection, InstrumentedConnection]:
+        """Повертає поточне з'єднання або створює нове
+
+        Якщо інструментування увімкнене, з'єднання обгорнуте так, що кожен
+        запит і commit потрапляють у метрики.
+        """
         if self.connection is None:
-            return self.connect()
-        return self.connection
+            self.connect()
+        return self._instrumented or self.connection
+
+    def get_read_connection(self) -> Union[sqlite3.Connection, InstrumentedConnection]:
+        """Повертає з'єднання лише для читання
+
+        Для бази в пам'яті друге з'єднання неможливе, тому повертається
+        з'єднання запису.
+        """
+        if self.is_memory:
+            return self.get_connection()
+        if self.read_connection is None:
+            self.connect_reader()
+        return self._instrumented_reader or self.read_connection
+
+    def get_query_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Повертає статистику запитів, згруповану за текстом запиту"""
+        return self.metrics.snapshot() if self.metrics is not None else {}
+
+    def reset_query_metrics(self) -> None:
+        """Очищає статистику запитів"""
+        if self.metrics is not None:
+            self.metrics.reset()
 
     def initialize_database(self):
-        """Ініціалізує базу даних, створюючи необхідні таблиці"""
+        """Ініціалізує базу даних, застосовуючи відсутні міграції схеми"""
         conn = self.get_connection()
+        runner = MigrationRunner(logger=self.logger)
 
         try:
-            # SQL скрипт для створення таблиць
-            create_tables_sql = """
-            -- Таблиця для рекордів завершених ігор
-            CREATE TABLE IF NOT EXISTS game_records (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                difficulty TEXT NOT NULL CHECK (difficulty IN ('EASY', 'MEDIUM', 'HARD')),
-                completion_time INTEGER NOT NULL,
-                hints_used INTEGER NOT NULL DEFAULT 0,
-                score INTEGER NOT NULL DEFAULT 0,
-                date_completed TEXT NOT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            );
-            
-            -- Таблиця для збережених ігор
-            CREATE TABLE IF NOT EXISTS saved_games (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                difficulty TEXT NOT NULL CHECK (difficulty IN ('EASY', 'MEDIUM', 'HARD')),
-                current_state TEXT NOT NULL,
-                solution TEXT NOT NULL,
-                elapsed_time INTEGER NOT NULL DEFAULT 0,
-                hints_used INTEGER NOT NULL DEFAULT 0,
-                date_saved TEXT NOT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            );
-            
-            -- Таблиця для налаштувань користувача
-            CREATE TABLE IF NOT EXISTS user_settings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                setting_name TEXT UNIQUE NOT NULL,
-                setting_value TEXT NOT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            );
-            
-            -- Індекси для оптимізації запитів
-            CREATE INDEX IF NOT EXISTS idx_game_records_difficulty ON game_records(difficulty);
-            CREATE INDEX IF NOT EXISTS idx_game_records_score ON game_records(score DESC);
-            CREATE INDEX IF NOT EXISTS idx_game_records_date ON game_records(date_completed);
-            CREATE INDEX IF NOT EXISTS idx_saved_games_date ON saved_games(date_saved DESC);
-            CREATE INDEX IF NOT EXISTS idx_user_settings_name ON user_settings(setting_name);
-            """
-
-            conn.executescript(create_tables_sql)
-            conn.commit()
-
-            self.logger.info("Database tables created successfully")
-
-            # Ініціалізуємо базові налаштування
-            self._initialize_default_settings(conn)
+            # Швидкий шлях: схема актуальна, достатньо одного читання pragma
+            if runner.is_current(conn):
+                return
+
+            version = runner.migrate(conn)
+            self.logger.info(f"Database schema migrated to version {version}")
 
         except sqlite3.Error as e:
             self.logger.error(f"Error initializing database: {e}")
             conn.rollback()
             raise
 
-    def _initialize_default_settings(self, conn: sqlite3.Connection):
-        """Ініціалізує базові налаштування користувача"""
-        default_settings = [
-            ('theme', 'light'),
-            ('sound_enabled', 'true'),
-            ('auto_notes', 'false'),
-            ('highlight_conflicts', 'true'),
-            ('show_timer', 'true'),
-            ('max_hints', '5')
-        ]
-
-        for setting_name, setting_value in default_settings:
-            conn.execute("""
-                INSERT OR IGNORE INTO user_settings (setting_name, setting_value)
-                VALUES (?, ?)
-            """, (setting_name, setting_value))
-
-        conn.commit()
-        self.logger.info("Default settings initialized")
-
-    def backup_database(self, backup_path: str):
-        """Створює резервну копію бази даних"""
+    def backup_database(self, backup_path: str, pages: int = DEFAULT_BACKUP_PAGES,
+                        progress: Optional[ProgressCallback] = None,
+                        compress: bool = False) -> str:
+        """Створює резервну копію бази даних і повертає шлях до неї
+
+        Блокуючий виклик для інструментів і тестів: копіювання кроками
+        ``online_backup`` не блокує записи інших з'єднань, але сам виклик
+        триває довше за просте копіювання файлу, бо між кроками потік
+        засинає. З потоку інтерфейсу гри його не викликають — для
+        копіювання у фоні є ``create_backup_scheduler``.
+        """
         try:
-            import shutil
-            shutil.copy2(self.db_path, backup_path)
-            self.logger.info(f"Database backed up to: {backup_path}")
+            # In-memory базу неможливо відкрити другим з'єднанням
+            if self.is_memory:
+                self.get_connection()
+                source = self.connection
+            else:
+                source = None
+            path = online_backup(self.db_path, backup_path, pages=pages,
+                                 progress=progress, compress=compress, source=source)
+            self.logger.info(f"Database backed up to: {path}")
+            return path
         except Exception as e:
             self.logger.error(f"Error creating backup: {e}")
             raise
 
+    def create_backup_scheduler(self, backup_dir: str, interval: float = 3600.0,
+                                generations: int = 5, compress: bool = True,
+                                progress: Optional[ProgressCallback] = None) -> BackupScheduler:
+        """Створює планувальник періодичних резервних копій з ротацією
+
+        Копії створюються у фоновому потоці після ``start()``; запуск і
+        зупинка планувальника — відповідальність того, хто його створив.
+        """
+        return BackupScheduler(self.db_path, backup_dir, interval=interval,
+                               generations=generations, compress=compress,
+                               progress=progress)
+
     def __enter__(self):
         """Контекстний менеджер - вхід"""
         self.connect()
@@ -0,0 +1,253 @@
+"""
+Інструментування SQL-запитів: час виконання, кількість рядків,
+журнал повільних запитів і метрики
+"""
+import logging
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+# Верхні межі кошиків гістограми затримок, мс
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0)
+# Запити, довші за цей поріг, потрапляють у журнал повільних запитів
+DEFAULT_SLOW_QUERY_MS = 50.0
+# Псевдо-запит, під яким рахується час commit()
+COMMIT_STATEMENT = 'COMMIT'
+
+_WHITESPACE = re.compile(r'\s+')
+# План запиту має сенс лише для операторів роботи з даними
+_EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'REPLACE')
+
+
+def normalize_sql(sql: str) -> str:
+    """Зводить текст запиту до одного рядка, щоб використовувати його як ключ"""
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+@dataclass
+class StatementStats:
+    """Накопичена статистика одного SQL-запиту"""
+    sql: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    fetch_ms: float = 0.0  # час, витрачений на fetch*, окремо від виконання
+    rows: int = 0
+    slow_calls: int = 0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    @property
+    def mean_ms(self) -> float:
+        """Середній час виконання"""
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Оцінює перцентиль затримки за гістограмою (верхня межа кошика)"""
+        if not self.calls:
+            return 0.0
+        threshold = fraction * self.calls
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= threshold:
+                return LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Конвертує об'єкт у словник"""
+        return {
+            'sql': self.sql,
+            'calls': self.calls,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.mean_ms, 3),
+            'p95_ms': self.percentile(0.95),
+            'max_ms': round(self.max_ms, 3),
+            'fetch_ms': round(self.fetch_ms, 3),
+            'rows': self.rows,
+            'slow_calls': self.slow_calls,
+            'histogram': dict(zip([str(bound) for bound in LATENCY_BUCKETS_MS] + ['inf'], self.buckets))
+        }
+
+
+class QueryMetrics:
+    """Реєстр статистики запитів і журнал повільних запитів"""
+
+    def __init__(self, slow_query_ms: float = DEFAULT_SLOW_QUERY_MS,
+                 logger: Optional[logging.Logger] = None):
+        self.slow_query_ms = slow_query_ms
+        self.logger = logger or logging.getLogger(__name__)
+        self._stats: Dict[str, StatementStats] = {}
+        self._explained: set = set()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> StatementStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = StatementStats(key)
+        return stats
+
+    def record(self, key: str, elapsed_ms: float, rows: int = 0, track_slow: bool = True) -> bool:
+        """Додає одне виконання запиту; повертає True, якщо воно повільне
+
+        ``track_slow=False`` — для executemany і COMMIT: їхній час росте з
+        розміром пакета, тож поріг повільного запиту до них не застосовується.
+        """
+        slow = track_slow and elapsed_ms >= self.slow_query_ms
+        with self._lock:
+            stats = self._get(key)
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            stats.rows += rows
+            if elapsed_ms > stats.max_ms:
+                stats.max_ms = elapsed_ms
+            stats.buckets[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+            if slow:
+                stats.slow_calls += 1
+        return slow
+
+    def record_fetch(self, key: str, elapsed_ms: float, rows: int) -> None:
+        """Додає час і рядки, отримані через fetch*"""
+        with self._lock:
+            stats = self._get(key)
+            stats.fetch_ms += elapsed_ms
+            stats.rows += rows
+
+    def report_slow(self, key: str, elapsed_ms: float,
+                    connection: Optional[sqlite3.Connection] = None, parameters=()) -> None:
+        """Записує повільний запит у журнал, при першій появі разом з планом"""
+        self.logger.warning(f"Slow query ({elapsed_ms:.1f} ms): {key}")
+        if connection is None:
+            return
+        with self._lock:
+            if key in self._explained:
+                return
+            self._explained.add(key)
+        if not key.upper().startswith(_EXPLAINABLE):
+            return
+        try:
+            plan = connection.execute(f"EXPLAIN QUERY PLAN {key}", parameters).fetchall()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not explain slow query: {e}")
+            return
+        for row in plan:
+            self.logger.warning(f"  plan: {tuple(row)[-1]}")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Повертає копію статистики всіх запитів"""
+        with self._lock:
+            return {key: stats.to_dict() for key, stats in self._stats.items()}
+
+    def top(self, limit: int = 10, by: str = 'total_ms') -> List[Dict[str, Any]]:
+        """Повертає запити з найбільшим значенням обраної метрики"""
+        return sorted(self.snapshot().values(), key=lambda item: item[by], reverse=True)[:limit]
+
+    def reset(self) -> None:
+        """Очищає накопичену статистику"""
+        with self._lock:
+            self._stats.clear()
+            self._explained.clear()
+
+
+class InstrumentedCursor:
+    """Обгортка курсора, що рахує отримані рядки та час fetch*"""
+
+    def __init__(self, cursor: sqlite3.Cursor, connection: 'InstrumentedConnection', key: str = None):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_connection', connection)
+        object.__setattr__(self, '_key', key)
+
+    def execute(self, sql: str, parameters: Iterable = ()) -> 'InstrumentedCursor':
+        key = self._connection._run(self._cursor.execute, sql, parameters)
+        object.__setattr__(self, '_key', key)
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable) -> 'InstrumentedCursor':
+        key = self._connection._run(self._cursor.executemany, sql, seq_of_parameters, many=True)
+        object.__setattr__(self, '_key', key)
+        return self
+
+    def _fetch(self, method, *args):
+        started = time.perf_counter()
+        result = method(*args)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if self._key is not None:
+            if result is None:
+                rows = 0
+            elif isinstance(result, list):
+                rows = len(result)
+            else:
+                rows = 1
+            self._connection.metrics.record_fetch(self._key, elapsed_ms, rows)
+        return result
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchmany(self, size: int = None):
+        return self._fetch(self._cursor.fetchmany, size if size is not None else self._cursor.arraysize)
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self._cursor, name, value)
+
+
+class InstrumentedConnection:
+    """Обгортка з'єднання SQLite, що вимірює кожен запит і commit
+
+    Інтерфейс збігається з тією частиною sqlite3.Connection, якою
+    користуються репозиторії; решта атрибутів передається з'єднанню.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, metrics: QueryMetrics):
+        self._connection = connection
+        self.metrics = metrics
+
+    @property
+    def raw(self) -> sqlite3.Connection:
+        """Повертає необгорнуте з'єднання"""
+        return self._connection
+
+    def _run(self, method, sql: str, parameters, many: bool = False) -> str:
+        """Виконує запит і записує його час; повертає ключ запиту"""
+        key = normalize_sql(sql)
+        started = time.perf_counter()
+        cursor = method(sql, parameters)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        # Для DML rowcount показує змінені рядки, для SELECT рядки рахуються при fetch
+        rows = cursor.rowcount if cursor.rowcount > 0 else 0
+        if self.metrics.record(key, elapsed_ms, rows, track_slow=not many):
+            self.metrics.report_slow(key, elapsed_ms, self._connection, parameters)
+        return key
+
+    def execute(self, sql: str, parameters: Iterable = ()) -> InstrumentedCursor:
+        cursor = self._connection.cursor()
+        return InstrumentedCursor(cursor, self).execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable) -> InstrumentedCursor:
+        cursor = self._connection.cursor()
+        return InstrumentedCursor(cursor, self).executemany(sql, seq_of_parameters)
+
+    def cursor(self) -> InstrumentedCursor:
+        return InstrumentedCursor(self._connection.cursor(), self)
+
+    def commit(self) -> None:
+        started = time.perf_counter()
+        self._connection.commit()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.metrics.record(COMMIT_STATEMENT, elapsed_ms, track_slow=False)
+
+    def __getattr__(self, name: str):
+        return getattr(self._connection, name)
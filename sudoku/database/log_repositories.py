@@ -0,0 +1,231 @@
+"""
+Репозиторії поверх журналу JSONL лише для дописування
+
+Стан тримається в пам'яті так само, як у InMemory-репозиторіях, а кожна
+зміна дописується рядком у журнал. Під час відкриття журнал програється
+заново; ``compact`` переписує його з поточного стану.
+"""
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .memory_repositories import (
+    InMemoryGameRecordRepository,
+    InMemorySavedGameRepository,
+    InMemoryUserSettingsRepository,
+    InMemoryProfileRepository
+)
+
+# Назви таблиць у журналі
+RECORDS_TABLE = 'game_records'
+SAVES_TABLE = 'saved_games'
+SETTINGS_TABLE = 'user_settings'
+PROFILES_TABLE = 'profiles'
+
+Entry = Tuple[str, str, Dict[str, Any]]  # (таблиця, операція, дані)
+
+
+class AppendLog:
+    """Файл журналу, у який зміни лише дописуються"""
+
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync
+        self.logger = logging.getLogger(__name__)
+        self._stream = None
+
+    def is_empty(self) -> bool:
+        """Перевіряє, чи журнал ще не містить жодного запису"""
+        return not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+
+    def replay(self) -> Iterator[Entry]:
+        """Повертає записи журналу по порядку
+
+        Обірваний останній рядок (наприклад, після аварійного завершення)
+        пропускається.
+        """
+        if self.is_empty():
+            return
+        with open(self.path, 'r', encoding='utf-8') as stream:
+            for line_number, line in enumerate(stream, 1):
+                if not line.endswith('\n'):
+                    self.logger.warning(f"Skipping truncated log entry at line {line_number}")
+                    break
+                table, op, data = json.loads(line)
+                yield table, op, data
+
+    def _open(self):
+        """Відкриває журнал для дописування"""
+        if self._stream is None:
+            self._stream = open(self.path, 'a', encoding='utf-8')
+        return self._stream
+
+    def append(self, table: str, op: str, data: Dict[str, Any], flush: bool = True) -> None:
+        """Дописує один запис у журнал"""
+        stream = self._open()
+        stream.write(json.dumps([table, op, data], separators=(',', ':')) + '\n')
+        if flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """Скидає буфер журналу на диск"""
+        if self._stream is None:
+            return
+        self._stream.flush()
+        if self.fsync:
+            os.fsync(self._stream.fileno())
+
+    def rewrite(self, entries: Iterator[Entry]) -> None:
+        """Атомарно замінює журнал переданими записами"""
+        self.close()
+        temp_path = self.path + '.part'
+        with open(temp_path, 'w', encoding='utf-8') as stream:
+            for table, op, data in entries:
+                stream.write(json.dumps([table, op, data], separators=(',', ':')) + '\n')
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(temp_path, self.path)
+
+    def close(self) -> None:
+        """Закриває журнал"""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+class _LoggedRepositoryMixin:
+    """Дописує кожну зміну InMemory-репозиторію в журнал"""
+
+    TABLE: str = ''
+
+    def _attach(self, log: AppendLog) -> None:
+        self._log = log
+        self._batching = False
+
+    def _commit(self, op: str, data: Dict[str, Any]) -> None:
+        self._log.append(self.TABLE, op, data, flush=not self._batching)
+        self._apply(op, data)
+
+    def _batch(self, action: Callable[[], Any]) -> Any:
+        """Виконує пакетну операцію з одним скиданням буфера в кінці"""
+        self._batching = True
+        try:
+            return action()
+        finally:
+            self._batching = False
+            self._log.flush()
+
+
+class LogGameRecordRepository(_LoggedRepositoryMixin, InMemoryGameRecordRepository):
+    """Репозиторій рекордів поверх журналу"""
+
+    TABLE = RECORDS_TABLE
+
+    def __init__(self, log: AppendLog):
+        super().__init__()
+        self._attach(log)
+
+    def insert_raw(self, rows, chunk_size: int = 5000) -> int:
+        """Вставляє кортежі у порядку RAW_RECORD_COLUMNS і повертає їх кількість"""
+        return self._batch(lambda: super(LogGameRecordRepository, self).insert_raw(rows, chunk_size))
+
+    def snapshot(self) -> Iterator[Entry]:
+        """Повертає поточний стан як записи журналу"""
+        for record_id in sorted(self._records):
+            yield self.TABLE, 'put', self._records[record_id].to_dict()
+
+
+class LogSavedGameRepository(_LoggedRepositoryMixin, InMemorySavedGameRepository):
+    """Репозиторій збережених ігор поверх журналу"""
+
+    TABLE = SAVES_TABLE
+
+    def __init__(self, log: AppendLog):
+        super().__init__()
+        self._attach(log)
+
+    def snapshot(self) -> Iterator[Entry]:
+        """Повертає поточний стан як записи журналу"""
+        for game_id in sorted(self._games):
+            yield self.TABLE, 'put', self._games[game_id]
+
+
+class LogUserSettingsRepository(_LoggedRepositoryMixin, InMemoryUserSettingsRepository):
+    """Репозиторій налаштувань користувача поверх журналу"""
+
+    TABLE = SETTINGS_TABLE
+
+    def __init__(self, log: AppendLog, defaults: Optional[Dict[str, str]] = None):
+        # Значення за замовчуванням потрібні лише для нового журналу
+        super().__init__(defaults if log.is_empty() else None)
+        self._attach(log)
+
+    def save_many(self, settings) -> bool:
+        """Створює або оновлює кілька налаштувань"""
+        return self._batch(lambda: super(LogUserSettingsRepository, self).save_many(settings))
+
+    def snapshot(self) -> Iterator[Entry]:
+        """Повертає поточний стан як записи журналу"""
+        for name in sorted(self._settings):
+            yield self.TABLE, 'put', self._settings[name].to_dict()
+
+
+class LogProfileRepository(_LoggedRepositoryMixin, InMemoryProfileRepository):
+    """Репозиторій профілів поверх журналу"""
+
+    TABLE = PROFILES_TABLE
+
+    def __init__(self, log: AppendLog, on_delete: Optional[Callable[[int], None]] = None):
+        super().__init__(on_delete)
+        self._attach(log)
+
+    def snapshot(self) -> Iterator[Entry]:
+        """Повертає поточний стан як записи журналу"""
+        for profile_id in sorted(self._profiles):
+            yield self.TABLE, 'put', self._profiles[profile_id].to_dict()
+
+
+class LogStore:
+    """Журнал одного профілю разом із репозиторіями, що в нього пишуть
+
+    Список профілів ведеться в журналі профілю за замовчуванням.
+    """
+
+    def __init__(self, path: str, fsync: bool = False, default_settings: Optional[Dict[str, str]] = None,
+                 on_profile_delete: Optional[Callable[[int], None]] = None):
+        self.log = AppendLog(path, fsync)
+        is_new = self.log.is_empty()
+
+        self.game_records = LogGameRecordRepository(self.log)
+        self.saved_games = LogSavedGameRepository(self.log)
+        self.user_settings = LogUserSettingsRepository(self.log, default_settings)
+        self.profiles = LogProfileRepository(self.log, on_profile_delete)
+
+        repositories = {repo.TABLE: repo for repo in (self.game_records, self.saved_games,
+                                                     self.user_settings, self.profiles)}
+        for table, op, data in self.log.replay():
+            repositories[table]._apply(op, data)
+
+        # Новий журнал одразу отримує налаштування за замовчуванням
+        if is_new and default_settings:
+            self.compact()
+
+    def compact(self) -> None:
+        """Переписує журнал з поточного стану, відкидаючи застарілі записи"""
+        def entries():
+            yield from self.profiles.snapshot()
+            yield from self.user_settings.snapshot()
+            yield from self.saved_games.snapshot()
+            yield from self.game_records.snapshot()
+        self.log.rewrite(entries())
+
+    def close(self) -> None:
+        """Закриває журнал"""
+        self.log.close()
+
+    def destroy(self) -> None:
+        """Закриває і видаляє файл журналу"""
+        self.log.close()
+        if os.path.exists(self.log.path):
+            os.remove(self.log.path)
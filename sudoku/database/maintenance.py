@@ -0,0 +1,298 @@
+"""
+Обслуговування бази даних: згортання старих рекордів, обмеження
+кількості збережених ігор та інкрементальний VACUUM
+"""
+import sqlite3
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from .database_manager import DatabaseManager
+from ..models import Difficulty
+
+# Рекорди, старші за цей термін, згортаються в денні агрегати
+DEFAULT_RETENTION_DAYS = 180
+# Скільки найкращих рекордів кожного рівня ніколи не згортаються
+DEFAULT_KEEP_TOP = 50
+# Максимальна кількість збережених ігор в одному слоті (профіль і рівень складності)
+DEFAULT_MAX_SAVES_PER_SLOT = 5
+# Кількість сторінок, що звільняються за один крок інкрементального VACUUM
+DEFAULT_VACUUM_PAGES = 64
+# Максимум рекордів, що згортаються за один крок під час простою (~15 мс)
+DEFAULT_ROLLUP_BATCH = 200
+# Значення PRAGMA auto_vacuum для режиму INCREMENTAL
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+# id найкращих keep_top рекордів кожного рівня профілю; параметри (profile_id, keep_top) на рівень
+_KEEP_TOP_SQL = ' UNION ALL '.join(f"""
+    SELECT * FROM (
+        SELECT id FROM game_records
+        WHERE profile_id = ? AND difficulty = '{difficulty.name}'
+        ORDER BY score DESC, completion_time ASC
+        LIMIT ?
+    )""" for difficulty in Difficulty)
+
+
+@dataclass
+class MaintenanceReport:
+    """Результат одного запуску обслуговування"""
+    records_rolled_up: int = 0
+    saves_evicted: int = 0
+    pages_freed: int = 0
+    details: Dict[str, int] = field(default_factory=dict)
+
+
+class DatabaseMaintenance:
+    """Задачі обслуговування, що тримають розмір бази обмеженим"""
+
+    def __init__(self, db_manager: DatabaseManager,
+                 retention_days: int = DEFAULT_RETENTION_DAYS,
+                 keep_top: int = DEFAULT_KEEP_TOP,
+                 max_saves_per_slot: int = DEFAULT_MAX_SAVES_PER_SLOT,
+                 vacuum_pages: int = DEFAULT_VACUUM_PAGES,
+                 rollup_batch: int = DEFAULT_ROLLUP_BATCH):
+        self.db_manager = db_manager
+        self.retention_days = retention_days
+        self.keep_top = keep_top
+        self.max_saves_per_slot = max_saves_per_slot
+        self.vacuum_pages = vacuum_pages
+        self.rollup_batch = rollup_batch
+        self.logger = logging.getLogger(__name__)
+        self._job_done = False
+        # Профілі, рекорди яких ще треба згорнути в поточному сеансі
+        self._pending_profiles: Optional[List[int]] = None
+        self._idle_cutoff: Optional[str] = None
+        # Чи вже перевірено, що база потребує повного VACUUM
+        self._conversion_checked = False
+
+    @property
+    def idle_job_done(self) -> bool:
+        """Чи вже виконано згортання рекордів і обмеження збережень у поточному сеансі"""
+        return self._job_done
+
+    def _cutoff(self, older_than_days: Optional[int]) -> Tuple[int, str]:
+        days = self.retention_days if older_than_days is None else older_than_days
+        return days, (datetime.now() - timedelta(days=days)).isoformat()
+
+    def _profiles(self) -> List[int]:
+        """Повертає профілі, що мають рекорди"""
+        conn = self.db_manager.get_connection()
+        return [row[0] for row in conn.execute("SELECT DISTINCT profile_id FROM player_stats").fetchall()]
+
+    def roll_up_records(self, older_than_days: int = None) -> int:
+        """Згортає старі рекорди в агрегати за днями та рівнями складності
+
+        Найкращі ``keep_top`` рекордів кожного профілю та рівня залишаються в таблиці
+        лідерів. Статистика гравця не змінюється, бо згорнуті ігри
+        продовжують враховуватись через game_records_daily. Кожен профіль
+        згортається в окремій транзакції.
+        """
+        days, cutoff = self._cutoff(older_than_days)
+        rolled_up = sum(self.roll_up_profile(profile_id, cutoff) for profile_id in self._profiles())
+
+        if rolled_up:
+            self.logger.info(f"Rolled up {rolled_up} game records older than {days} days")
+        return rolled_up
+
+    def roll_up_profile(self, profile_id: int, cutoff: str, limit: Optional[int] = None) -> int:
+        """Згортає до ``limit`` найстаріших рекордів профілю, старших за ``cutoff``
+
+        Рекорди обираються за індексом (profile_id, date_completed), тож
+        кожна наступна порція починається одразу після вже згорнутих.
+        """
+        conn = self.db_manager.get_connection()
+
+        if conn.in_transaction:
+            conn.commit()
+
+        try:
+            conn.execute("BEGIN")
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS rollup_ids (id INTEGER PRIMARY KEY)")
+            conn.execute("DELETE FROM rollup_ids")
+            # Найкращі рекорди кожного рівня читаються через префікс індексу; LIMIT -1 — без обмеження
+            conn.execute(f"""
+                INSERT INTO rollup_ids (id)
+                SELECT id FROM game_records
+                WHERE profile_id = ? AND date_completed < ?
+                  AND id NOT IN ({_KEEP_TOP_SQL})
+                ORDER BY date_completed
+                LIMIT ?
+            """, (profile_id, cutoff, *[profile_id, self.keep_top] * len(Difficulty),
+                  -1 if limit is None else limit))
+
+            conn.execute("""
+                INSERT INTO game_records_daily (profile_id, day, difficulty, games_count, total_time,
+                                                total_hints, best_score, best_time, best_hints_used)
+                SELECT profile_id, day, difficulty, games_count, total_time, total_hints,
+                       score, completion_time, hints_used
+                FROM (
+                    SELECT profile_id, substr(date_completed, 1, 10) AS day, difficulty,
+                           score, completion_time, hints_used,
+                           COUNT(*) OVER w AS games_count,
+                           SUM(completion_time) OVER w AS total_time,
+                           SUM(hints_used) OVER w AS total_hints,
+                           ROW_NUMBER() OVER (w ORDER BY score DESC, completion_time ASC) AS position
+                    FROM game_records
+                    WHERE id IN (SELECT id FROM rollup_ids)
+                    WINDOW w AS (PARTITION BY profile_id, substr(date_completed, 1, 10), difficulty)
+                )
+                WHERE position = 1
+                ON CONFLICT(profile_id, day, difficulty) DO UPDATE
+                SET games_count = games_count + excluded.games_count,
+                    total_time = total_time + excluded.total_time,
+                    total_hints = total_hints + excluded.total_hints,
+                    best_score = CASE WHEN best_score IS NULL OR excluded.best_score > best_score
+                                          OR (excluded.best_score = best_score AND excluded.best_time < best_time)
+                                      THEN excluded.best_score ELSE best_score END,
+                    best_time = CASE WHEN best_score IS NULL OR excluded.best_score > best_score
+                                         OR (excluded.best_score = best_score AND excluded.best_time < best_time)
+                                     THEN excluded.best_time ELSE best_time END,
+                    best_hints_used = CASE WHEN best_score IS NULL OR excluded.best_score > best_score
+                                               OR (excluded.best_score = best_score AND excluded.best_time < best_time)
+                                           THEN excluded.best_hints_used ELSE best_hints_used END
+            """)
+
+            # Згорнуті ігри вже враховані в статистиці, тож тригер вимикається
+            conn.execute("INSERT INTO player_stats_suspend (id) VALUES (1)")
+            cursor = conn.execute("DELETE FROM game_records WHERE id IN (SELECT id FROM rollup_ids)")
+            rolled_up = cursor.rowcount
+            conn.execute("DELETE FROM player_stats_suspend")
+            conn.execute("DELETE FROM rollup_ids")
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            self.logger.error(f"Error rolling up game records: {e}")
+            raise
+
+        return rolled_up
+
+    def evict_saved_games(self, max_per_slot: int = None) -> int:
+        """Залишає в кожному слоті лише останні використані збереження"""
+        limit = self.max_saves_per_slot if max_per_slot is None else max_per_slot
+        conn = self.db_manager.get_connection()
+
+        try:
+            cursor = conn.execute("""
+                DELETE FROM saved_games
+                WHERE id IN (
+                    SELECT id FROM (
+                        SELECT id, ROW_NUMBER() OVER (
+                            PARTITION BY profile_id, difficulty ORDER BY updated_at DESC, id DESC
+                        ) AS position
+                        FROM saved_games
+                    )
+                    WHERE position > ?
+                )
+            """, (limit,))
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            self.logger.error(f"Error evicting saved games: {e}")
+            raise
+
+        if cursor.rowcount:
+            self.logger.info(f"Evicted {cursor.rowcount} least recently used saved games")
+        return cursor.rowcount
+
+    def free_page_count(self) -> int:
+        """Повертає кількість вільних сторінок у файлі бази"""
+        conn = self.db_manager.get_connection()
+        return conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    def needs_full_vacuum(self) -> bool:
+        """Чи база ще не переведена в режим auto_vacuum = INCREMENTAL
+
+        Міграція 5 одразу переписує лише невеликі бази; для решти режим
+        набуває чинності після ``full_vacuum`` у повному обслуговуванні
+        (``run`` або команда ``records_cli maintain``).
+        """
+        conn = self.db_manager.get_connection()
+        return conn.execute("PRAGMA auto_vacuum").fetchone()[0] != _AUTO_VACUUM_INCREMENTAL
+
+    def full_vacuum(self) -> int:
+        """Переписує файл бази повним VACUUM і повертає кількість звільнених сторінок
+
+        Одноразова операція, тривалість якої пропорційна розміру бази
+        (~40 мс на 1000 сторінок), тож вона блокує і не виконується під
+        час простою гри. Після неї працює інкрементальний VACUUM.
+        """
+        conn = self.db_manager.get_connection()
+        if conn.in_transaction:
+            conn.commit()
+
+        before = conn.execute("PRAGMA page_count").fetchone()[0]
+        started = time.perf_counter()
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        freed = before - conn.execute("PRAGMA page_count").fetchone()[0]
+        self.logger.info(f"Converted database to incremental auto-vacuum: {before} pages, "
+                         f"{freed} freed in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return freed
+
+    def incremental_vacuum(self, pages: int = None) -> int:
+        """Повертає у файлову систему до ``pages`` вільних сторінок"""
+        step = self.vacuum_pages if pages is None else pages
+        conn = self.db_manager.get_connection()
+
+        before = self.free_page_count()
+        if before == 0:
+            return 0
+
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute(f"PRAGMA incremental_vacuum({int(step)})").fetchall()
+        return before - self.free_page_count()
+
+    def run(self) -> MaintenanceReport:
+        """Виконує повне обслуговування"""
+        report = MaintenanceReport()
+        report.records_rolled_up = self.roll_up_records()
+        report.saves_evicted = self.evict_saved_games()
+        if self.needs_full_vacuum():
+            report.pages_freed += self.full_vacuum()
+
+        freed = self.incremental_vacuum()
+        while freed:
+            report.pages_freed += freed
+            freed = self.incremental_vacuum()
+        return report
+
+    def run_idle_step(self) -> MaintenanceReport:
+        """Виконує невеликий обсяг роботи під час простою гри
+
+        Кроки обмежені, бо виконуються в потоці інтерфейсу: спершу
+        згортається до ``rollup_batch`` найстаріших рекордів одного профілю
+        за виклик, доки всі профілі не будуть оброблені; потім один виклик
+        обмежує збереження; далі кожен виклик звільняє до ``vacuum_pages``
+        сторінок. Повний ``full_vacuum`` тут не виконується: якщо міграція
+        його відклала, у журнал один раз пишеться підказка.
+        """
+        report = MaintenanceReport()
+        if self._job_done:
+            if not self._conversion_checked:
+                self._conversion_checked = True
+                if self.needs_full_vacuum():
+                    self.logger.info("Database is not in incremental auto-vacuum mode; "
+                                     "run 'python -m sudoku.database.records_cli maintain' to convert it")
+            report.pages_freed = self.incremental_vacuum()
+            return report
+
+        if self._pending_profiles is None:
+            _, self._idle_cutoff = self._cutoff(None)
+            self._pending_profiles = self._profiles()
+
+        if self._pending_profiles:
+            profile_id = self._pending_profiles[0]
+            rolled_up = self.roll_up_profile(profile_id, self._idle_cutoff, self.rollup_batch)
+            if rolled_up < self.rollup_batch:
+                self._pending_profiles.pop(0)
+            report.records_rolled_up = rolled_up
+            report.details[f"profile:{profile_id}"] = rolled_up
+            return report
+
+        report.saves_evicted = self.evict_saved_games()
+        self._job_done = True
+        return report
@@ -0,0 +1,407 @@
+"""
+Реалізації репозиторіїв у пам'яті
+
+Дані зберігаються у словниках, а таблиці лідерів підтримуються
+відсортованими індексами, тож ці репозиторії дають базову лінію без
+вводу-виводу для тестів і вимірювань. Один екземпляр репозиторію
+відповідає одному профілю гравця.
+"""
+from bisect import bisect_left, insort
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .repositories import (
+    IGameRecordRepository, ISavedGameRepository, IUserSettingsRepository, IProfileRepository,
+    RAW_RECORD_COLUMNS, SCORE_HISTOGRAM_BUCKET
+)
+from .models import (
+    GameRecord, SavedGame, SavedGameSummary, UserSetting, DifficultyStats, Profile, DEFAULT_PROFILE_ID
+)
+from ..models import Difficulty
+
+# Ключ сортування таблиці лідерів: (-score, completion_time, id)
+RankKey = Tuple[int, int, int]
+
+
+def _rank_key(record: GameRecord) -> RankKey:
+    """Ключ, за яким рекорди йдуть у порядку ORDER BY score DESC, completion_time ASC"""
+    return -record.score, record.completion_time, record.id
+
+
+class InMemoryGameRecordRepository(IGameRecordRepository):
+    """Репозиторій рекордів у пам'яті з відсортованими індексами"""
+
+    def __init__(self):
+        self._records: Dict[int, GameRecord] = {}
+        self._last_id = 0
+        # Відсортовані індекси для таблиць лідерів
+        self._top_index: List[RankKey] = []
+        self._difficulty_index: Dict[Difficulty, List[RankKey]] = {d: [] for d in Difficulty}
+        # Лічильники для статистики: [кількість ігор, загальний час]
+        self._totals: Dict[Difficulty, List[int]] = {d: [0, 0] for d in Difficulty}
+        # Гістограма балів: рівень -> {номер кошика: кількість ігор}
+        self._histogram: Dict[Difficulty, Dict[int, int]] = {d: {} for d in Difficulty}
+
+    def _commit(self, op: str, data: Dict[str, Any]) -> None:
+        """Застосовує одну зміну; підкласи можуть додатково її журналювати"""
+        self._apply(op, data)
+
+    def _apply(self, op: str, data: Dict[str, Any]) -> None:
+        """Змінює стан сховища"""
+        if op == 'put':
+            record = GameRecord.from_dict(data)
+            self._records[record.id] = record
+            self._last_id = max(self._last_id, record.id)
+            key = _rank_key(record)
+            insort(self._top_index, key)
+            insort(self._difficulty_index[record.difficulty], key)
+            totals = self._totals[record.difficulty]
+            totals[0] += 1
+            totals[1] += record.completion_time
+            histogram = self._histogram[record.difficulty]
+            bucket = record.score // SCORE_HISTOGRAM_BUCKET
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+        elif op == 'delete':
+            record = self._records.pop(data['id'])
+            key = _rank_key(record)
+            self._remove_key(self._top_index, key)
+            self._remove_key(self._difficulty_index[record.difficulty], key)
+            totals = self._totals[record.difficulty]
+            totals[0] -= 1
+            totals[1] -= record.completion_time
+            histogram = self._histogram[record.difficulty]
+            bucket = record.score // SCORE_HISTOGRAM_BUCKET
+            histogram[bucket] -= 1
+            if histogram[bucket] <= 0:
+                del histogram[bucket]
+        else:
+            raise ValueError(f"Unknown operation: {op}")
+
+    @staticmethod
+    def _remove_key(index: List[RankKey], key: RankKey) -> None:
+        """Видаляє ключ з відсортованого індексу"""
+        position = bisect_left(index, key)
+        del index[position]
+
+    def _next_id(self) -> int:
+        """Повертає новий ідентифікатор; як і AUTOINCREMENT, ID не повторюються"""
+        return self._last_id + 1
+
+    def save(self, record: GameRecord) -> int:
+        """Зберігає запис про гру і повертає ID"""
+        data = record.to_dict()
+        data['id'] = self._next_id()
+        self._commit('put', data)
+        return data['id']
+
+    def get_by_id(self, record_id: int) -> Optional[GameRecord]:
+        """Отримує запис за ID"""
+        record = self._records.get(record_id)
+        return record.copy() if record else None
+
+    def get_all(self) -> List[GameRecord]:
+        """Отримує всі записи"""
+        records = sorted(self._records.values(), key=lambda record: record.date_completed, reverse=True)
+        return [record.copy() for record in records]
+
+    def get_by_difficulty(self, difficulty: Difficulty, limit: Optional[int] = None,
+                          offset: int = 0) -> List[GameRecord]:
+        """Отримує записи за рівнем складності, найкращі першими"""
+        end = None if limit is None else offset + limit
+        return [self._records[key[2]].copy() for key in self._difficulty_index[difficulty][offset:end]]
+
+    def get_top_scores(self, limit: int = 10, offset: int = 0) -> List[GameRecord]:
+        """Отримує топ результатів"""
+        return [self._records[key[2]].copy() for key in self._top_index[offset:offset + limit]]
+
+    def get_difficulty_stats(self) -> List[DifficultyStats]:
+        """Отримує агреговану статистику за рівнями складності"""
+        stats = []
+        for difficulty, (games_count, total_time) in self._totals.items():
+            if games_count == 0:
+                continue
+            best = self._records[self._difficulty_index[difficulty][0][2]]
+            stats.append(DifficultyStats(
+                difficulty=difficulty,
+                games_count=games_count,
+                total_time=total_time,
+                best_score=best.score,
+                best_time=best.completion_time,
+                best_hints_used=best.hints_used
+            ))
+        return stats
+
+    def count_better(self, difficulty: Difficulty, score: int, completion_time: int) -> int:
+        """Рахує записи рівня з кращим результатом"""
+        # ID завжди додатні, тож ключ з id = 0 стоїть перед рівними результатами
+        return bisect_left(self._difficulty_index[difficulty], (-score, completion_time, 0))
+
+    def count_by_difficulty(self, difficulty: Difficulty) -> int:
+        """Рахує записи рівня складності"""
+        return len(self._difficulty_index[difficulty])
+
+    def get_score_histogram(self, difficulty: Difficulty) -> List[Tuple[int, int]]:
+        """Повертає пари (номер кошика, кількість ігор) за зростанням балів"""
+        return sorted(self._histogram[difficulty].items())
+
+    def iter_raw(self, batch_size: int = 5000) -> Iterator[Tuple]:
+        """Потоково повертає записи як кортежі у порядку RAW_RECORD_COLUMNS"""
+        for record_id in sorted(self._records):
+            data = self._records[record_id].to_dict()
+            yield tuple(data[column] for column in RAW_RECORD_COLUMNS)
+
+    def insert_raw(self, rows: Iterable[Tuple], chunk_size: int = 5000) -> int:
+        """Вставляє кортежі у порядку RAW_RECORD_COLUMNS і повертає їх кількість"""
+        inserted = 0
+        for row in rows:
+            data = dict(zip(RAW_RECORD_COLUMNS, row))
+            data['id'] = self._next_id()
+            self._commit('put', data)
+            inserted += 1
+        return inserted
+
+    def delete(self, record_id: int) -> bool:
+        """Видаляє запис"""
+        if record_id not in self._records:
+            return False
+        self._commit('delete', {'id': record_id})
+        return True
+
+
+class InMemorySavedGameRepository(ISavedGameRepository):
+    """Репозиторій збережених ігор у пам'яті
+
+    Ігри зберігаються у серіалізованому вигляді, як і в SQLite, тож
+    зміни повернутих об'єктів не впливають на сховище.
+    """
+
+    def __init__(self):
+        self._games: Dict[int, Dict[str, Any]] = {}
+        self._last_id = 0
+        # Монотонний лічильник замість updated_at для порядку використання
+        self._clock = 0
+
+    def _commit(self, op: str, data: Dict[str, Any]) -> None:
+        """Застосовує одну зміну; підкласи можуть додатково її журналювати"""
+        self._apply(op, data)
+
+    def _apply(self, op: str, data: Dict[str, Any]) -> None:
+        """Змінює стан сховища"""
+        if op == 'put':
+            self._games[data['id']] = data
+            self._last_id = max(self._last_id, data['id'])
+        elif op == 'touch':
+            self._games[data['id']]['updated_at'] = data['updated_at']
+        elif op == 'delete':
+            del self._games[data['id']]
+        else:
+            raise ValueError(f"Unknown operation: {op}")
+        if 'updated_at' in data:
+            self._clock = max(self._clock, data['updated_at'])
+
+    def _tick(self) -> int:
+        """Повертає наступне значення лічильника використання"""
+        return self._clock + 1
+
+    def save(self, game: SavedGame) -> int:
+        """Зберігає гру і повертає ID"""
+        data = game.to_dict()
+        if game.id is None:
+            data['id'] = self._last_id + 1
+        else:
+            # Як і в SQLite, оновлення не змінює рівень складності та розв'язок
+            existing = self._games.get(game.id)
+            if existing is None:
+                return game.id
+            data['difficulty'] = existing['difficulty']
+            data['solution'] = existing['solution']
+        data['updated_at'] = self._tick()
+        self._commit('put', data)
+        return data['id']
+
+    def get_by_id(self, game_id: int) -> Optional[SavedGame]:
+        """Отримує збережену гру за ID"""
+        data = self._games.get(game_id)
+        return SavedGame.from_dict(data) if data else None
+
+    def _by_date(self) -> List[Dict[str, Any]]:
+        """Повертає ігри від найновішої до найстарішої"""
+        return sorted(self._games.values(), key=lambda data: data['date_saved'], reverse=True)
+
+    def get_all(self) -> List[SavedGame]:
+        """Отримує всі збережені ігри"""
+        return [SavedGame.from_dict(data) for data in self._by_date()]
+
+    def get_latest(self) -> Optional[SavedGame]:
+        """Отримує останню збережену гру"""
+        if not self._games:
+            return None
+        return SavedGame.from_dict(max(self._games.values(), key=lambda data: data['date_saved']))
+
+    def update(self, game: SavedGame) -> bool:
+        """Оновлює збережену гру"""
+        if game.id is None or game.id not in self._games:
+            return False
+        data = game.to_dict()
+        data['updated_at'] = self._tick()
+        self._commit('put', data)
+        return True
+
+    def exists(self) -> bool:
+        """Перевіряє, чи є хоча б одна збережена гра"""
+        return bool(self._games)
+
+    def count(self) -> int:
+        """Повертає кількість збережених ігор"""
+        return len(self._games)
+
+    def get_summaries(self, limit: Optional[int] = None) -> List[SavedGameSummary]:
+        """Отримує короткі описи збережених ігор без стану дошки"""
+        games = self._by_date()
+        if limit is not None:
+            games = games[:limit]
+        return [SavedGameSummary.from_dict(data) for data in games]
+
+    def touch(self, game_id: int) -> bool:
+        """Позначає збережену гру як щойно використану"""
+        if game_id not in self._games:
+            return False
+        self._commit('touch', {'id': game_id, 'updated_at': self._tick()})
+        return True
+
+    def delete(self, game_id: int) -> bool:
+        """Видаляє збережену гру"""
+        if game_id not in self._games:
+            return False
+        self._commit('delete', {'id': game_id})
+        return True
+
+
+class InMemoryUserSettingsRepository(IUserSettingsRepository):
+    """Репозиторій налаштувань користувача у пам'яті"""
+
+    def __init__(self, defaults: Optional[Dict[str, str]] = None):
+        self._settings: Dict[str, UserSetting] = {}
+        self._last_id = 0
+        for name, value in (defaults or {}).items():
+            self._apply('put', {'id': self._last_id + 1, 'setting_name': name, 'setting_value': value})
+
+    def _commit(self, op: str, data: Dict[str, Any]) -> None:
+        """Застосовує одну зміну; підкласи можуть додатково її журналювати"""
+        self._apply(op, data)
+
+    def _apply(self, op: str, data: Dict[str, Any]) -> None:
+        """Змінює стан сховища"""
+        if op == 'put':
+            self._settings[data['setting_name']] = UserSetting.from_dict(data)
+            self._last_id = max(self._last_id, data['id'])
+        elif op == 'delete':
+            del self._settings[data['setting_name']]
+        else:
+            raise ValueError(f"Unknown operation: {op}")
+
+    def _put(self, name: str, value: str) -> int:
+        """Створює або оновлює налаштування і повертає його ID"""
+        existing = self._settings.get(name)
+        setting_id = existing.id if existing else self._last_id + 1
+        self._commit('put', {'id': setting_id, 'setting_name': name, 'setting_value': value})
+        return setting_id
+
+    def save(self, setting: UserSetting) -> int:
+        """Зберігає налаштування"""
+        return self._put(setting.setting_name, setting.setting_value)
+
+    def get_by_id(self, name: str) -> Optional[UserSetting]:
+        """Отримує налаштування за ключем (назвою)"""
+        return self.get_by_name(name)
+
+    def get_by_name(self, name: str) -> Optional[UserSetting]:
+        """Отримує налаштування за назвою"""
+        setting = self._settings.get(name)
+        return replace(setting) if setting else None
+
+    def get_all(self) -> List[UserSetting]:
+        """Отримує всі налаштування"""
+        return [replace(self._settings[name]) for name in sorted(self._settings)]
+
+    def update(self, setting: UserSetting) -> bool:
+        """Оновлює налаштування"""
+        if setting.setting_name not in self._settings:
+            return False
+        self._put(setting.setting_name, setting.setting_value)
+        return True
+
+    def save_many(self, settings: List[UserSetting]) -> bool:
+        """Створює або оновлює кілька налаштувань"""
+        for setting in settings:
+            self._put(setting.setting_name, setting.setting_value)
+        return True
+
+    def delete(self, name: str) -> bool:
+        """Видаляє налаштування"""
+        if name not in self._settings:
+            return False
+        self._commit('delete', {'setting_name': name})
+        return True
+
+
+class InMemoryProfileRepository(IProfileRepository):
+    """Репозиторій профілів гравців у пам'яті"""
+
+    def __init__(self, on_delete: Optional[Callable[[int], None]] = None):
+        self._profiles: Dict[int, Profile] = {}
+        self._last_id = 0
+        self._on_delete = on_delete
+        self._apply('put', {'id': DEFAULT_PROFILE_ID, 'name': 'default', 'created_at': None})
+
+    def _commit(self, op: str, data: Dict[str, Any]) -> None:
+        """Застосовує одну зміну; підкласи можуть додатково її журналювати"""
+        self._apply(op, data)
+
+    def _apply(self, op: str, data: Dict[str, Any]) -> None:
+        """Змінює стан сховища"""
+        if op == 'put':
+            self._profiles[data['id']] = Profile.from_dict(data)
+            self._last_id = max(self._last_id, data['id'])
+        elif op == 'delete':
+            del self._profiles[data['id']]
+        else:
+            raise ValueError(f"Unknown operation: {op}")
+
+    def save(self, profile: Profile) -> int:
+        """Створює профіль або перейменовує наявний і повертає ID"""
+        if profile.id is None:
+            data = Profile(self._last_id + 1, profile.name, datetime.now()).to_dict()
+        else:
+            existing = self._profiles.get(profile.id)
+            if existing is None:
+                return profile.id
+            data = replace(existing, name=profile.name).to_dict()
+        self._commit('put', data)
+        return data['id']
+
+    def get_by_id(self, profile_id: int) -> Optional[Profile]:
+        """Отримує профіль за ID"""
+        profile = self._profiles.get(profile_id)
+        return replace(profile) if profile else None
+
+    def get_by_name(self, name: str) -> Optional[Profile]:
+        """Отримує профіль за назвою"""
+        for profile in self._profiles.values():
+            if profile.name == name:
+                return replace(profile)
+        return None
+
+    def get_all(self) -> List[Profile]:
+        """Отримує всі профілі"""
+        return [replace(profile) for profile in sorted(self._profiles.values(), key=lambda p: p.name)]
+
+    def delete(self, profile_id: int) -> bool:
+        """Видаляє профіль разом з усіма його даними"""
+        if profile_id not in self._profiles:
+            return False
+        self._commit('delete', {'id': profile_id})
+        if self._on_delete:
+            self._on_delete(profile_id)
+        return True
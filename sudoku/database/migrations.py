@@ -0,0 +1,643 @@
+"""
+Версіоновані міграції схеми бази даних
+"""
+import sqlite3
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+
+@dataclass(frozen=True)
+class Guarded:
+    """Інструкція, яка пропускається, якщо запит ``skip_if`` повертає рядок
+
+    Потрібна для змін без ``IF NOT EXISTS`` у SQLite — ``ALTER TABLE ...
+    ADD COLUMN`` та перебудов таблиць.
+    """
+    statement: str
+    skip_if: str
+
+
+def _unless_column(table: str, column: str, statement: str) -> Guarded:
+    """Виконує інструкцію, лише поки в таблиці немає вказаної колонки"""
+    return Guarded(statement, f"SELECT 1 FROM pragma_table_info('{table}') WHERE name = '{column}'")
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Один крок міграції схеми
+
+    Кожен крок ідемпотентний: його можна безпечно повторити на базі,
+    де відповідні об'єкти вже існують (наприклад, створеній до появи
+    версіонування). Інструкції без ``IF NOT EXISTS`` / ``IF EXISTS``
+    загортаються в ``Guarded``.
+    """
+    version: int
+    description: str
+    statements: Sequence[Union[str, Guarded]]
+    transactional: bool = True  # False для кроків на кшталт VACUUM, які не працюють у транзакції
+
+
+# Найбільша база (у сторінках), яку міграція 5 одразу переписує повним VACUUM
+MIGRATION_VACUUM_MAX_PAGES = 2048
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        description="Base schema and default settings",
+        statements=(
+            # Таблиця для рекордів завершених ігор
+            """
+            CREATE TABLE IF NOT EXISTS game_records (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                difficulty TEXT NOT NULL CHECK (difficulty IN ('EASY', 'MEDIUM', 'HARD')),
+                completion_time INTEGER NOT NULL,
+                hints_used INTEGER NOT NULL DEFAULT 0,
+                score INTEGER NOT NULL DEFAULT 0,
+                date_completed TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            # Таблиця для збережених ігор
+            """
+            CREATE TABLE IF NOT EXISTS saved_games (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                difficulty TEXT NOT NULL CHECK (difficulty IN ('EASY', 'MEDIUM', 'HARD')),
+                current_state TEXT NOT NULL,
+                solution TEXT NOT NULL,
+                elapsed_time INTEGER NOT NULL DEFAULT 0,
+                hints_used INTEGER NOT NULL DEFAULT 0,
+                date_saved TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            # Таблиця для налаштувань користувача
+            """
+            CREATE TABLE IF NOT EXISTS user_settings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                setting_name TEXT UNIQUE NOT NULL,
+                setting_value TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            # Індекси для оптимізації запитів
+            "CREATE INDEX IF NOT EXISTS idx_game_records_difficulty ON game_records(difficulty)",
+            "CREATE INDEX IF NOT EXISTS idx_game_records_score ON game_records(score DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_game_records_date ON game_records(date_completed)",
+            "CREATE INDEX IF NOT EXISTS idx_saved_games_date ON saved_games(date_saved DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_user_settings_name ON user_settings(setting_name)",
+            # Базові налаштування користувача
+            """
+            INSERT OR IGNORE INTO user_settings (setting_name, setting_value)
+            VALUES ('theme', 'light'),
+                   ('sound_enabled', 'true'),
+                   ('auto_notes', 'false'),
+                   ('highlight_conflicts', 'true'),
+                   ('show_timer', 'true'),
+                   ('max_hints', '5')
+            """,
+        )
+    ),
+    Migration(
+        version=2,
+        description="Materialized player_stats maintained by triggers",
+        statements=(
+            # Матеріалізована статистика гравця за рівнями складності
+            """
+            CREATE TABLE IF NOT EXISTS player_stats (
+                difficulty TEXT PRIMARY KEY CHECK (difficulty IN ('EASY', 'MEDIUM', 'HARD')),
+                games_count INTEGER NOT NULL DEFAULT 0,
+                total_time INTEGER NOT NULL DEFAULT 0,
+                best_score INTEGER,
+                best_time INTEGER,
+                best_hints_used INTEGER
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_game_records_difficulty_score
+                ON game_records(difficulty, score DESC, completion_time ASC)
+            """,
+            # Інкрементальне оновлення статистики в тій самій транзакції, що й вставка
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_game_records_stats_insert
+            AFTER INSERT ON game_records
+            BEGIN
+                INSERT OR IGNORE INTO player_stats (difficulty) VALUES (NEW.difficulty);
+                UPDATE player_stats
+                SET games_count = games_count + 1,
+                    total_time = total_time + NEW.completion_time,
+                    best_score = CASE WHEN best_score IS NULL OR NEW.score > best_score
+                                          OR (NEW.score = best_score AND NEW.completion_time < best_time)
+                                      THEN NEW.score ELSE best_score END,
+                    best_time = CASE WHEN best_score IS NULL OR NEW.score > best_score
+                                         OR (NEW.score = best_score AND NEW.completion_time < best_time)
+                                     THEN NEW.completion_time ELSE best_time END,
+                    best_hints_used = CASE WHEN best_score IS NULL OR NEW.score > best_score
+                                               OR (NEW.score = best_score AND NEW.completion_time < best_time)
+                                           THEN NEW.hints_used ELSE best_hints_used END
+                WHERE difficulty = NEW.difficulty;
+            END
+            """,
+            # При видаленні найкращого результату він шукається заново через індекс
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_game_records_stats_delete
+            AFTER DELETE ON game_records
+            BEGIN
+                UPDATE player_stats
+                SET games_count = games_count - 1,
+                    total_time = total_time - OLD.completion_time
+                WHERE difficulty = OLD.difficulty;
+                UPDATE player_stats
+                SET (best_score, best_time, best_hints_used) = (
+                    SELECT score, completion_time, hints_used FROM game_records
+                    WHERE difficulty = OLD.difficulty
+                    ORDER BY score DESC, completion_time ASC
+                    LIMIT 1
+                )
+                WHERE difficulty = OLD.difficulty
+                  AND best_score = OLD.score AND best_time = OLD.completion_time;
+                DELETE FROM player_stats WHERE difficulty = OLD.difficulty AND games_count <= 0;
+            END
+            """,
+            # Початкове заповнення статистики для вже існуючих записів
+            """
+            INSERT INTO player_stats (difficulty, games_count, total_time, best_score, best_time, best_hints_used)
+            SELECT g.difficulty, COUNT(*), SUM(g.completion_time), b.score, b.completion_time, b.hints_used
+            FROM game_records g
+            JOIN (
+                SELECT difficulty, score, completion_time, hints_used,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY difficulty ORDER BY score DESC, completion_time ASC
+                       ) AS position
+                FROM game_records
+            ) b ON b.difficulty = g.difficulty AND b.position = 1
+            WHERE NOT EXISTS (SELECT 1 FROM player_stats)
+            GROUP BY g.difficulty
+            """,
+        )
+    ),
+    Migration(
+        version=3,
+        description="Suspendable stats trigger for bulk imports",
+        statements=(
+            # Рядок у цій таблиці вимикає потригерне оновлення статистики.
+            # Він існує лише всередині транзакції пакетного імпорту
+            """
+            CREATE TABLE IF NOT EXISTS player_stats_suspend (
+                id INTEGER PRIMARY KEY CHECK (id = 1)
+            )
+            """,
+            "DROP TRIGGER IF EXISTS trg_game_records_stats_insert",
+            """
+            CREATE TRIGGER trg_game_records_stats_insert
+            AFTER INSERT ON game_records
+            WHEN NOT EXISTS (SELECT 1 FROM player_stats_suspend)
+            BEGIN
+                INSERT OR IGNORE INTO player_stats (difficulty) VALUES (NEW.difficulty);
+                UPDATE player_stats
+                SET games_count = games_count + 1,
+                    total_time = total_time + NEW.completion_time,
+                    best_score = CASE WHEN best_score IS NULL OR NEW.score > best_score
+                                          OR (NEW.score = best_score AND NEW.completion_time < best_time)
+                                      THEN NEW.score ELSE best_score END,
+                    best_time = CASE WHEN best_score IS NULL OR NEW.score > best_score
+                                         OR (NEW.score = best_score AND NEW.completion_time < best_time)
+                                     THEN NEW.completion_time ELSE best_time END,
+                    best_hints_used = CASE WHEN best_score IS NULL OR NEW.score > best_score
+                                               OR (NEW.score = best_score AND NEW.completion_time < best_time)
+                                           THEN NEW.hints_used ELSE best_hints_used END
+                WHERE difficulty = NEW.difficulty;
+            END
+            """,
+            # Покривається префіксом idx_game_records_difficulty_score
+            "DROP INDEX IF EXISTS idx_game_records_difficulty",
+        )
+    ),
+    Migration(
+        version=4,
+        description="Daily rollups for old game records and LRU index for saved games",
+        statements=(
+            # Денні агрегати рекордів, які вийшли за межі терміну зберігання
+            """
+            CREATE TABLE IF NOT EXISTS game_records_daily (
+                day TEXT NOT NULL,
+                difficulty TEXT NOT NULL CHECK (difficulty IN ('EASY', 'MEDIUM', 'HARD')),
+                games_count INTEGER NOT NULL DEFAULT 0,
+                total_time INTEGER NOT NULL DEFAULT 0,
+                total_hints INTEGER NOT NULL DEFAULT 0,
+                best_score INTEGER,
+                best_time INTEGER,
+                best_hints_used INTEGER,
+                PRIMARY KEY (day, difficulty)
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_game_records_daily_best
+                ON game_records_daily(difficulty, best_score DESC, best_time ASC)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_saved_games_lru
+                ON saved_games(difficulty, updated_at DESC, id DESC)
+            """,
+            # Видалення під час згортання не змінює статистику, а пошук нового
+            # найкращого результату враховує також денні агрегати
+            "DROP TRIGGER IF EXISTS trg_game_records_stats_delete",
+            """
+            CREATE TRIGGER trg_game_records_stats_delete
+            AFTER DELETE ON game_records
+            WHEN NOT EXISTS (SELECT 1 FROM player_stats_suspend)
+            BEGIN
+                UPDATE player_stats
+                SET games_count = games_count - 1,
+                    total_time = total_time - OLD.completion_time
+                WHERE difficulty = OLD.difficulty;
+                UPDATE player_stats
+                SET (best_score, best_time, best_hints_used) = (
+                    SELECT score, completion_time, hints_used FROM (
+                        SELECT * FROM (
+                            SELECT score, completion_time, hints_used FROM game_records
+                            WHERE difficulty = OLD.difficulty
+                            ORDER BY score DESC, completion_time ASC
+                            LIMIT 1
+                        )
+                        UNION ALL
+                        SELECT * FROM (
+                            SELECT best_score, best_time, best_hints_used FROM game_records_daily
+                            WHERE difficulty = OLD.difficulty
+                            ORDER BY best_score DESC, best_time ASC
+                            LIMIT 1
+                        )
+                    )
+                    ORDER BY score DESC, completion_time ASC
+                    LIMIT 1
+                )
+                WHERE difficulty = OLD.difficulty
+                  AND best_score = OLD.score AND best_time = OLD.completion_time;
+                DELETE FROM player_stats WHERE difficulty = OLD.difficulty AND games_count <= 0;
+            END
+            """,
+        )
+    ),
+    Migration(
+        version=5,
+        description="Incremental auto-vacuum",
+        statements=(
+            # Режим auto_vacuum набуває чинності лише після повного VACUUM, який
+            # переписує весь файл (~40 мс на 1000 сторінок). Для великих баз він
+            # відкладається до повного обслуговування (records_cli maintain)
+            "PRAGMA auto_vacuum = INCREMENTAL",
+            Guarded("VACUUM", skip_if=f"SELECT 1 FROM pragma_page_count() "
+                                      f"WHERE page_count > {MIGRATION_VACUUM_MAX_PAGES}"),
+        ),
+        transactional=False
+    ),
+    Migration(
+        version=6,
+        description="Player profiles with profile-leading indexes",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS profiles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            # Усі наявні дані належать профілю за замовчуванням
+            "INSERT OR IGNORE INTO profiles (id, name) VALUES (1, 'default')",
+            # ADD COLUMN не переписує таблицю, тож міграція швидка і для великих баз
+            _unless_column('game_records', 'profile_id',
+                           "ALTER TABLE game_records ADD COLUMN profile_id INTEGER NOT NULL DEFAULT 1"),
+            _unless_column('saved_games', 'profile_id',
+                           "ALTER TABLE saved_games ADD COLUMN profile_id INTEGER NOT NULL DEFAULT 1"),
+            # Тригери посилаються на таблиці, що перебудовуються нижче, тому
+            # видаляються до перебудови і створюються заново в кінці
+            "DROP TRIGGER IF EXISTS trg_game_records_stats_insert",
+            "DROP TRIGGER IF EXISTS trg_game_records_stats_delete",
+            # Унікальність назви налаштування тепер у межах профілю. Кожна
+            # перебудова пропускається, якщо таблиця вже має profile_id;
+            # після DROP старої таблиці умова хибна, тож RENAME виконується
+            "DROP TABLE IF EXISTS user_settings_new",
+            _unless_column('user_settings', 'profile_id', """
+            CREATE TABLE user_settings_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                profile_id INTEGER NOT NULL DEFAULT 1 REFERENCES profiles(id),
+                setting_name TEXT NOT NULL,
+                setting_value TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (profile_id, setting_name)
+            )
+            """),
+            _unless_column('user_settings', 'profile_id', """
+            INSERT INTO user_settings_new (id, profile_id, setting_name, setting_value, created_at, updated_at)
+            SELECT id, 1, setting_name, setting_value, created_at, updated_at FROM user_settings
+            """),
+            _unless_column('user_settings', 'profile_id', "DROP TABLE user_settings"),
+            _unless_column('user_settings', 'profile_id',
+                           "ALTER TABLE user_settings_new RENAME TO user_settings"),
+            # Статистика та денні агрегати ведуться окремо для кожного профілю
+            "DROP TABLE IF EXISTS player_stats_new",
+            _unless_column('player_stats', 'profile_id', """
+            CREATE TABLE player_stats_new (
+                profile_id INTEGER NOT NULL REFERENCES profiles(id),
+                difficulty TEXT NOT NULL CHECK (difficulty IN ('EASY', 'MEDIUM', 'HARD')),
+                games_count INTEGER NOT NULL DEFAULT 0,
+                total_time INTEGER NOT NULL DEFAULT 0,
+                best_score INTEGER,
+                best_time INTEGER,
+                best_hints_used INTEGER,
+                PRIMARY KEY (profile_id, difficulty)
+            ) WITHOUT ROWID
+            """),
+            _unless_column('player_stats', 'profile_id', """
+            INSERT INTO player_stats_new (profile_id, difficulty, games_count, total_time,
+                                          best_score, best_time, best_hints_used)
+            SELECT 1, difficulty, games_count, total_time, best_score, best_time, best_hints_used
+            FROM player_stats
+            """),
+            _unless_column('player_stats', 'profile_id', "DROP TABLE player_stats"),
+            _unless_column('player_stats', 'profile_id',
+                           "ALTER TABLE player_stats_new RENAME TO player_stats"),
+            "DROP TABLE IF EXISTS game_records_daily_new",
+            _unless_column('game_records_daily', 'profile_id', """
+            CREATE TABLE game_records_daily_new (
+                profile_id INTEGER NOT NULL REFERENCES profiles(id),
+                day TEXT NOT NULL,
+                difficulty TEXT NOT NULL CHECK (difficulty IN ('EASY', 'MEDIUM', 'HARD')),
+                games_count INTEGER NOT NULL DEFAULT 0,
+                total_time INTEGER NOT NULL DEFAULT 0,
+                total_hints INTEGER NOT NULL DEFAULT 0,
+                best_score INTEGER,
+                best_time INTEGER,
+                best_hints_used INTEGER,
+                PRIMARY KEY (profile_id, day, difficulty)
+            )
+            """),
+            _unless_column('game_records_daily', 'profile_id', """
+            INSERT INTO game_records_daily_new (profile_id, day, difficulty, games_count, total_time,
+                                                total_hints, best_score, best_time, best_hints_used)
+            SELECT 1, day, difficulty, games_count, total_time, total_hints,
+                   best_score, best_time, best_hints_used
+            FROM game_records_daily
+            """),
+            _unless_column('game_records_daily', 'profile_id', "DROP TABLE game_records_daily"),
+            _unless_column('game_records_daily', 'profile_id',
+                           "ALTER TABLE game_records_daily_new RENAME TO game_records_daily"),
+            """
+            CREATE INDEX IF NOT EXISTS idx_game_records_daily_best
+                ON game_records_daily(profile_id, difficulty, best_score DESC, best_time ASC)
+            """,
+            # Індекси починаються з profile_id і покривають вибрані колонки,
+            # тож таблиці лідерів і короткі описи збережень читаються лише з індексу
+            "DROP INDEX IF EXISTS idx_game_records_difficulty_score",
+            "DROP INDEX IF EXISTS idx_game_records_score",
+            "DROP INDEX IF EXISTS idx_game_records_date",
+            "DROP INDEX IF EXISTS idx_saved_games_date",
+            "DROP INDEX IF EXISTS idx_saved_games_lru",
+            """
+            CREATE INDEX IF NOT EXISTS idx_game_records_profile_difficulty
+                ON game_records(profile_id, difficulty, score DESC, completion_time ASC,
+                                hints_used, date_completed)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_game_records_profile_score
+                ON game_records(profile_id, score DESC, completion_time ASC,
+                                difficulty, hints_used, date_completed)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_game_records_profile_date
+                ON game_records(profile_id, date_completed)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_saved_games_profile_date
+                ON saved_games(profile_id, date_saved DESC, difficulty, elapsed_time)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_saved_games_profile_lru
+                ON saved_games(profile_id, difficulty, updated_at DESC, id DESC)
+            """,
+            # Тригери статистики з урахуванням профілю
+            """
+            CREATE TRIGGER trg_game_records_stats_insert
+            AFTER INSERT ON game_records
+            WHEN NOT EXISTS (SELECT 1 FROM player_stats_suspend)
+            BEGIN
+                INSERT OR IGNORE INTO player_stats (profile_id, difficulty)
+                VALUES (NEW.profile_id, NEW.difficulty);
+                UPDATE player_stats
+                SET games_count = games_count + 1,
+                    total_time = total_time + NEW.completion_time,
+                    best_score = CASE WHEN best_score IS NULL OR NEW.score > best_score
+                                          OR (NEW.score = best_score AND NEW.completion_time < best_time)
+                                      THEN NEW.score ELSE best_score END,
+                    best_time = CASE WHEN best_score IS NULL OR NEW.score > best_score
+                                         OR (NEW.score = best_score AND NEW.completion_time < best_time)
+                                     THEN NEW.completion_time ELSE best_time END,
+                    best_hints_used = CASE WHEN best_score IS NULL OR NEW.score > best_score
+                                               OR (NEW.score = best_score AND NEW.completion_time < best_time)
+                                           THEN NEW.hints_used ELSE best_hints_used END
+                WHERE profile_id = NEW.profile_id AND difficulty = NEW.difficulty;
+            END
+            """,
+            """
+            CREATE TRIGGER trg_game_records_stats_delete
+            AFTER DELETE ON game_records
+            WHEN NOT EXISTS (SELECT 1 FROM player_stats_suspend)
+            BEGIN
+                UPDATE player_stats
+                SET games_count = games_count - 1,
+                    total_time = total_time - OLD.completion_time
+                WHERE profile_id = OLD.profile_id AND difficulty = OLD.difficulty;
+                UPDATE player_stats
+                SET (best_score, best_time, best_hints_used) = (
+                    SELECT score, completion_time, hints_used FROM (
+                        SELECT * FROM (
+                            SELECT score, completion_time, hints_used FROM game_records
+                            WHERE profile_id = OLD.profile_id AND difficulty = OLD.difficulty
+                            ORDER BY score DESC, completion_time ASC
+                            LIMIT 1
+                        )
+                        UNION ALL
+                        SELECT * FROM (
+                            SELECT best_score, best_time, best_hints_used FROM game_records_daily
+                            WHERE profile_id = OLD.profile_id AND difficulty = OLD.difficulty
+                            ORDER BY best_score DESC, best_time ASC
+                            LIMIT 1
+                        )
+                    )
+                    ORDER BY score DESC, completion_time ASC
+                    LIMIT 1
+                )
+                WHERE profile_id = OLD.profile_id AND difficulty = OLD.difficulty
+                  AND best_score = OLD.score AND best_time = OLD.completion_time;
+                DELETE FROM player_stats
+                WHERE profile_id = OLD.profile_id AND difficulty = OLD.difficulty AND games_count <= 0;
+            END
+            """,
+        )
+    ),
+    Migration(
+        version=7,
+        description="Score histogram for percentile estimates",
+        statements=(
+            # Кількість ігор у кошиках по 10 балів (SCORE_HISTOGRAM_BUCKET);
+            # як і player_stats, не змінюється при згортанні старих рекордів
+            """
+            CREATE TABLE IF NOT EXISTS score_histogram (
+                profile_id INTEGER NOT NULL REFERENCES profiles(id),
+                difficulty TEXT NOT NULL CHECK (difficulty IN ('EASY', 'MEDIUM', 'HARD')),
+                bucket INTEGER NOT NULL,
+                games_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (profile_id, difficulty, bucket)
+            ) WITHOUT ROWID
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_game_records_histogram_insert
+            AFTER INSERT ON game_records
+            WHEN NOT EXISTS (SELECT 1 FROM player_stats_suspend)
+            BEGIN
+                INSERT INTO score_histogram (profile_id, difficulty, bucket, games_count)
+                VALUES (NEW.profile_id, NEW.difficulty, NEW.score / 10, 1)
+                ON CONFLICT(profile_id, difficulty, bucket) DO UPDATE
+                SET games_count = games_count + 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_game_records_histogram_delete
+            AFTER DELETE ON game_records
+            WHEN NOT EXISTS (SELECT 1 FROM player_stats_suspend)
+            BEGIN
+                UPDATE score_histogram SET games_count = games_count - 1
+                WHERE profile_id = OLD.profile_id AND difficulty = OLD.difficulty
+                  AND bucket = OLD.score / 10;
+                DELETE FROM score_histogram
+                WHERE profile_id = OLD.profile_id AND difficulty = OLD.difficulty
+                  AND bucket = OLD.score / 10 AND games_count <= 0;
+            END
+            """,
+            # Початкове заповнення; вже згорнуті ігри не мають окремих балів
+            """
+            INSERT INTO score_histogram (profile_id, difficulty, bucket, games_count)
+            SELECT profile_id, difficulty, score / 10, COUNT(*)
+            FROM game_records
+            WHERE NOT EXISTS (SELECT 1 FROM score_histogram)
+            GROUP BY profile_id, difficulty, score / 10
+            """,
+        )
+    ),
+    Migration(
+        version=8,
+        description="Remote leaderboard sync state",
+        statements=(
+            # Ідентифікатор клієнта та позначки останнього надісланого рекорду
+            """
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            ) WITHOUT ROWID
+            """,
+        )
+    ),
+    Migration(
+        version=9,
+        description="Narrow leaderboard indexes on game_records",
+        statements=(
+            # Покривні індекси версії 6 дублювали майже весь рядок і вдвічі
+            # сповільнювали пакетний імпорт. Сторінка таблиці лідерів читає
+            # лише LIMIT рядків, тож добирати решту колонок з таблиці дешево
+            "DROP INDEX IF EXISTS idx_game_records_profile_difficulty",
+            "DROP INDEX IF EXISTS idx_game_records_profile_score",
+            """
+            CREATE INDEX IF NOT EXISTS idx_game_records_profile_difficulty
+                ON game_records(profile_id, difficulty, score DESC, completion_time ASC)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_game_records_profile_score
+                ON game_records(profile_id, score DESC, completion_time ASC)
+            """,
+        )
+    ),
+    Migration(
+        version=10,
+        description="Profile rowid index for record export",
+        statements=(
+            # Ключ індексу — (profile_id, rowid), тож експорт одного профілю
+            # читає лише його рядки в порядку id без тимчасового B-дерева
+            """
+            CREATE INDEX IF NOT EXISTS idx_game_records_profile
+                ON game_records(profile_id)
+            """,
+        )
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+class MigrationRunner:
+    """Застосовує міграції за порядком, орієнтуючись на PRAGMA user_version"""
+
+    def __init__(self, migrations: Optional[Sequence[Migration]] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.migrations = sorted(migrations if migrations is not None else MIGRATIONS,
+                                 key=lambda migration: migration.version)
+        self.latest_version = self.migrations[-1].version if self.migrations else 0
+        self.logger = logger or logging.getLogger(__name__)
+
+    @staticmethod
+    def get_version(conn: sqlite3.Connection) -> int:
+        """Повертає поточну версію схеми"""
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def is_current(self, conn: sqlite3.Connection) -> bool:
+        """Перевіряє, чи схема вже має останню версію"""
+        return self.get_version(conn) >= self.latest_version
+
+    def migrate(self, conn: sqlite3.Connection) -> int:
+        """Застосовує всі відсутні міграції та повертає нову версію схеми"""
+        current_version = self.get_version(conn)
+
+        for migration in self.migrations:
+            if migration.version <= current_version:
+                continue
+
+            self.logger.info(f"Applying migration {migration.version}: {migration.description}")
+            self._apply(conn, migration)
+            current_version = migration.version
+
+        return current_version
+
+    def _apply(self, conn: sqlite3.Connection, migration: Migration):
+        """Застосовує один крок міграції разом з оновленням user_version"""
+        if not migration.transactional:
+            if conn.in_transaction:
+                conn.commit()
+            for statement in migration.statements:
+                self._execute(conn, statement)
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+            return
+
+        if conn.in_transaction:
+            conn.commit()
+
+        try:
+            conn.execute("BEGIN")
+            for statement in migration.statements:
+                self._execute(conn, statement)
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+    @staticmethod
+    def _execute(conn: sqlite3.Connection, statement: Union[str, Guarded]):
+        """Виконує інструкцію міграції з урахуванням умови пропуску"""
+        if isinstance(statement, Guarded):
+            if conn.execute(statement.skip_if).fetchone() is not None:
+                return
+            statement = statement.statement
+        conn.execute(statement)
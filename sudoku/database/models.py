@@ -3,21 +3,70 @@
 """
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Union
 import json
 
 from ..models import Difficulty
 
+# Пошук рівня за назвою без накладних витрат Enum.__getitem__
+_DIFFICULTIES = dict(Difficulty.__members__)
+
+# Профіль, якому належать дані, створені до появи профілів
+DEFAULT_PROFILE_ID = 1
+
 
-@dataclass
 class GameRecord:
-    """Модель для запису завершеної гри"""
-    id: Optional[int]
-    difficulty: Difficulty
-    completion_time: int  # в секундах
-    hints_used: int
-    score: int
-    date_completed: datetime
+    """Модель для запису завершеної гри
+
+    Клас зі слотами замість dataclass: таблиці лідерів створюють тисячі
+    таких об'єктів, а дата з бази розбирається лише при першому зверненні.
+    """
+    __slots__ = ('id', 'difficulty', 'completion_time', 'hints_used', 'score', '_date_completed')
+
+    # Порядок колонок для from_row
+    COLUMNS = ('id', 'difficulty', 'completion_time', 'hints_used', 'score', 'date_completed')
+
+    def __init__(self, id: Optional[int], difficulty: Difficulty, completion_time: int,
+                 hints_used: int, score: int, date_completed: Union[datetime, str]):
+        self.id = id
+        self.difficulty = difficulty
+        self.completion_time = completion_time  # в секундах
+        self.hints_used = hints_used
+        self.score = score
+        self._date_completed = date_completed  # datetime або ще не розібраний ISO-рядок
+
+    @property
+    def date_completed(self) -> datetime:
+        """Дата завершення гри, розбирається з ISO-рядка при першому зверненні"""
+        value = self._date_completed
+        if isinstance(value, str):
+            value = self._date_completed = datetime.fromisoformat(value)
+        return value
+
+    @date_completed.setter
+    def date_completed(self, value: Union[datetime, str]) -> None:
+        self._date_completed = value
+
+    def _date_iso(self) -> str:
+        value = self._date_completed
+        return value if isinstance(value, str) else value.isoformat()
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GameRecord):
+            return NotImplemented
+        return (self.id, self.difficulty, self.completion_time, self.hints_used, self.score,
+                self.date_completed) == (other.id, other.difficulty, other.completion_time,
+                                         other.hints_used, other.score, other.date_completed)
+
+    def __repr__(self) -> str:
+        return (f"GameRecord(id={self.id!r}, difficulty={self.difficulty!r}, "
+                f"completion_time={self.completion_time!r}, hints_used={self.hints_used!r}, "
+                f"score={self.score!r}, date_completed={self.date_completed!r})")
+
+    def copy(self) -> 'GameRecord':
+        """Повертає незалежну копію запису"""
+        return GameRecord(self.id, self.difficulty, self.completion_time,
+                          self.hints_used, self.score, self._date_completed)
 
     def to_dict(self) -> Dict[str, Any]:
         """Конвертує об'єкт у словник"""
@@ -27,7 +76,7 @@ class GameRecord:
             'completion_time': self.completion_time,
             'hints_used': self.hints_used,
             'score': self.score,
-            'date_completed': self.date_completed.isoformat()
+            'date_completed': self._date_iso()
         }
 
     @classmethod
@@ -35,13 +84,19 @@ class GameRecord:
         """Створює об'єкт з словника"""
         return cls(
             id=data.get('id'),
-            difficulty=Difficulty[data['difficulty']],
+            difficulty=_DIFFICULTIES[data['difficulty']],
             completion_time=data['completion_time'],
             hints_used=data['hints_used'],
             score=data['score'],
-            date_completed=datetime.fromisoformat(data['date_completed'])
+            date_completed=data['date_completed']
         )
 
+    @classmethod
+    def from_row(cls, row: Tuple) -> 'GameRecord':
+        """Створює об'єкт з кортежу у порядку COLUMNS"""
+        record_id, difficulty, completion_time, hints_used, score, date_completed = row
+        return cls(record_id, _DIFFICULTIES[difficulty], completion_time, hints_used, score, date_completed)
+
 
 @dataclass
 class SavedGame:
@@ -80,6 +135,69 @@ class SavedGame:
         )
 
 
+class SavedGameSummary:
+    """Легка проекція збереженої гри без стану дошки та розв'язку"""
+    __slots__ = ('id', 'difficulty', 'elapsed_time', '_date_saved')
+
+    # Порядок колонок для from_row
+    COLUMNS = ('id', 'difficulty', 'elapsed_time', 'date_saved')
+
+    def __init__(self, id: int, difficulty: Difficulty, elapsed_time: int,
+                 date_saved: Union[datetime, str]):
+        self.id = id
+        self.difficulty = difficulty
+        self.elapsed_time = elapsed_time  # Пройдений час в секундах
+        self._date_saved = date_saved  # datetime або ще не розібраний ISO-рядок
+
+    @property
+    def date_saved(self) -> datetime:
+        """Дата збереження, розбирається з ISO-рядка при першому зверненні"""
+        value = self._date_saved
+        if isinstance(value, str):
+            value = self._date_saved = datetime.fromisoformat(value)
+        return value
+
+    @date_saved.setter
+    def date_saved(self, value: Union[datetime, str]) -> None:
+        self._date_saved = value
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SavedGameSummary):
+            return NotImplemented
+        return (self.id, self.difficulty, self.elapsed_time, self.date_saved) == \
+               (other.id, other.difficulty, other.elapsed_time, other.date_saved)
+
+    def __repr__(self) -> str:
+        return (f"SavedGameSummary(id={self.id!r}, difficulty={self.difficulty!r}, "
+                f"elapsed_time={self.elapsed_time!r}, date_saved={self.date_saved!r})")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Конвертує об'єкт у словник"""
+        value = self._date_saved
+        return {
+            'id': self.id,
+            'difficulty': self.difficulty.name,
+            'elapsed_time': self.elapsed_time,
+            'date_saved': value if isinstance(value, str) else value.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SavedGameSummary':
+        """Створює об'єкт з словника"""
+        return cls(
+            id=data['id'],
+            difficulty=_DIFFICULTIES[data['difficulty']],
+            elapsed_time=data['elapsed_time'],
+            date_saved=data['date_saved']
+        )
+
+    @classmethod
+    def from_row(cls, row: Tuple) -> 'SavedGameSummary':
+        """Створює об'єкт з кортежу у порядку COLUMNS"""
+        game_id, difficulty, elapsed_time, date_saved = row
+        return cls(game_id, _DIFFICULTIES[difficulty], elapsed_time, date_saved)
+
+
 @dataclass
 class UserSetting:
     """Модель для налаштувань користувача"""
@@ -103,3 +221,91 @@ class UserSetting:
             setting_name=data['setting_name'],
             setting_value=data['setting_value']
         )
+
+
+@dataclass
+class DifficultyStats:
+    """Модель агрегованої статистики гравця для одного рівня складності"""
+    difficulty: Difficulty
+    games_count: int
+    total_time: int  # в секундах
+    best_score: Optional[int]
+    best_time: Optional[int]
+    best_hints_used: Optional[int]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Конвертує об'єкт у словник"""
+        return {
+            'difficulty': self.difficulty.name,
+            'games_count': self.games_count,
+            'total_time': self.total_time,
+            'best_score': self.best_score,
+            'best_time': self.best_time,
+            'best_hints_used': self.best_hints_used
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DifficultyStats':
+        """Створює об'єкт з словника"""
+        return cls(
+            difficulty=Difficulty[data['difficulty']],
+            games_count=data['games_count'],
+            total_time=data['total_time'],
+            best_score=data.get('best_score'),
+            best_time=data.get('best_time'),
+            best_hints_used=data.get('best_hints_used')
+        )
+
+
+@dataclass
+class Profile:
+    """Модель профілю гравця"""
+    id: Optional[int]
+    name: str
+    created_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Конвертує об'єкт у словник"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Profile':
+        """Створює об'єкт з словника"""
+        created_at = data.get('created_at')
+        return cls(
+            id=data.get('id'),
+            name=data['name'],
+            created_at=datetime.fromisoformat(created_at) if created_at else None
+        )
+
+
+@dataclass
+class ScoreRank:
+    """Місце результату серед ігор того самого рівня складності"""
+    difficulty: Difficulty
+    rank: int  # 1 - найкращий результат
+    total: int
+    percentile: float  # частка інших ігор, гірших за цей результат, у відсотках
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Конвертує об'єкт у словник"""
+        return {
+            'difficulty': self.difficulty.name,
+            'rank': self.rank,
+            'total': self.total,
+            'percentile': self.percentile
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScoreRank':
+        """Створює об'єкт з словника"""
+        return cls(
+            difficulty=Difficulty[data['difficulty']],
+            rank=data['rank'],
+            total=data['total'],
+            percentile=data['percentile']
+        )
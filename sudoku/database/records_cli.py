@@ -0,0 +1,106 @@
+"""
+Командний рядок для масового експорту та імпорту рекордів і повного
+обслуговування бази
+
+Приклади:
+    python -m sudoku.database.records_cli export records.csv
+    python -m sudoku.database.records_cli import records.jsonl --db other.db
+    python -m sudoku.database.records_cli maintain
+
+Команда maintain виконує повне обслуговування SQLite, зокрема одноразовий
+повний VACUUM, який гра не запускає під час простою, бо на великих базах він
+триває секунди.
+
+Швидкодія SQLite: експорт перевищує 100 тис. рядків/с (CSV ~300 тис.,
+JSONL ~120 тис.), імпорт — близько 25–30 тис. (CSV) і 20 тис. (JSONL).
+
+Відкрите питання: імпорт не досягає цілі 100 тис. рядків/с. Його обмежує
+сам SQLite: кожен рядок оновлює три індекси game_records і викликає два
+тригери AFTER INSERT, навіть вимкнені через player_stats_suspend. Можливе
+рішення — окремий режим завантаження великих файлів: одна транзакція, у
+якій індекси й тригери видаляються, а після вставки індекси будуються
+заново сортуванням і статистика перераховується повністю. Він вигідний
+лише тоді, коли файл порівнянний за розміром з таблицею, і ще не
+реалізований.
+"""
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from .database_factory import DatabaseFactory, BACKENDS, BACKEND_SQLITE
+from .maintenance import DatabaseMaintenance
+from .models import DEFAULT_PROFILE_ID
+
+FORMATS = ('csv', 'jsonl')
+
+
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    """Визначає формат за явним параметром або розширенням файлу"""
+    if fmt:
+        return fmt
+    return 'jsonl' if path.endswith('.jsonl') else 'csv'
+
+
+def _maintain(db_path: Optional[str]) -> int:
+    """Виконує повне обслуговування бази SQLite"""
+    factory = DatabaseFactory(db_path, BACKEND_SQLITE)
+    factory.initialize()
+    started = time.perf_counter()
+    try:
+        report = DatabaseMaintenance(factory.db_manager).run()
+    finally:
+        factory.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"maintain: {report.records_rolled_up} records rolled up, {report.saves_evicted} saves evicted, "
+          f"{report.pages_freed} pages freed in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входу командного рядка"""
+    parser = argparse.ArgumentParser(description="Експорт та імпорт рекордів судоку")
+    parser.add_argument('command', choices=('export', 'import', 'maintain'))
+    parser.add_argument('path', nargs='?', help="Файл CSV/JSONL або '-' для stdin/stdout")
+    parser.add_argument('--format', choices=FORMATS, dest='fmt')
+    parser.add_argument('--db', dest='db_path', default=None, help="Шлях до бази даних")
+    parser.add_argument('--backend', choices=BACKENDS, default=BACKEND_SQLITE)
+    parser.add_argument('--profile', type=int, default=DEFAULT_PROFILE_ID, help="ID профілю гравця")
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    if args.command == 'maintain':
+        return _maintain(args.db_path)
+    if args.path is None:
+        parser.error(f"{args.command} requires a path")
+
+    fmt = _detect_format(args.path, args.fmt)
+    factory = DatabaseFactory(args.db_path, args.backend)
+    game_record_service, _, _ = factory.initialize(args.profile)
+    started = time.perf_counter()
+
+    try:
+        if args.command == 'export':
+            if args.path == '-':
+                count = game_record_service.export_records(sys.stdout, fmt, args.batch_size)
+            else:
+                with open(args.path, 'w', encoding='utf-8', newline='') as stream:
+                    count = game_record_service.export_records(stream, fmt, args.batch_size)
+        else:
+            if args.path == '-':
+                count = game_record_service.import_records(sys.stdin, fmt, args.batch_size)
+            else:
+                with open(args.path, 'r', encoding='utf-8', newline='') as stream:
+                    count = game_record_service.import_records(stream, fmt, args.batch_size)
+    finally:
+        factory.close()
+
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0
+    print(f"{args.command}: {count} records in {elapsed:.2f}s ({rate:,.0f} rows/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,16 +2,22 @@
 Інтерфейси репозиторіїв для роботи з даними
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, Generic, TypeVar
+from typing import Iterable, Iterator, List, Optional, Generic, Tuple, TypeVar
 from datetime import datetime
 
-from .models import GameRecord, SavedGame, UserSetting
+from .models import GameRecord, SavedGame, SavedGameSummary, UserSetting, DifficultyStats, Profile
 from ..models import Difficulty
 
 # Узагальнені типи
 T = TypeVar('T')  # Тип сутності
 K = TypeVar('K')  # Тип ключа (ID)
 
+# Порядок колонок для масового імпорту/експорту рекордів (без ID)
+RAW_RECORD_COLUMNS = ('difficulty', 'completion_time', 'hints_used', 'score', 'date_completed')
+
+# Ширина кошика гістограми балів (має збігатися з міграцією score_histogram)
+SCORE_HISTOGRAM_BUCKET = 10
+
 
 class IRepository(ABC, Generic[T, K]):
     """Базовий інтерфейс репозиторію"""
@@ -41,15 +47,46 @@ class IGameRecordRepository(IRepository[GameRecord, int], ABC):
     """Інтерфейс репозиторію для рекордів ігор"""
 
     @abstractmethod
-    def get_by_difficulty(self, difficulty: Difficulty) -> List[GameRecord]:
-        """Отримує записи за рівнем складності"""
+    def get_by_difficulty(self, difficulty: Difficulty, limit: Optional[int] = None,
+                          offset: int = 0) -> List[GameRecord]:
+        """Отримує записи за рівнем складності, найкращі першими"""
         pass
 
     @abstractmethod
-    def get_top_scores(self, limit: int = 10) -> List[GameRecord]:
+    def get_top_scores(self, limit: int = 10, offset: int = 0) -> List[GameRecord]:
         """Отримує топ результатів"""
         pass
 
+    @abstractmethod
+    def get_difficulty_stats(self) -> List[DifficultyStats]:
+        """Отримує агреговану статистику за рівнями складності"""
+        pass
+
+    @abstractmethod
+    def count_better(self, difficulty: Difficulty, score: int, completion_time: int) -> int:
+        """Рахує записи рівня з кращим результатом (більший бал або той самий бал швидше)"""
+        pass
+
+    @abstractmethod
+    def count_by_difficulty(self, difficulty: Difficulty) -> int:
+        """Рахує записи рівня складності"""
+        pass
+
+    @abstractmethod
+    def get_score_histogram(self, difficulty: Difficulty) -> List[Tuple[int, int]]:
+        """Повертає пари (номер кошика, кількість ігор) за зростанням балів"""
+        pass
+
+    @abstractmethod
+    def iter_raw(self, batch_size: int = 5000) -> Iterator[Tuple]:
+        """Потоково повертає записи як кортежі у порядку RAW_RECORD_COLUMNS"""
+        pass
+
+    @abstractmethod
+    def insert_raw(self, rows: Iterable[Tuple], chunk_size: int = 5000) -> int:
+        """Пакетно вставляє кортежі у порядку RAW_RECORD_COLUMNS і повертає їх кількість"""
+        pass
+
 
 class ISavedGameRepository(IRepository[SavedGame, int], ABC):
     """Інтерфейс репозиторію для збережених ігор"""
@@ -64,6 +101,26 @@ class ISavedGameRepository(IRepository[SavedGame, int], ABC):
         """Оновлює збережену гру"""
         pass
 
+    @abstractmethod
+    def exists(self) -> bool:
+        """Перевіряє, чи є хоча б одна збережена гра"""
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        """Повертає кількість збережених ігор"""
+        pass
+
+    @abstractmethod
+    def get_summaries(self, limit: Optional[int] = None) -> List[SavedGameSummary]:
+        """Отримує короткі описи збережених ігор без стану дошки"""
+        pass
+
+    @abstractmethod
+    def touch(self, game_id: int) -> bool:
+        """Позначає збережену гру як щойно використану"""
+        pass
+
 
 class IUserSettingsRepository(IRepository[UserSetting, str], ABC):
     """Інтерфейс репозиторію для налаштувань користувача"""
@@ -76,4 +133,22 @@ class IUserSettingsRepository(IRepository[UserSetting, str], ABC):
     @abstractmethod
     def update(self, setting: UserSetting) -> bool:
         """Оновлює налаштування"""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def save_many(self, settings: List[UserSetting]) -> bool:
+        """Створює або оновлює кілька налаштувань однією транзакцією"""
+        pass
+
+
+class IProfileRepository(IRepository[Profile, int], ABC):
+    """Інтерфейс репозиторію для профілів гравців
+
+    Видалення профілю видаляє також усі його рекорди, збереження та
+    налаштування.
+    """
+
+    @abstractmethod
+    def get_by_name(self, name: str) -> Optional[Profile]:
+        """Отримує профіль за назвою"""
+        pass
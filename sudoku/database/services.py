@@ -1,21 +1,119 @@
 """
 Сервісний шар для бізнес-логіки роботи з базою даних
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Hashable, TextIO, Tuple
+from collections import OrderedDict
+from copy import deepcopy
 from datetime import datetime
+from itertools import islice
+from operator import itemgetter
+import csv
 import json
-
-from .repositories import IGameRecordRepository, ISavedGameRepository, IUserSettingsRepository
-from .models import GameRecord, SavedGame, UserSetting
+import logging
+import threading
+
+from .repositories import (
+    IGameRecordRepository, ISavedGameRepository, IUserSettingsRepository, IProfileRepository,
+    RAW_RECORD_COLUMNS, SCORE_HISTOGRAM_BUCKET
+)
+from .maintenance import DEFAULT_KEEP_TOP
+from .models import (
+    GameRecord, SavedGame, SavedGameSummary, UserSetting, Profile, ScoreRank, DEFAULT_PROFILE_ID
+)
 from ..models import Difficulty, Cell
 from ..utils.helpers import calculate_difficulty_score
 
+# Максимальна кількість закешованих результатів запитів рекордів
+DEFAULT_QUERY_CACHE_SIZE = 32
+# Ключ кешу персональної статистики
+_STATS_CACHE_KEY = ('stats',)
+# Назви рівнів складності для перевірки рядків імпорту
+_DIFFICULTY_NAMES = frozenset(Difficulty.__members__)
+# Колонки рядка JSONL у порядку RAW_RECORD_COLUMNS
+_raw_record_values = itemgetter(*RAW_RECORD_COLUMNS)
+
+
+def _histogram_worse(histogram: List[Tuple[int, int]], score: int) -> float:
+    """Оцінює кількість ігор з нижчим балом; усередині кошика — рівномірно"""
+    target_bucket, offset = divmod(score, SCORE_HISTOGRAM_BUCKET)
+    worse = 0.0
+    for bucket, count in histogram:
+        if bucket < target_bucket:
+            worse += count
+        elif bucket == target_bucket:
+            worse += count * offset / SCORE_HISTOGRAM_BUCKET
+    return worse
+
+
+class QueryCache:
+    """Потокобезпечний LRU-кеш результатів запитів рекордів одного профілю
+
+    Ключі: ('leaderboard', difficulty, limit, page), ('count', difficulty)
+    або ('stats',). Кеш може бути спільним для кількох сервісів з різними
+    з'єднаннями (наприклад, фонового читача таблиці рекордів), тож скидання
+    через будь-який з них діє на всі. Результат запиту, що почався до
+    скидання, не записується.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_QUERY_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Повертає результат з кешу або завантажує й запам'ятовує його"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            generation = self._generation
+
+        value = load()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = value
+                if len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, difficulty: Optional[Difficulty] = None) -> None:
+        """Скидає результати, що залежать від рівня складності; без рівня — усі"""
+        with self._lock:
+            self._generation += 1
+            if difficulty is None:
+                self._entries.clear()
+                return
+            for key in list(self._entries):
+                if key == _STATS_CACHE_KEY or key[1] is None or key[1] == difficulty:
+                    del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 class GameRecordService:
     """Сервіс для роботи з рекордами ігор"""
 
-    def __init__(self, repository: IGameRecordRepository):
+    def __init__(self, repository: IGameRecordRepository, cache_size: int = DEFAULT_QUERY_CACHE_SIZE,
+                 cache: Optional[QueryCache] = None, exact_rank_top: int = DEFAULT_KEEP_TOP):
         self.repository = repository
+        # Скільки найкращих рекордів рівня переживають згортання (keep_top обслуговування)
+        self.exact_rank_top = exact_rank_top
+        # Кеш можна передати від іншого сервісу того самого профілю
+        self.cache = cache if cache is not None else QueryCache(cache_size)
+
+    def _cached(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Повертає результат з кешу або завантажує й запам'ятовує його"""
+        return self.cache.get_or_load(key, load)
+
+    def invalidate_cache(self, difficulty: Optional[Difficulty] = None) -> None:
+        """Скидає закешовані результати, що залежать від рівня складності
+
+        Без рівня скидається весь кеш. Загальна таблиця лідерів і
+        статистика залежать від усіх рівнів, тож скидаються завжди.
+        """
+        self.cache.invalidate(difficulty)
 
     def save_game_record(self, difficulty: Difficulty, completion_time: int, hints_used: int) -> int:
         """Зберігає новий рекорд гри"""
@@ -30,54 +128,173 @@ class GameRecordService:
             date_completed=datetime.now()
         )
 
-        return self.repository.save(record)
+        record_id = self.repository.save(record)
+        self.invalidate_cache(difficulty)
+        return record_id
 
-    def get_leaderboard(self, difficulty: Optional[Difficulty] = None, limit: int = 10) -> List[GameRecord]:
-        """Отримує таблицю лідерів"""
-        if difficulty:
-            records = self.repository.get_by_difficulty(difficulty)
-            return records[:limit]
-        else:
-            return self.repository.get_top_scores(limit)
+    def get_leaderboard(self, difficulty: Optional[Difficulty] = None, limit: int = 10,
+                        page: int = 0) -> List[GameRecord]:
+        """Отримує сторінку таблиці лідерів
+
+        Результат кешується до першої зміни рекордів цього рівня,
+        тож повторне відкриття вкладки не виконує запитів.
+        """
+        def load() -> List[GameRecord]:
+            if difficulty:
+                return self.repository.get_by_difficulty(difficulty, limit, page * limit)
+            return self.repository.get_top_scores(limit, page * limit)
+
+        return list(self._cached(('leaderboard', difficulty, limit, page), load))
+
+    def count_records(self, difficulty: Optional[Difficulty] = None) -> int:
+        """Рахує рекорди рівня складності або всіх рівнів"""
+        def load() -> int:
+            if difficulty:
+                return self.repository.count_by_difficulty(difficulty)
+            return sum(self.repository.count_by_difficulty(level) for level in Difficulty)
+
+        return self._cached(('count', difficulty), load)
 
     def get_personal_stats(self) -> Dict[str, Any]:
         """Отримує персональну статистику гравця"""
-        all_records = self.repository.get_all()
-
-        if not all_records:
-            return {
-                'total_games': 0,
-                'total_time': 0,
-                'average_time': 0,
-                'best_scores': {},
-                'games_by_difficulty': {}
-            }
+        return deepcopy(self._cached(_STATS_CACHE_KEY, self._load_personal_stats))
+
+    def _load_personal_stats(self) -> Dict[str, Any]:
+        # Агрегати підтримуються тригерами в таблиці player_stats,
+        # тому вартість не залежить від кількості зіграних ігор
+        difficulty_stats = self.repository.get_difficulty_stats()
 
         stats = {
-            'total_games': len(all_records),
-            'total_time': sum(r.completion_time for r in all_records),
-            'average_time': sum(r.completion_time for r in all_records) // len(all_records),
+            'total_games': 0,
+            'total_time': 0,
+            'average_time': 0,
             'best_scores': {},
             'games_by_difficulty': {}
         }
 
-        # Статистика по складності
-        for difficulty in Difficulty:
-            difficulty_records = [r for r in all_records if r.difficulty == difficulty]
-            if difficulty_records:
-                best_record = max(difficulty_records, key=lambda x: x.score)
-                stats['best_scores'][difficulty.name] = {
-                    'score': best_record.score,
-                    'time': best_record.completion_time,
-                    'hints_used': best_record.hints_used
-                }
-                stats['games_by_difficulty'][difficulty.name] = len(difficulty_records)
+        for item in difficulty_stats:
+            stats['total_games'] += item.games_count
+            stats['total_time'] += item.total_time
+            stats['best_scores'][item.difficulty.name] = {
+                'score': item.best_score,
+                'time': item.best_time,
+                'hints_used': item.best_hints_used
+            }
+            stats['games_by_difficulty'][item.difficulty.name] = item.games_count
+
+        if stats['total_games']:
+            stats['average_time'] = stats['total_time'] // stats['total_games']
 
         return stats
 
     def delete_record(self, record_id: int) -> bool:
         """Видаляє запис"""
-        return self.repository.delete(record_id)
+        record = self.repository.get_by_id(record_id)
+        deleted = self.repository.delete(record_id)
+        if deleted:
+            self.invalidate_cache(record.difficulty if record else None)
+        return deleted
+
+    def get_rank(self, difficulty: Difficulty, score: int, completion_time: int) -> ScoreRank:
+        """Визначає місце результату серед ігор рівня складності
+
+        Використовує два підрахунки за індексом замість завантаження
+        таблиці лідерів. Згортання старих рекордів залишає в таблиці лише
+        найкращі ``exact_rank_top`` з них, тож загальна кількість береться
+        з гістограми, а місце результату поза цими рекордами оцінюється
+        за нею. Якщо результат ще не збережений, він враховується в
+        загальній кількості.
+        """
+        better = self.repository.count_better(difficulty, score, completion_time)
+        live = self.repository.count_by_difficulty(difficulty)
+        histogram = self.repository.get_score_histogram(difficulty)
+        total = max(live, sum(count for _, count in histogram), better + 1)
+
+        if total > live and better >= self.exact_rank_top:
+            # Згорнуті ігри гірші за всі збережені найкращі, тож точний підрахунок їх пропускає
+            estimated = total - int(_histogram_worse(histogram, score)) - 1
+            better = min(max(better, estimated), total - 1)
+
+        return ScoreRank(
+            difficulty=difficulty,
+            rank=better + 1,
+            total=total,
+            percentile=round(100.0 * (total - better - 1) / total, 1)
+        )
+
+    def get_record_rank(self, record_id: int) -> Optional[ScoreRank]:
+        """Визначає місце збереженого запису"""
+        record = self.repository.get_by_id(record_id)
+        if record is None:
+            return None
+        return self.get_rank(record.difficulty, record.score, record.completion_time)
+
+    def estimate_percentile(self, difficulty: Difficulty, score: int) -> Optional[float]:
+        """Оцінює перцентиль балу за гістограмою без перебору записів
+
+        Кількість кошиків обмежена діапазоном балів, тож вартість не
+        залежить від довжини історії. Усередині кошика ігри вважаються
+        рівномірно розподіленими.
+        """
+        histogram = self.repository.get_score_histogram(difficulty)
+        total = sum(count for _, count in histogram)
+        if total == 0:
+            return None
+        return round(100.0 * _histogram_worse(histogram, score) / total, 1)
+
+    def export_records(self, stream: TextIO, fmt: str = 'csv', batch_size: int = 5000) -> int:
+        """Потоково експортує всі рекорди у CSV або JSONL і повертає їх кількість"""
+        rows = self.repository.iter_raw(batch_size)
+        count = 0
+
+        if fmt == 'csv':
+            writer = csv.writer(stream)
+            writer.writerow(RAW_RECORD_COLUMNS)
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                writer.writerows(batch)
+                count += len(batch)
+        elif fmt == 'jsonl':
+            for row in rows:
+                stream.write(json.dumps(dict(zip(RAW_RECORD_COLUMNS, row)), ensure_ascii=False))
+                stream.write('\n')
+                count += 1
+        else:
+            raise ValueError(f"Unsupported export format: {fmt}")
+
+        return count
+
+    def import_records(self, stream: TextIO, fmt: str = 'csv', chunk_size: int = 5000) -> int:
+        """Потоково імпортує рекорди з CSV або JSONL і повертає їх кількість"""
+        if fmt == 'csv':
+            reader = csv.reader(stream)
+            header = next(reader, None)
+            if header is None:
+                return 0
+            if tuple(header) != RAW_RECORD_COLUMNS:
+                raise ValueError(f"Unexpected CSV header: {header}")
+            rows = map(self._parse_raw_record, filter(None, reader))
+        elif fmt == 'jsonl':
+            rows = map(self._parse_raw_record,
+                       map(_raw_record_values, map(json.loads, filter(str.strip, stream))))
+        else:
+            raise ValueError(f"Unsupported import format: {fmt}")
+
+        try:
+            return self.repository.insert_raw(rows, chunk_size)
+        finally:
+            self.invalidate_cache()
+
+    @staticmethod
+    def _parse_raw_record(values) -> tuple:
+        """Перевіряє та нормалізує один рядок імпорту"""
+        difficulty, completion_time, hints_used, score, date_completed = values
+        if difficulty not in _DIFFICULTY_NAMES:
+            raise ValueError(f"Unknown difficulty: {difficulty}")
+        datetime.fromisoformat(date_completed)
+        return difficulty, int(completion_time), int(hints_used), int(score), date_completed
 
 
 class SavedGameService:
@@ -106,15 +323,30 @@ class SavedGameService:
 
     def load_game(self, game_id: int) -> Optional[SavedGame]:
         """Завантажує збережену гру"""
-        return self.repository.get_by_id(game_id)
+        saved_game = self.repository.get_by_id(game_id)
+        if saved_game:
+            # Оновлюємо час використання для LRU-витіснення
+            self.repository.touch(game_id)
+        return saved_game
 
     def get_all_saves(self) -> List[SavedGame]:
         """Отримує всі збережені ігри"""
         return self.repository.get_all()
 
+    def get_save_summaries(self, limit: Optional[int] = None) -> List[SavedGameSummary]:
+        """Отримує список збережень без декодування дошок"""
+        return self.repository.get_summaries(limit)
+
+    def count_saves(self) -> int:
+        """Повертає кількість збережених ігор"""
+        return self.repository.count()
+
     def get_latest_save(self) -> Optional[SavedGame]:
         """Отримує останнє збереження"""
-        return self.repository.get_latest()
+        saved_game = self.repository.get_latest()
+        if saved_game:
+            self.repository.touch(saved_game.id)
+        return saved_game
 
     def update_save(self, saved_game: SavedGame) -> bool:
         """Оновлює збережену гру"""
@@ -127,45 +359,139 @@ class SavedGameService:
 
     def has_saves(self) -> bool:
         """Перевіряє, чи є збережені ігри"""
-        saves = self.repository.get_all()
-        return len(saves) > 0
+        return self.repository.exists()
 
 
 class UserSettingsService:
-    """Сервіс для роботи з налаштуваннями користувача"""
+    """Сервіс для роботи з налаштуваннями користувача
+
+    Усі налаштування завантажуються один раз у кеш у пам'яті. Читання
+    обслуговуються з кешу, а записи пакетно проходять у базу даних
+    однією транзакцією і лише після успіху потрапляють у кеш.
+    """
+
+    DEFAULT_SETTINGS = {
+        'theme': 'light',
+        'sound_enabled': 'true',
+        'auto_notes': 'false',
+        'highlight_conflicts': 'true',
+        'show_timer': 'true',
+        'max_hints': '5'
+    }
+
+    # Типи значень для типізованого кешу
+    SETTING_TYPES = {
+        'sound_enabled': bool,
+        'auto_notes': bool,
+        'highlight_conflicts': bool,
+        'show_timer': bool,
+        'max_hints': int
+    }
 
     def __init__(self, repository: IUserSettingsRepository):
         self.repository = repository
+        self._cache: Optional[Dict[str, str]] = None
+        self._typed_cache: Dict[str, Any] = {}
+        self._listeners: List[Callable[[str, str], None]] = []
+
+    def _get_cache(self) -> Dict[str, str]:
+        """Повертає кеш налаштувань, завантажуючи його при першому зверненні"""
+        if self._cache is None:
+            self._cache = {setting.setting_name: setting.setting_value
+                           for setting in self.repository.get_all()}
+            # Новий профіль отримує налаштування за замовчуванням при першому зверненні
+            if not self._cache and self.repository.save_many(
+                    [UserSetting(None, name, value) for name, value in self.DEFAULT_SETTINGS.items()]):
+                self._cache = dict(self.DEFAULT_SETTINGS)
+        return self._cache
+
+    def reload(self) -> None:
+        """Скидає кеш, щоб наступне читання завантажило налаштування з бази"""
+        self._cache = None
+        self._typed_cache.clear()
+
+    def add_listener(self, callback: Callable[[str, str], None]) -> None:
+        """Підписує обробник на зміни налаштувань (name, value)"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, str], None]) -> None:
+        """Відписує обробник змін налаштувань"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    @property
+    def listeners(self) -> List[Callable[[str, str], None]]:
+        """Повертає копію списку підписників"""
+        return list(self._listeners)
+
+    def notify_all(self) -> None:
+        """Сповіщає підписників про поточні значення всіх налаштувань"""
+        for name, value in self._get_cache().items():
+            self._notify(name, value)
+
+    def _notify(self, name: str, value: Optional[str]) -> None:
+        """Сповіщає підписників про зміну налаштування"""
+        for callback in list(self._listeners):
+            try:
+                callback(name, value)
+            except Exception as e:
+                logging.error(f"Settings listener failed for {name}: {e}")
 
     def get_setting(self, name: str, default_value: str = None) -> Optional[str]:
         """Отримує значення налаштування за назвою"""
-        setting = self.repository.get_by_name(name)
-        if setting:
-            return setting.setting_value
-        return default_value
+        return self._get_cache().get(name, default_value)
+
+    def get_typed_setting(self, name: str, default_value: Any = None) -> Any:
+        """Отримує значення налаштування, перетворене до його типу"""
+        if name in self._typed_cache:
+            return self._typed_cache[name]
+
+        raw_value = self.get_setting(name)
+        if raw_value is None:
+            return default_value
+
+        value_type = self.SETTING_TYPES.get(name, str)
+        try:
+            if value_type is bool:
+                value = raw_value.lower() == 'true'
+            else:
+                value = value_type(raw_value)
+        except (ValueError, TypeError):
+            return default_value
+
+        self._typed_cache[name] = value
+        return value
 
     def set_setting(self, name: str, value: str) -> bool:
         """Встановлює значення налаштування"""
-        existing_setting = self.repository.get_by_name(name)
-
-        if existing_setting:
-            # Оновлюємо існуюче налаштування
-            existing_setting.setting_value = value
-            return self.repository.update(existing_setting)
-        else:
-            # Створюємо нове налаштування
-            new_setting = UserSetting(
-                id=None,
-                setting_name=name,
-                setting_value=value
-            )
-            self.repository.save(new_setting)
+        return self.set_settings({name: value})
+
+    def set_settings(self, settings: Dict[str, str]) -> bool:
+        """Встановлює кілька налаштувань однією транзакцією"""
+        cache = self._get_cache()
+        changed = {name: str(value) for name, value in settings.items()
+                   if cache.get(name) != str(value)}
+        if not changed:
             return True
 
+        saved = self.repository.save_many([
+            UserSetting(id=None, setting_name=name, setting_value=value)
+            for name, value in changed.items()
+        ])
+        if not saved:
+            return False
+
+        for name, value in changed.items():
+            cache[name] = value
+            self._typed_cache.pop(name, None)
+        for name, value in changed.items():
+            self._notify(name, value)
+        return True
+
     def get_all_settings(self) -> Dict[str, str]:
         """Отримує всі налаштування у вигляді словника"""
-        settings = self.repository.get_all()
-        return {setting.setting_name: setting.setting_value for setting in settings}
+        return dict(self._get_cache())
 
     def get_theme(self) -> str:
         """Отримує поточну тему"""
@@ -179,7 +505,7 @@ class UserSettingsService:
 
     def is_sound_enabled(self) -> bool:
         """Перевіряє, чи увімкнений звук"""
-        return self.get_setting('sound_enabled', 'true').lower() == 'true'
+        return self.get_typed_setting('sound_enabled', True)
 
     def set_sound_enabled(self, enabled: bool) -> bool:
         """Встановлює статус звуку"""
@@ -187,7 +513,7 @@ class UserSettingsService:
 
     def is_auto_notes_enabled(self) -> bool:
         """Перевіряє, чи увімкнені автоматичні нотатки"""
-        return self.get_setting('auto_notes', 'false').lower() == 'true'
+        return self.get_typed_setting('auto_notes', False)
 
     def set_auto_notes_enabled(self, enabled: bool) -> bool:
         """Встановлює статус автоматичних нотаток"""
@@ -195,7 +521,7 @@ class UserSettingsService:
 
     def is_highlight_conflicts_enabled(self) -> bool:
         """Перевіряє, чи увімкнене підсвічування конфліктів"""
-        return self.get_setting('highlight_conflicts', 'true').lower() == 'true'
+        return self.get_typed_setting('highlight_conflicts', True)
 
     def set_highlight_conflicts_enabled(self, enabled: bool) -> bool:
         """Встановлює статус підсвічування конфліктів"""
@@ -203,7 +529,7 @@ class UserSettingsService:
 
     def is_timer_shown(self) -> bool:
         """Перевіряє, чи показується таймер"""
-        return self.get_setting('show_timer', 'true').lower() == 'true'
+        return self.get_typed_setting('show_timer', True)
 
     def set_timer_shown(self, shown: bool) -> bool:
         """Встановлює, чи показувати таймер"""
@@ -211,10 +537,7 @@ class UserSettingsService:
 
     def get_max_hints(self) -> int:
         """Отримує максимальну кількість підказок"""
-        try:
-            return int(self.get_setting('max_hints', '5'))
-        except (ValueError, TypeError):
-            return 5
+        return self.get_typed_setting('max_hints', 5)
 
     def set_max_hints(self, max_hints: int) -> bool:
         """Встановлює максимальну кількість підказок"""
@@ -235,25 +558,16 @@ class UserSettingsService:
 
     def reset_settings(self) -> bool:
         """Скидає всі налаштування до значень за замовчуванням"""
-        default_settings = {
-            'theme': 'light',
-            'sound_enabled': 'true',
-            'auto_notes': 'false',
-            'highlight_conflicts': 'true',
-            'show_timer': 'true',
-            'max_hints': '5'
-        }
-
-        success = True
-        for name, value in default_settings.items():
-            if not self.set_setting(name, value):
-                success = False
-
-        return success
+        return self.set_settings(self.DEFAULT_SETTINGS)
 
     def delete_setting(self, name: str) -> bool:
         """Видаляє налаштування"""
-        return self.repository.delete(name)
+        deleted = self.repository.delete(name)
+        if deleted and self._cache is not None:
+            self._cache.pop(name, None)
+            self._typed_cache.pop(name, None)
+            self._notify(name, None)
+        return deleted
 
     def export_settings(self) -> Dict[str, str]:
         """Експортує налаштування для бекапу"""
@@ -261,8 +575,50 @@ class UserSettingsService:
 
     def import_settings(self, settings: Dict[str, str]) -> bool:
         """Імпортує налаштування з бекапу"""
-        success = True
-        for name, value in settings.items():
-            if not self.set_setting(name, value):
-                success = False
-        return success
\ No newline at end of file
+        return self.set_settings(settings)
+
+
+class ProfileService:
+    """Сервіс для роботи з профілями гравців"""
+
+    def __init__(self, repository: IProfileRepository):
+        self.repository = repository
+
+    def create_profile(self, name: str) -> int:
+        """Створює новий профіль і повертає його ID"""
+        name = name.strip()
+        if not name:
+            raise ValueError("Profile name must not be empty")
+        if self.repository.get_by_name(name) is not None:
+            raise ValueError(f"Profile already exists: {name}")
+        return self.repository.save(Profile(id=None, name=name))
+
+    def get_or_create_profile(self, name: str) -> Profile:
+        """Повертає профіль за назвою, створюючи його за потреби"""
+        profile = self.repository.get_by_name(name)
+        if profile is None:
+            profile = self.repository.get_by_id(self.create_profile(name))
+        return profile
+
+    def get_profile(self, profile_id: int) -> Optional[Profile]:
+        """Отримує профіль за ID"""
+        return self.repository.get_by_id(profile_id)
+
+    def get_profiles(self) -> List[Profile]:
+        """Отримує всі профілі"""
+        return self.repository.get_all()
+
+    def rename_profile(self, profile_id: int, name: str) -> bool:
+        """Перейменовує профіль"""
+        profile = self.repository.get_by_id(profile_id)
+        if profile is None:
+            return False
+        profile.name = name.strip()
+        self.repository.save(profile)
+        return True
+
+    def delete_profile(self, profile_id: int) -> bool:
+        """Видаляє профіль разом з усіма його даними"""
+        if profile_id == DEFAULT_PROFILE_ID:
+            raise ValueError("The default profile cannot be deleted")
+        return self.repository.delete(profile_id)
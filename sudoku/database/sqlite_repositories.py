@@ -2,28 +2,53 @@
 SQLite реалізації репозиторіїв
 """
 import sqlite3
-from typing import List, Optional
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 
-from .repositories import IGameRecordRepository, ISavedGameRepository, IUserSettingsRepository
-from .models import GameRecord, SavedGame, UserSetting
+from .repositories import (
+    IGameRecordRepository, ISavedGameRepository, IUserSettingsRepository, IProfileRepository,
+    RAW_RECORD_COLUMNS, SCORE_HISTOGRAM_BUCKET
+)
+from .models import (
+    GameRecord, SavedGame, SavedGameSummary, UserSetting, DifficultyStats, Profile, DEFAULT_PROFILE_ID
+)
 from .database_manager import DatabaseManager
 from ..models import Difficulty
 
+# Явні списки колонок для позиційного відображення рядків
+GAME_RECORD_SELECT = ', '.join(GameRecord.COLUMNS)
+SAVED_GAME_SUMMARY_SELECT = ', '.join(SavedGameSummary.COLUMNS)
+SAVED_GAME_SELECT = 'id, difficulty, current_state, solution, elapsed_time, hints_used, date_saved'
+USER_SETTING_SELECT = 'id, setting_name, setting_value'
+PROFILE_SELECT = 'id, name, created_at'
+# Допустимі значення колонки difficulty (CHECK у схемі game_records)
+_DIFFICULTY_NAMES = frozenset(Difficulty.__members__)
+
+
+def _fetch_tuples(conn, sql: str, parameters: Tuple = ()) -> List[Tuple]:
+    """Виконує запит і повертає звичайні кортежі замість sqlite3.Row"""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, parameters)
+    return cursor.fetchall()
+
 
 class SQLiteGameRecordRepository(IGameRecordRepository):
-    """SQLite реалізація репозиторію для рекордів ігор"""
+    """SQLite реалізація репозиторію для рекордів ігор одного профілю"""
 
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, profile_id: int = DEFAULT_PROFILE_ID):
         self.db_manager = db_manager
+        self.profile_id = profile_id
 
     def save(self, record: GameRecord) -> int:
         """Зберігає запис про гру і повертає ID"""
         conn = self.db_manager.get_connection()
         cursor = conn.execute("""
-            INSERT INTO game_records (difficulty, completion_time, hints_used, score, date_completed)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT INTO game_records (profile_id, difficulty, completion_time, hints_used, score, date_completed)
+            VALUES (?, ?, ?, ?, ?, ?)
         """, (
+            self.profile_id,
             record.difficulty.name,
             record.completion_time,
             record.hints_used,
@@ -36,63 +61,228 @@ class SQLiteGameRecordRepository(IGameRecordRepository):
 
     def get_by_id(self, record_id: int) -> Optional[GameRecord]:
         """Отримує запис за ID"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.execute("""
-            SELECT * FROM game_records WHERE id = ?
-        """, (record_id,))
+        conn = self.db_manager.get_read_connection()
+        rows = _fetch_tuples(conn, f"""
+            SELECT {GAME_RECORD_SELECT} FROM game_records WHERE id = ? AND profile_id = ?
+        """, (record_id, self.profile_id))
 
-        row = cursor.fetchone()
-        if row:
-            return GameRecord.from_dict(dict(row))
-        return None
+        return GameRecord.from_row(rows[0]) if rows else None
 
     def get_all(self) -> List[GameRecord]:
         """Отримує всі записи"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.execute("""
-            SELECT * FROM game_records ORDER BY date_completed DESC
-        """)
+        conn = self.db_manager.get_read_connection()
+        rows = _fetch_tuples(conn, f"""
+            SELECT {GAME_RECORD_SELECT} FROM game_records
+            WHERE profile_id = ?
+            ORDER BY date_completed DESC
+        """, (self.profile_id,))
+
+        return list(map(GameRecord.from_row, rows))
+
+    def get_by_difficulty(self, difficulty: Difficulty, limit: Optional[int] = None,
+                          offset: int = 0) -> List[GameRecord]:
+        """Отримує записи за рівнем складності, найкращі першими"""
+        conn = self.db_manager.get_read_connection()
+        rows = _fetch_tuples(conn, f"""
+            SELECT {GAME_RECORD_SELECT} FROM game_records
+            WHERE profile_id = ? AND difficulty = ?
+            ORDER BY score DESC, completion_time ASC
+            LIMIT ? OFFSET ?
+        """, (self.profile_id, difficulty.name, -1 if limit is None else limit, offset))
 
-        return [GameRecord.from_dict(dict(row)) for row in cursor.fetchall()]
+        return list(map(GameRecord.from_row, rows))
 
-    def get_by_difficulty(self, difficulty: Difficulty) -> List[GameRecord]:
-        """Отримує записи за рівнем складності"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.execute("""
-            SELECT * FROM game_records 
-            WHERE difficulty = ? 
+    def get_top_scores(self, limit: int = 10, offset: int = 0) -> List[GameRecord]:
+        """Отримує топ результатів"""
+        conn = self.db_manager.get_read_connection()
+        rows = _fetch_tuples(conn, f"""
+            SELECT {GAME_RECORD_SELECT} FROM game_records
+            WHERE profile_id = ?
             ORDER BY score DESC, completion_time ASC
-        """, (difficulty.name,))
+            LIMIT ? OFFSET ?
+        """, (self.profile_id, limit, offset))
 
-        return [GameRecord.from_dict(dict(row)) for row in cursor.fetchall()]
+        return list(map(GameRecord.from_row, rows))
 
-    def get_top_scores(self, limit: int = 10) -> List[GameRecord]:
-        """Отримує топ результатів"""
-        conn = self.db_manager.get_connection()
+    def get_difficulty_stats(self) -> List[DifficultyStats]:
+        """Отримує агреговану статистику з таблиці player_stats"""
+        conn = self.db_manager.get_read_connection()
         cursor = conn.execute("""
-            SELECT * FROM game_records 
-            ORDER BY score DESC, completion_time ASC 
-            LIMIT ?
-        """, (limit,))
+            SELECT difficulty, games_count, total_time, best_score, best_time, best_hints_used
+            FROM player_stats
+            WHERE profile_id = ? AND games_count > 0
+        """, (self.profile_id,))
+
+        return [DifficultyStats.from_dict(dict(row)) for row in cursor.fetchall()]
 
-        return [GameRecord.from_dict(dict(row)) for row in cursor.fetchall()]
+    def count_better(self, difficulty: Difficulty, score: int, completion_time: int) -> int:
+        """Рахує записи рівня з кращим результатом
+
+        Обидві умови - діапазони в індексі (profile_id, difficulty, score DESC,
+        completion_time), тож підрахунок не читає саму таблицю.
+        """
+        conn = self.db_manager.get_read_connection()
+        cursor = conn.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM game_records
+                 WHERE profile_id = ? AND difficulty = ? AND score > ?)
+              + (SELECT COUNT(*) FROM game_records
+                 WHERE profile_id = ? AND difficulty = ? AND score = ? AND completion_time < ?)
+        """, (self.profile_id, difficulty.name, score,
+              self.profile_id, difficulty.name, score, completion_time))
+
+        return cursor.fetchone()[0]
+
+    def count_by_difficulty(self, difficulty: Difficulty) -> int:
+        """Рахує записи рівня складності"""
+        conn = self.db_manager.get_read_connection()
+        cursor = conn.execute("""
+            SELECT COUNT(*) FROM game_records WHERE profile_id = ? AND difficulty = ?
+        """, (self.profile_id, difficulty.name))
+
+        return cursor.fetchone()[0]
+
+    def get_score_histogram(self, difficulty: Difficulty) -> List[Tuple[int, int]]:
+        """Повертає пари (номер кошика, кількість ігор) за зростанням балів"""
+        conn = self.db_manager.get_read_connection()
+        return _fetch_tuples(conn, """
+            SELECT bucket, games_count FROM score_histogram
+            WHERE profile_id = ? AND difficulty = ?
+            ORDER BY bucket
+        """, (self.profile_id, difficulty.name))
+
+    def iter_raw(self, batch_size: int = 5000) -> Iterator[Tuple]:
+        """Потоково повертає записи як кортежі у порядку RAW_RECORD_COLUMNS"""
+        conn = self.db_manager.get_read_connection()
+        cursor = conn.cursor()
+        cursor.row_factory = None  # Звичайні кортежі без накладних витрат sqlite3.Row
+        # Індекс (profile_id, rowid) віддає лише рядки профілю вже в порядку id;
+        # без INDEXED BY планувальник може обрати ширший індекс з префіксом
+        # profile_id і сортувати весь результат у тимчасовому B-дереві
+        cursor.execute(f"""
+            SELECT {', '.join(RAW_RECORD_COLUMNS)} FROM game_records INDEXED BY idx_game_records_profile
+            WHERE profile_id = ?
+            ORDER BY id
+        """, (self.profile_id,))
+
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+
+    def insert_raw(self, rows: Iterable[Tuple], chunk_size: int = 5000) -> int:
+        """Пакетно вставляє кортежі у порядку RAW_RECORD_COLUMNS, одна транзакція на пакет
+
+        Потригерне оновлення player_stats на час пакета вимикається, а
+        агрегати пакета додаються до статистики одним запитом у тій самій
+        транзакції. Рівень складності перевіряється для всього пакета
+        одразу, а CHECK з ``IN (...)`` на час вставки вимикається — у
+        SQLite він коштує приблизно третину часу вставки рядка.
+        """
+        conn = self.db_manager.get_connection()
+        # profile_id підставляється як константа, тож рядки не копіюються
+        sql = f"""
+            INSERT INTO game_records (profile_id, {', '.join(RAW_RECORD_COLUMNS)})
+            VALUES ({int(self.profile_id)}, {', '.join('?' for _ in RAW_RECORD_COLUMNS)})
+        """
+        iterator = iter(rows)
+        inserted = 0
+
+        if conn.in_transaction:
+            conn.commit()
+
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            unknown = {row[0] for row in chunk} - _DIFFICULTY_NAMES
+            if unknown:
+                raise sqlite3.IntegrityError(f"CHECK constraint failed: difficulty {sorted(unknown)}")
+            try:
+                # IMMEDIATE бере блокування запису до читання MAX(id): інакше рядок
+                # іншого з'єднання між читанням і вставкою врахувався б двічі —
+                # його тригером і злиттям агрегатів пакета
+                conn.execute("BEGIN IMMEDIATE")
+                last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM game_records").fetchone()[0]
+                conn.execute("INSERT INTO player_stats_suspend (id) VALUES (1)")
+                conn.execute("PRAGMA ignore_check_constraints = ON")
+                try:
+                    conn.executemany(sql, chunk)
+                finally:
+                    conn.execute("PRAGMA ignore_check_constraints = OFF")
+                conn.execute("DELETE FROM player_stats_suspend")
+                conn.execute(self._MERGE_STATS_SQL, (self.profile_id, last_id, self.profile_id))
+                conn.execute(self._MERGE_HISTOGRAM_SQL, (self.profile_id, last_id, self.profile_id))
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            inserted += len(chunk)
+
+        return inserted
+
+    # Додає агрегати записів профілю з id > ? до player_stats. Рядки пакета
+    # читаються діапазоном rowid (NOT INDEXED не дає обрати індекс profile_id,
+    # який проходить увесь профіль). Для max() SQLite бере решту колонок з
+    # рядка з максимумом, тож ключ (score << 32) - completion_time обирає
+    # найкращий бал, а за рівного балу — швидшу гру, без сортування вікном
+    _MERGE_STATS_SQL = """
+        INSERT INTO player_stats (profile_id, difficulty, games_count, total_time,
+                                  best_score, best_time, best_hints_used)
+        SELECT ?, difficulty, games_count, total_time, score, completion_time, hints_used
+        FROM (
+            SELECT difficulty, score, completion_time, hints_used,
+                   COUNT(*) AS games_count,
+                   SUM(completion_time) AS total_time,
+                   MAX((score << 32) - completion_time)
+            FROM game_records NOT INDEXED
+            WHERE id > ? AND profile_id = ?
+            GROUP BY difficulty
+        )
+        WHERE true  -- без WHERE SQLite не відрізняє ON CONFLICT від умови з'єднання
+        ON CONFLICT(profile_id, difficulty) DO UPDATE
+        SET games_count = games_count + excluded.games_count,
+            total_time = total_time + excluded.total_time,
+            best_score = CASE WHEN best_score IS NULL OR excluded.best_score > best_score
+                                  OR (excluded.best_score = best_score AND excluded.best_time < best_time)
+                              THEN excluded.best_score ELSE best_score END,
+            best_time = CASE WHEN best_score IS NULL OR excluded.best_score > best_score
+                                 OR (excluded.best_score = best_score AND excluded.best_time < best_time)
+                             THEN excluded.best_time ELSE best_time END,
+            best_hints_used = CASE WHEN best_score IS NULL OR excluded.best_score > best_score
+                                       OR (excluded.best_score = best_score AND excluded.best_time < best_time)
+                                   THEN excluded.best_hints_used ELSE best_hints_used END
+    """
+
+    # Додає бали записів профілю з id > ? до гістограми
+    _MERGE_HISTOGRAM_SQL = f"""
+        INSERT INTO score_histogram (profile_id, difficulty, bucket, games_count)
+        SELECT ?, difficulty, score / {SCORE_HISTOGRAM_BUCKET} AS bucket, COUNT(*)
+        FROM game_records NOT INDEXED
+        WHERE id > ? AND profile_id = ?
+        GROUP BY difficulty, bucket
+        ON CONFLICT(profile_id, difficulty, bucket) DO UPDATE
+        SET games_count = games_count + excluded.games_count
+    """
 
     def delete(self, record_id: int) -> bool:
         """Видаляє запис"""
         conn = self.db_manager.get_connection()
         cursor = conn.execute("""
-            DELETE FROM game_records WHERE id = ?
-        """, (record_id,))
+            DELETE FROM game_records WHERE id = ? AND profile_id = ?
+        """, (record_id, self.profile_id))
 
         conn.commit()
         return cursor.rowcount > 0
 
 
 class SQLiteSavedGameRepository(ISavedGameRepository):
-    """SQLite реалізація репозиторію для збережених ігор"""
+    """SQLite реалізація репозиторію для збережених ігор одного профілю"""
 
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, profile_id: int = DEFAULT_PROFILE_ID):
         self.db_manager = db_manager
+        self.profile_id = profile_id
 
     def save(self, game: SavedGame) -> int:
         """Зберігає гру і повертає ID"""
@@ -101,9 +291,11 @@ class SQLiteSavedGameRepository(ISavedGameRepository):
         if game.id is None:
             # Створення нового запису
             cursor = conn.execute("""
-                INSERT INTO saved_games (difficulty, current_state, solution, elapsed_time, hints_used, date_saved)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO saved_games (profile_id, difficulty, current_state, solution,
+                                         elapsed_time, hints_used, date_saved)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (
+                self.profile_id,
                 game.difficulty.name,
                 game.to_dict()['current_state'],
                 game.to_dict()['solution'],
@@ -118,13 +310,14 @@ class SQLiteSavedGameRepository(ISavedGameRepository):
                 UPDATE saved_games 
                 SET current_state = ?, elapsed_time = ?, hints_used = ?, 
                     date_saved = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
+                WHERE id = ? AND profile_id = ?
             """, (
                 game.to_dict()['current_state'],
                 game.elapsed_time,
                 game.hints_used,
                 game.date_saved.isoformat(),
-                game.id
+                game.id,
+                self.profile_id
             ))
             game_id = game.id
 
@@ -133,10 +326,10 @@ class SQLiteSavedGameRepository(ISavedGameRepository):
 
     def get_by_id(self, game_id: int) -> Optional[SavedGame]:
         """Отримує збережену гру за ID"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.execute("""
-            SELECT * FROM saved_games WHERE id = ?
-        """, (game_id,))
+        conn = self.db_manager.get_read_connection()
+        cursor = conn.execute(f"""
+            SELECT {SAVED_GAME_SELECT} FROM saved_games WHERE id = ? AND profile_id = ?
+        """, (game_id, self.profile_id))
 
         row = cursor.fetchone()
         if row:
@@ -145,19 +338,23 @@ class SQLiteSavedGameRepository(ISavedGameRepository):
 
     def get_all(self) -> List[SavedGame]:
         """Отримує всі збережені ігри"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.execute("""
-            SELECT * FROM saved_games ORDER BY date_saved DESC
-        """)
+        conn = self.db_manager.get_read_connection()
+        cursor = conn.execute(f"""
+            SELECT {SAVED_GAME_SELECT} FROM saved_games
+            WHERE profile_id = ?
+            ORDER BY date_saved DESC
+        """, (self.profile_id,))
 
         return [SavedGame.from_dict(dict(row)) for row in cursor.fetchall()]
 
     def get_latest(self) -> Optional[SavedGame]:
         """Отримує останню збережену гру"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.execute("""
-            SELECT * FROM saved_games ORDER BY date_saved DESC LIMIT 1
-        """)
+        conn = self.db_manager.get_read_connection()
+        cursor = conn.execute(f"""
+            SELECT {SAVED_GAME_SELECT} FROM saved_games
+            WHERE profile_id = ?
+            ORDER BY date_saved DESC LIMIT 1
+        """, (self.profile_id,))
 
         row = cursor.fetchone()
         if row:
@@ -174,7 +371,7 @@ class SQLiteSavedGameRepository(ISavedGameRepository):
             UPDATE saved_games 
             SET difficulty = ?, current_state = ?, solution = ?, elapsed_time = ?, 
                 hints_used = ?, date_saved = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
+            WHERE id = ? AND profile_id = ?
         """, (
             game.difficulty.name,
             game.to_dict()['current_state'],
@@ -182,46 +379,93 @@ class SQLiteSavedGameRepository(ISavedGameRepository):
             game.elapsed_time,
             game.hints_used,
             game.date_saved.isoformat(),
-            game.id
+            game.id,
+            self.profile_id
         ))
 
         conn.commit()
         return cursor.rowcount > 0
 
+    def exists(self) -> bool:
+        """Перевіряє, чи є хоча б одна збережена гра"""
+        conn = self.db_manager.get_read_connection()
+        cursor = conn.execute("""
+            SELECT EXISTS (SELECT 1 FROM saved_games WHERE profile_id = ?)
+        """, (self.profile_id,))
+
+        return bool(cursor.fetchone()[0])
+
+    def count(self) -> int:
+        """Повертає кількість збережених ігор"""
+        conn = self.db_manager.get_read_connection()
+        cursor = conn.execute("""
+            SELECT COUNT(*) FROM saved_games WHERE profile_id = ?
+        """, (self.profile_id,))
+
+        return cursor.fetchone()[0]
+
+    def get_summaries(self, limit: Optional[int] = None) -> List[SavedGameSummary]:
+        """Отримує короткі описи збережених ігор без стану дошки"""
+        conn = self.db_manager.get_read_connection()
+        # current_state і solution не вибираються, тому JSON не декодується
+        rows = _fetch_tuples(conn, f"""
+            SELECT {SAVED_GAME_SUMMARY_SELECT} FROM saved_games
+            WHERE profile_id = ?
+            ORDER BY date_saved DESC
+            LIMIT ?
+        """, (self.profile_id, limit if limit is not None else -1))
+
+        return list(map(SavedGameSummary.from_row, rows))
+
+    def touch(self, game_id: int) -> bool:
+        """Позначає збережену гру як щойно використану"""
+        conn = self.db_manager.get_connection()
+        cursor = conn.execute("""
+            UPDATE saved_games SET updated_at = CURRENT_TIMESTAMP WHERE id = ? AND profile_id = ?
+        """, (game_id, self.profile_id))
+
+        conn.commit()
+        return cursor.rowcount > 0
+
     def delete(self, game_id: int) -> bool:
         """Видаляє збережену гру"""
         conn = self.db_manager.get_connection()
         cursor = conn.execute("""
-            DELETE FROM saved_games WHERE id = ?
-        """, (game_id,))
+            DELETE FROM saved_games WHERE id = ? AND profile_id = ?
+        """, (game_id, self.profile_id))
 
         conn.commit()
         return cursor.rowcount > 0
 
 
 class SQLiteUserSettingsRepository(IUserSettingsRepository):
-    """SQLite реалізація репозиторію для налаштувань користувача"""
+    """SQLite реалізація репозиторію для налаштувань одного профілю"""
 
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, profile_id: int = DEFAULT_PROFILE_ID):
         self.db_manager = db_manager
+        self.profile_id = profile_id
 
     def save(self, setting: UserSetting) -> int:
         """Зберігає налаштування"""
         conn = self.db_manager.get_connection()
         cursor = conn.execute("""
-            INSERT OR REPLACE INTO user_settings (setting_name, setting_value)
-            VALUES (?, ?)
-        """, (setting.setting_name, setting.setting_value))
+            INSERT OR REPLACE INTO user_settings (profile_id, setting_name, setting_value)
+            VALUES (?, ?, ?)
+        """, (self.profile_id, setting.setting_name, setting.setting_value))
 
         conn.commit()
         return cursor.lastrowid
 
+    def get_by_id(self, name: str) -> Optional[UserSetting]:
+        """Отримує налаштування за ключем (назвою)"""
+        return self.get_by_name(name)
+
     def get_by_name(self, name: str) -> Optional[UserSetting]:
         """Отримує налаштування за назвою"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.execute("""
-            SELECT * FROM user_settings WHERE setting_name = ?
-        """, (name,))
+        conn = self.db_manager.get_read_connection()
+        cursor = conn.execute(f"""
+            SELECT {USER_SETTING_SELECT} FROM user_settings WHERE profile_id = ? AND setting_name = ?
+        """, (self.profile_id, name))
 
         row = cursor.fetchone()
         if row:
@@ -230,10 +474,12 @@ class SQLiteUserSettingsRepository(IUserSettingsRepository):
 
     def get_all(self) -> List[UserSetting]:
         """Отримує всі налаштування"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.execute("""
-            SELECT * FROM user_settings ORDER BY setting_name
-        """)
+        conn = self.db_manager.get_read_connection()
+        cursor = conn.execute(f"""
+            SELECT {USER_SETTING_SELECT} FROM user_settings
+            WHERE profile_id = ?
+            ORDER BY setting_name
+        """, (self.profile_id,))
 
         return [UserSetting.from_dict(dict(row)) for row in cursor.fetchall()]
 
@@ -243,20 +489,115 @@ class SQLiteUserSettingsRepository(IUserSettingsRepository):
         cursor = conn.execute("""
             UPDATE user_settings 
             SET setting_value = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE setting_name = ?
-        """, (setting.setting_value, setting.setting_name))
+            WHERE profile_id = ? AND setting_name = ?
+        """, (setting.setting_value, self.profile_id, setting.setting_name))
 
         conn.commit()
         return cursor.rowcount > 0
 
+    def save_many(self, settings: List[UserSetting]) -> bool:
+        """Створює або оновлює кілька налаштувань однією транзакцією"""
+        conn = self.db_manager.get_connection()
+        try:
+            conn.executemany("""
+                INSERT INTO user_settings (profile_id, setting_name, setting_value)
+                VALUES (?, ?, ?)
+                ON CONFLICT(profile_id, setting_name) DO UPDATE
+                SET setting_value = excluded.setting_value, updated_at = CURRENT_TIMESTAMP
+            """, [(self.profile_id, setting.setting_name, setting.setting_value) for setting in settings])
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        return True
+
     def delete(self, name: str) -> bool:
         """Видаляє налаштування"""
         conn = self.db_manager.get_connection()
         cursor = conn.execute("""
-            DELETE FROM user_settings WHERE setting_name = ?
-        """, (name,))
+            DELETE FROM user_settings WHERE profile_id = ? AND setting_name = ?
+        """, (self.profile_id, name))
 
         conn.commit()
         return cursor.rowcount > 0
 
 
+class SQLiteProfileRepository(IProfileRepository):
+    """SQLite реалізація репозиторію для профілів гравців"""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+
+    def save(self, profile: Profile) -> int:
+        """Створює профіль або перейменовує наявний і повертає ID"""
+        conn = self.db_manager.get_connection()
+
+        if profile.id is None:
+            cursor = conn.execute("""
+                INSERT INTO profiles (name) VALUES (?)
+            """, (profile.name,))
+            profile_id = cursor.lastrowid
+        else:
+            conn.execute("""
+                UPDATE profiles SET name = ? WHERE id = ?
+            """, (profile.name, profile.id))
+            profile_id = profile.id
+
+        conn.commit()
+        return profile_id
+
+    def get_by_id(self, profile_id: int) -> Optional[Profile]:
+        """Отримує профіль за ID"""
+        conn = self.db_manager.get_read_connection()
+        cursor = conn.execute(f"""
+            SELECT {PROFILE_SELECT} FROM profiles WHERE id = ?
+        """, (profile_id,))
+
+        row = cursor.fetchone()
+        if row:
+            return Profile.from_dict(dict(row))
+        return None
+
+    def get_by_name(self, name: str) -> Optional[Profile]:
+        """Отримує профіль за назвою"""
+        conn = self.db_manager.get_read_connection()
+        cursor = conn.execute(f"""
+            SELECT {PROFILE_SELECT} FROM profiles WHERE name = ?
+        """, (name,))
+
+        row = cursor.fetchone()
+        if row:
+            return Profile.from_dict(dict(row))
+        return None
+
+    def get_all(self) -> List[Profile]:
+        """Отримує всі профілі"""
+        conn = self.db_manager.get_read_connection()
+        cursor = conn.execute(f"""
+            SELECT {PROFILE_SELECT} FROM profiles ORDER BY name
+        """)
+
+        return [Profile.from_dict(dict(row)) for row in cursor.fetchall()]
+
+    def delete(self, profile_id: int) -> bool:
+        """Видаляє профіль разом з усіма його даними"""
+        conn = self.db_manager.get_connection()
+
+        if conn.in_transaction:
+            conn.commit()
+
+        try:
+            conn.execute("BEGIN")
+            # Статистика профілю видаляється цілком, тож тригер не потрібен
+            conn.execute("INSERT INTO player_stats_suspend (id) VALUES (1)")
+            conn.execute("DELETE FROM game_records WHERE profile_id = ?", (profile_id,))
+            conn.execute("DELETE FROM player_stats_suspend")
+            for table in ('player_stats', 'score_histogram', 'game_records_daily', 'saved_games', 'user_settings'):
+                conn.execute(f"DELETE FROM {table} WHERE profile_id = ?", (profile_id,))
+            cursor = conn.execute("DELETE FROM profiles WHERE id = ?", (profile_id,))
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+        return cursor.rowcount > 0
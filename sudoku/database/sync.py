@@ -0,0 +1,339 @@
+"""
+Фонова синхронізація нових рекордів з віддаленим HTTP-сервером
+
+Синхронізатор читає рядки game_records з ID, більшим за збережену
+позначку (high-water mark), і надсилає їх пакетами POST-запитами
+через постійне keep-alive з'єднання. Кожен пакет має ключ
+ідемпотентності, а межі ще не підтвердженого пакета зберігаються до
+відповіді сервера: після збою надсилається той самий діапазон з тим
+самим ключем, навіть якщо тим часом з'явилися нові рекорди, тож
+повторне надсилання не дублює дані на сервері. Уся робота виконується у фоновому потоці з власним
+з'єднанням SQLite, тому гра ніколи не чекає на мережу.
+"""
+import http.client
+import json
+import logging
+import random
+import sqlite3
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Кількість рекордів в одному запиті
+DEFAULT_SYNC_BATCH_SIZE = 500
+# Пауза між перевірками нових рекордів, с
+DEFAULT_SYNC_INTERVAL = 30.0
+# Межі експоненційної затримки після помилки, с
+DEFAULT_BACKOFF_BASE = 1.0
+DEFAULT_BACKOFF_MAX = 300.0
+# Тайм-аут одного HTTP-запиту, с
+DEFAULT_HTTP_TIMEOUT = 10.0
+
+# Колонки, що надсилаються на сервер
+SYNC_COLUMNS = ('id', 'profile_id', 'difficulty', 'completion_time', 'hints_used', 'score', 'date_completed')
+# Коди відповіді, після яких запит варто повторити
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class SyncError(Exception):
+    """Помилка надсилання пакета"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class HTTPConnectionPool:
+    """Невеликий пул постійних HTTP/1.1 з'єднань з одним сервером"""
+
+    def __init__(self, url: str, size: int = 2, timeout: float = DEFAULT_HTTP_TIMEOUT):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported sync URL scheme: {parts.scheme}")
+
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path or '/'
+        if parts.query:
+            self.path += '?' + parts.query
+        self.size = size
+        self.timeout = timeout
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        connection_class = (http.client.HTTPSConnection if self.scheme == 'https'
+                            else http.client.HTTPConnection)
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._new_connection()
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def post_json(self, payload: Dict[str, Any], headers: Dict[str, str]) -> Tuple[int, bytes]:
+        """Надсилає JSON і повертає (статус, тіло відповіді)
+
+        З'єднання, закрите сервером між запитами, один раз
+        перевідкривається прозоро.
+        """
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        request_headers = {'Content-Type': 'application/json', 'Connection': 'keep-alive'}
+        request_headers.update(headers)
+
+        for attempt in range(2):
+            connection = self._acquire()
+            try:
+                connection.request('POST', self.path, body=body, headers=request_headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if attempt == 0:
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(connection)
+            return response.status, data
+
+        raise SyncError("Connection closed by server")
+
+    def close(self) -> None:
+        """Закриває всі з'єднання пулу"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+class RecordSync:
+    """Пакетне фонове надсилання нових рекордів з повторними спробами"""
+
+    def __init__(self, db_path: str, endpoint: str,
+                 batch_size: int = DEFAULT_SYNC_BATCH_SIZE,
+                 interval: float = DEFAULT_SYNC_INTERVAL,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_max: float = DEFAULT_BACKOFF_MAX,
+                 timeout: float = DEFAULT_HTTP_TIMEOUT):
+        self.db_path = db_path
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.interval = interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool = HTTPConnectionPool(endpoint, timeout=timeout)
+
+        self._mark_key = f"high_water:{endpoint}"
+        # Межі надісланого, але ще не підтвердженого пакета: "first-last"
+        self._pending_key = f"pending:{endpoint}"
+        self._failures = 0
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        # run_once може викликатись і з фонового потоку, і напряму
+        self._lock = threading.RLock()
+        self.logger = logging.getLogger(__name__)
+
+    # --- Стан синхронізації -------------------------------------------
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Власне з'єднання синхронізатора, окреме від з'єднання гри"""
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        return self._connection
+
+    def _get_state(self, key: str) -> Optional[str]:
+        row = self._get_connection().execute("""
+            SELECT value FROM sync_state WHERE key = ?
+        """, (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: str) -> None:
+        conn = self._get_connection()
+        conn.execute("""
+            INSERT INTO sync_state (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+        """, (key, value))
+        conn.commit()
+
+    @property
+    def client_id(self) -> str:
+        """Постійний ідентифікатор цієї інсталяції"""
+        value = self._get_state('client_id')
+        if value is None:
+            value = uuid.uuid4().hex
+            self._set_state('client_id', value)
+        return value
+
+    def get_high_water_mark(self) -> int:
+        """Повертає ID останнього надісланого рекорду"""
+        value = self._get_state(self._mark_key)
+        return int(value) if value is not None else 0
+
+    def get_pending_range(self) -> Optional[Tuple[int, int]]:
+        """Повертає межі пакета, що чекає на підтвердження сервера"""
+        value = self._get_state(self._pending_key)
+        if not value:
+            return None
+        first_id, last_id = value.split('-')
+        return int(first_id), int(last_id)
+
+    def _acknowledge(self, last_id: int) -> None:
+        """Зсуває позначку і забуває підтверджений пакет однією транзакцією"""
+        conn = self._get_connection()
+        with conn:
+            conn.execute("""
+                INSERT INTO sync_state (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+            """, (self._mark_key, str(last_id)))
+            conn.execute("DELETE FROM sync_state WHERE key = ?", (self._pending_key,))
+
+    def pending_count(self) -> int:
+        """Повертає кількість ще не надісланих рекордів"""
+        return self._get_connection().execute("""
+            SELECT COUNT(*) FROM game_records WHERE id > ?
+        """, (self.get_high_water_mark(),)).fetchone()[0]
+
+    # --- Надсилання ---------------------------------------------------
+
+    def _next_batch(self, after_id: int) -> List[Tuple]:
+        return self._get_connection().execute(f"""
+            SELECT {', '.join(SYNC_COLUMNS)} FROM game_records
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        """, (after_id, self.batch_size)).fetchall()
+
+    def _rows_in_range(self, first_id: int, last_id: int) -> List[Tuple]:
+        return self._get_connection().execute(f"""
+            SELECT {', '.join(SYNC_COLUMNS)} FROM game_records
+            WHERE id BETWEEN ? AND ?
+            ORDER BY id
+        """, (first_id, last_id)).fetchall()
+
+    def _send_batch(self, client_id: str, first_id: int, last_id: int, rows: List[Tuple]) -> None:
+        """Надсилає один пакет; ключ ідемпотентності — збережені межі пакета"""
+        payload = {
+            'client_id': client_id,
+            'records': [dict(zip(SYNC_COLUMNS, row)) for row in rows]
+        }
+        headers = {'Idempotency-Key': f"{client_id}:{first_id}-{last_id}"}
+
+        try:
+            status, body = self.pool.post_json(payload, headers)
+        except (OSError, http.client.HTTPException) as e:
+            raise SyncError(f"Sync request failed: {e}")
+
+        if 200 <= status < 300:
+            return
+        raise SyncError(f"Sync endpoint returned {status}: {body[:200]!r}",
+                        retryable=status in RETRYABLE_STATUSES)
+
+    def run_once(self) -> int:
+        """Надсилає всі нові рекорди і повертає їх кількість
+
+        Межі пакета записуються до надсилання, а позначка зсувається
+        лише після успішної відповіді сервера. Якщо відповідь втрачено,
+        наступна спроба надсилає рівно ті самі рекорди з тим самим
+        ключем — нові рекорди потрапляють уже в наступний пакет.
+        """
+        with self._lock:
+            client_id = self.client_id
+            mark = self.get_high_water_mark()
+            sent = 0
+
+            while not self._stop_event.is_set():
+                pending = self.get_pending_range()
+                if pending:
+                    first_id, last_id = pending
+                    # Частину рядків могло бути згорнуто обслуговуванням
+                    rows = self._rows_in_range(first_id, last_id)
+                else:
+                    rows = self._next_batch(mark)
+                    if not rows:
+                        break
+                    first_id, last_id = rows[0][0], rows[-1][0]
+                    self._set_state(self._pending_key, f"{first_id}-{last_id}")
+
+                if rows:
+                    self._send_batch(client_id, first_id, last_id, rows)
+                self._acknowledge(last_id)
+                mark = last_id
+                sent += len(rows)
+
+        if sent:
+            self.logger.info(f"Synced {sent} game records to {self.endpoint}")
+        return sent
+
+    def _backoff_delay(self) -> float:
+        """Експоненційна затримка з випадковим розкидом"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (self._failures - 1)))
+        return random.uniform(delay / 2, delay)
+
+    # --- Фоновий потік ------------------------------------------------
+
+    def notify(self) -> None:
+        """Повідомляє про новий рекорд; не блокує виклик"""
+        self._wake_event.set()
+
+    def start(self) -> None:
+        """Запускає фоновий потік синхронізації"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='sudoku-sync', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Зупиняє фоновий потік"""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.pool.close()
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _run(self) -> None:
+        """Цикл фонового потоку"""
+        while not self._stop_event.is_set():
+            self._wake_event.clear()
+            try:
+                self.run_once()
+                self._failures = 0
+            except SyncError as e:
+                self._failures += 1
+                delay = self._backoff_delay()
+                level = logging.WARNING if e.retryable else logging.ERROR
+                self.logger.log(level, f"{e}; retrying in {delay:.1f}s")
+                # Нові рекорди не скорочують затримку після помилки
+                self._stop_event.wait(delay)
+                continue
+            except sqlite3.Error as e:
+                self._failures += 1
+                delay = self._backoff_delay()
+                self.logger.error(f"Error reading records for sync: {e}")
+                self._stop_event.wait(delay)
+                continue
+
+            self._wake_event.wait(self.interval)
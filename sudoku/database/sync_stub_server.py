@@ -0,0 +1,161 @@
+"""
+Локальний сервер-заглушка віддаленої таблиці лідерів
+
+Приймає пакети від RecordSync, пам'ятає ключі ідемпотентності та
+може штучно відповідати помилками або обривати з'єднання після
+збереження пакета, щоб перевірити повторні спроби.
+Запуск: ``python -m sudoku.database.sync_stub_server --port 8765``
+"""
+import argparse
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+class _SyncRequestHandler(BaseHTTPRequestHandler):
+    """Обробник POST-запитів з пакетами рекордів"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive між запитами
+
+    def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        server: SyncStubServer = self.server.stub
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+
+        status = server.next_failure()
+        if status:
+            self._reply(status, {'error': 'injected failure'})
+            return
+
+        try:
+            payload = json.loads(body)
+            records = payload['records']
+        except (ValueError, KeyError):
+            self._reply(400, {'error': 'malformed payload'})
+            return
+
+        accepted = server.accept(self.headers.get('Idempotency-Key'), records)
+        if server.next_drop():
+            # Пакет збережено, але клієнт відповіді не отримає
+            self.close_connection = True
+            return
+        self._reply(200, {'accepted': accepted, 'duplicate': not accepted and bool(records)})
+
+    def log_message(self, format: str, *args) -> None:
+        logging.getLogger(__name__).debug(format % args)
+
+
+class SyncStubServer:
+    """Сервер-заглушка у фоновому потоці"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), _SyncRequestHandler)
+        self.httpd.stub = self
+        self.records: List[Dict[str, Any]] = []
+        self.requests = 0
+        self.connections = 0
+        self._keys: set = set()
+        self._failures: List[int] = []
+        self._drops = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        # Рахуємо нові TCP-з'єднання, щоб перевіряти keep-alive
+        original_process = self.httpd.process_request
+
+        def process_request(request, client_address):
+            with self._lock:
+                self.connections += 1
+            original_process(request, client_address)
+        self.httpd.process_request = process_request
+
+    @property
+    def url(self) -> str:
+        """Адреса, на яку слід надсилати пакети"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/records"
+
+    def fail_next(self, *statuses: int) -> None:
+        """Змушує наступні запити відповісти вказаними кодами"""
+        with self._lock:
+            self._failures.extend(statuses)
+
+    def next_failure(self) -> Optional[int]:
+        with self._lock:
+            self.requests += 1
+            return self._failures.pop(0) if self._failures else None
+
+    def drop_next_responses(self, count: int = 1) -> None:
+        """Наступні ``count`` пакетів зберігаються, але без відповіді клієнту"""
+        with self._lock:
+            self._drops += count
+
+    def next_drop(self) -> bool:
+        with self._lock:
+            if self._drops:
+                self._drops -= 1
+                return True
+            return False
+
+    @property
+    def record_ids(self) -> List[int]:
+        """ID отриманих рекордів у порядку надходження"""
+        with self._lock:
+            return [record['id'] for record in self.records]
+
+    def accept(self, key: Optional[str], records: List[Dict[str, Any]]) -> int:
+        """Зберігає пакет, якщо його ключ ще не траплявся"""
+        with self._lock:
+            if key is not None:
+                if key in self._keys:
+                    return 0
+                self._keys.add(key)
+            self.records.extend(records)
+            return len(records)
+
+    def start(self) -> 'SyncStubServer':
+        """Запускає сервер у фоновому потоці"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='sync-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Зупиняє сервер"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Local stub for the remote leaderboard endpoint")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG)
+    server = SyncStubServer(args.host, args.port)
+    print(f"Listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"Received {len(server.records)} records in {server.requests} requests")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -10,5 +10,19 @@ from .states.playing_state import PlayingState
 from .timer import GameTimer
 from .game_builder import GameBuilder  # ДОДАТИ
 from .game_facade import GameFacade    # ДОДАТИ
+from .frame_profiler import FrameProfiler
+from .startup import StartupProfile
 
-__all__ = ['Game', 'IGameState', 'PlayingState', 'GameOverState', 'PausedState', 'GameTimer', 'GameBuilder', 'GameFacade']  # ОНОВИТИ
\ No newline at end of file
+__all__ = ['Game', 'IGameState', 'PlayingState', 'GameOverState', 'PausedState', 'GameTimer', 'GameBuilder', 'GameFacade',
+           'HeadlessRunner', 'LoadTestReport', 'EventRecorder', 'FrameProfiler', 'StartupProfile']  # ОНОВИТИ
+
+# Інструменти навантажувального тестування не потрібні для запуску гри,
+# тож імпортуються лише під час першого звернення
+_LAZY_HEADLESS = ('HeadlessRunner', 'LoadTestReport', 'EventRecorder')
+
+
+def __getattr__(name):
+    if name in _LAZY_HEADLESS:
+        from . import headless
+        return getattr(headless, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
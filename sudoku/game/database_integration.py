@@ -1,17 +1,22 @@
 """
 Модуль для інтеграції бази даних з грою
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Tuple
 import logging
 
 from ..database import (
     DatabaseManager,
+    DatabaseMaintenance,
     GameRecordService,
     SavedGameService,
     UserSettingsService,
+    ProfileService,
     SQLiteGameRecordRepository,
     SQLiteSavedGameRepository,
-    SQLiteUserSettingsRepository
+    SQLiteUserSettingsRepository,
+    SQLiteProfileRepository,
+    RecordSync,
+    DEFAULT_PROFILE_ID
 )
 from ..models import Difficulty, Cell
 
@@ -19,22 +24,19 @@ from ..models import Difficulty, Cell
 class GameDatabaseManager:
     """Менеджер для роботи з базою даних в грі"""
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, profile_id: int = DEFAULT_PROFILE_ID):
         self.db_manager = DatabaseManager(db_path)
 
         # Ініціалізуємо базу даних
         try:
             self.db_manager.initialize_database()
 
-            # Створюємо репозиторії
-            self.game_record_repo = SQLiteGameRecordRepository(self.db_manager)
-            self.saved_game_repo = SQLiteSavedGameRepository(self.db_manager)
-            self.user_settings_repo = SQLiteUserSettingsRepository(self.db_manager)
+            self.profile_service = ProfileService(SQLiteProfileRepository(self.db_manager))
+            self._create_profile_services(profile_id)
 
-            # Створюємо сервіси
-            self.game_record_service = GameRecordService(self.game_record_repo)
-            self.saved_game_service = SavedGameService(self.saved_game_repo)
-            self.user_settings_service = UserSettingsService(self.user_settings_repo)
+            # Обслуговування бази виконується лише під час простою гри
+            self.maintenance = DatabaseMaintenance(self.db_manager)
+            self.sync: Optional[RecordSync] = None
 
             logging.info("Database successfully initialized")
 
@@ -42,6 +44,55 @@ class GameDatabaseManager:
             logging.error(f"Failed to initialize database: {e}")
             raise
 
+    def _create_profile_services(self, profile_id: int) -> None:
+        """Створює репозиторії та сервіси, обмежені одним профілем"""
+        self.profile_id = profile_id
+
+        # Створюємо репозиторії
+        self.game_record_repo = SQLiteGameRecordRepository(self.db_manager, profile_id)
+        self.saved_game_repo = SQLiteSavedGameRepository(self.db_manager, profile_id)
+        self.user_settings_repo = SQLiteUserSettingsRepository(self.db_manager, profile_id)
+
+        # Створюємо сервіси
+        self.game_record_service = GameRecordService(self.game_record_repo)
+        self.saved_game_service = SavedGameService(self.saved_game_repo)
+        self.user_settings_service = UserSettingsService(self.user_settings_repo)
+
+    def get_profiles(self):
+        """Отримує всі профілі гравців"""
+        try:
+            return self.profile_service.get_profiles()
+        except Exception as e:
+            logging.error(f"Failed to get profiles: {e}")
+            return []
+
+    def create_profile(self, name: str) -> Optional[int]:
+        """Створює профіль гравця і повертає його ID"""
+        try:
+            return self.profile_service.create_profile(name)
+        except Exception as e:
+            logging.error(f"Failed to create profile: {e}")
+            return None
+
+    def switch_profile(self, profile_id: int) -> bool:
+        """Перемикає всі сервіси на інший профіль, зберігаючи підписників налаштувань"""
+        try:
+            if self.profile_service.get_profile(profile_id) is None:
+                logging.error(f"Profile not found: {profile_id}")
+                return False
+
+            listeners = self.user_settings_service.listeners
+            self._create_profile_services(profile_id)
+            for callback in listeners:
+                self.user_settings_service.add_listener(callback)
+            # Підписники отримують значення налаштувань нового профілю
+            self.user_settings_service.notify_all()
+            logging.info(f"Switched to profile {profile_id}")
+            return True
+        except Exception as e:
+            logging.error(f"Failed to switch profile: {e}")
+            return False
+
     def save_game_record(self, difficulty: Difficulty, completion_time: int, hints_used: int) -> bool:
         """Зберігає результат завершеної гри"""
         try:
@@ -54,6 +105,20 @@ class GameDatabaseManager:
             logging.error(f"Failed to save game record: {e}")
             return False
 
+    def complete_game(self, difficulty: Difficulty, completion_time: int, hints_used: int):
+        """Зберігає результат завершеної гри і повертає його місце серед рекордів"""
+        try:
+            record_id = self.game_record_service.save_game_record(
+                difficulty, completion_time, hints_used
+            )
+            logging.info(f"Game record saved with ID: {record_id}")
+            if self.sync:
+                self.sync.notify()
+            return self.game_record_service.get_record_rank(record_id)
+        except Exception as e:
+            logging.error(f"Failed to save game record: {e}")
+            return None
+
     def save_current_game(self, difficulty: Difficulty, grid: List[List[Cell]],
                           solution: List[List[int]], elapsed_time: int, hints_used: int) -> bool:
         """Зберігає поточну гру"""
@@ -83,6 +148,14 @@ class GameDatabaseManager:
             logging.error(f"Failed to get saved games: {e}")
             return []
 
+    def get_saved_game_summaries(self, limit: Optional[int] = None):
+        """Отримує список збережених ігор без завантаження дошок"""
+        try:
+            return self.saved_game_service.get_save_summaries(limit)
+        except Exception as e:
+            logging.error(f"Failed to get saved game summaries: {e}")
+            return []
+
     def delete_saved_game(self, game_id: int) -> bool:
         """Видаляє збережену гру"""
         try:
@@ -107,6 +180,27 @@ class GameDatabaseManager:
             logging.error(f"Failed to get leaderboard: {e}")
             return []
 
+    def open_record_reader(self) -> Optional[Tuple[GameRecordService, Callable[[], None]]]:
+        """Створює сервіс рекордів з власним з'єднанням для фонового потоку
+
+        Повертає (сервіс, функція закриття). З'єднання відкривається під
+        час першого запиту, тож і запити, і закриття мають виконуватися в
+        потоці, що ним користується. Кеш запитів спільний з основним
+        сервісом: повторні відкриття екрана рекордів не звертаються до бази,
+        а нові рекорди та згортання скидають кеш і для читача. Для бази в
+        пам'яті друге з'єднання неможливе, тому повертається None.
+        """
+        if self.db_manager.is_memory:
+            return None
+        try:
+            manager = DatabaseManager(self.db_manager.db_path)
+            service = GameRecordService(SQLiteGameRecordRepository(manager, self.profile_id),
+                                        cache=self.game_record_service.cache)
+            return service, manager.disconnect
+        except Exception as e:
+            logging.error(f"Failed to open record reader: {e}")
+            return None
+
     def get_personal_stats(self) -> Dict[str, Any]:
         """Отримує персональну статистику"""
         try:
@@ -132,6 +226,14 @@ class GameDatabaseManager:
             logging.error(f"Failed to set user setting {name}: {e}")
             return False
 
+    def add_settings_listener(self, callback) -> None:
+        """Підписує обробник (name, value) на зміни налаштувань"""
+        self.user_settings_service.add_listener(callback)
+
+    def remove_settings_listener(self, callback) -> None:
+        """Відписує обробник змін налаштувань"""
+        self.user_settings_service.remove_listener(callback)
+
     def get_theme(self) -> str:
         """Отримує поточну тему"""
         return self.user_settings_service.get_theme()
@@ -168,9 +270,51 @@ class GameDatabaseManager:
             logging.error(f"Failed to set max hints: {e}")
             return False
 
+    def run_idle_maintenance(self) -> int:
+        """Виконує крок обслуговування бази під час простою"""
+        try:
+            report = self.maintenance.run_idle_step()
+            if report.records_rolled_up:
+                # Згортання прибрало рядки з таблиць лідерів
+                self.game_record_service.invalidate_cache()
+            return report.pages_freed
+        except Exception as e:
+            logging.error(f"Failed to run database maintenance: {e}")
+            return 0
+
+    def start_sync(self, endpoint: str) -> bool:
+        """Запускає фонову синхронізацію рекордів з віддаленою таблицею лідерів"""
+        if self.db_manager.is_memory:
+            logging.warning("Leaderboard sync is not available for in-memory databases")
+            return False
+        try:
+            self.stop_sync()
+            self.sync = RecordSync(self.db_manager.db_path, endpoint)
+            self.sync.start()
+            return True
+        except Exception as e:
+            logging.error(f"Failed to start leaderboard sync: {e}")
+            self.sync = None
+            return False
+
+    def stop_sync(self) -> None:
+        """Зупиняє фонову синхронізацію рекордів"""
+        if self.sync:
+            self.sync.stop(timeout=1.0)
+            self.sync = None
+
+    def get_query_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Повертає статистику SQL-запитів"""
+        try:
+            return self.db_manager.get_query_metrics()
+        except Exception as e:
+            logging.error(f"Failed to get query metrics: {e}")
+            return {}
+
     def close(self):
         """Закриває з'єднання з базою даних"""
         try:
+            self.stop_sync()
             self.db_manager.disconnect()
         except Exception as e:
             logging.error(f"Failed to close database connection: {e}")
@@ -0,0 +1,187 @@
+"""
+Профайлер кадрів: час кожної фази кадру, перцентилі, кадри понад
+бюджет, оверлей на екрані та журнал у CSV
+"""
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+import pygame
+
+# Фази кадру; час кожної рахується без вкладених фаз
+PHASES = ('events', 'update', 'render', 'present', 'db')
+# Бюджет одного кадру при 30 FPS, мс
+DEFAULT_FRAME_BUDGET_MS = 1000 / 30
+# Кількість останніх кадрів, за якими рахуються перцентилі
+DEFAULT_WINDOW = 300
+# Мінімальний інтервал між попередженнями про повільні кадри, с
+SLOW_FRAME_WARNING_INTERVAL = 5.0
+
+OVERLAY_BACKGROUND = (20, 20, 20)
+OVERLAY_TEXT = (230, 230, 230)
+OVERLAY_WARNING = (255, 180, 0)
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Перцентиль за найближчим рангом"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class FrameSample:
+    """Час фаз одного кадру"""
+
+    __slots__ = ('state', 'phases', 'total')
+
+    def __init__(self, state: str, phases: Dict[str, float]):
+        self.state = state
+        self.phases = phases
+        self.total = sum(phases.values())
+
+
+class FrameProfiler:
+    """Збирає час фаз кожного кадру у ковзному вікні
+
+    Фази можуть бути вкладеними (наприклад, запит до бази під час
+    обробки події) — тоді час вкладеної фази віднімається від
+    зовнішньої, і сума фаз дорівнює часу кадру.
+    """
+
+    def __init__(self, budget_ms: float = DEFAULT_FRAME_BUDGET_MS, window: int = DEFAULT_WINDOW,
+                 log_path: Optional[str] = None):
+        self.budget_ms = budget_ms
+        self.samples: Deque[FrameSample] = deque(maxlen=window)
+        self.overlay_visible = False
+        self.frames = 0
+        self.logger = logging.getLogger(__name__)
+
+        self._current: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self._stack: List[List] = []  # [назва, початок, час вкладених фаз]
+        # Попередження про повільні кадри не частіше за SLOW_FRAME_WARNING_INTERVAL
+        self._last_warning = float('-inf')
+        self._slow_since_warning = 0
+        # Область оверлею не зменшується, доки він показаний: інакше на
+        # екрані з відстеженням пошкоджень лишається смуга ширшого кадру
+        self._overlay_rect: Optional[pygame.Rect] = None
+        self._log = None
+        if log_path:
+            self._log = open(log_path, 'w', encoding='utf-8')
+            self._log.write(','.join(('frame', 'state') + PHASES + ('total',)) + '\n')
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Вимірює фазу кадру"""
+        entry = [name, time.perf_counter(), 0.0]
+        self._stack.append(entry)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = (time.perf_counter() - entry[1]) * 1000
+            self._current[name] += elapsed - entry[2]
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+    def end_frame(self, state: str) -> FrameSample:
+        """Завершує кадр і додає його у вікно"""
+        sample = FrameSample(state, self._current)
+        self._current = dict.fromkeys(PHASES, 0.0)
+        self.samples.append(sample)
+        self.frames += 1
+
+        if sample.total > self.budget_ms:
+            self._report_slow_frame(sample)
+
+        if self._log:
+            values = [f"{sample.phases[name]:.3f}" for name in PHASES]
+            self._log.write(f"{self.frames},{state},{','.join(values)},{sample.total:.3f}\n")
+        return sample
+
+    def _report_slow_frame(self, sample: FrameSample) -> None:
+        """Пише кожен повільний кадр у DEBUG, а попередження — не частіше за інтервал"""
+        breakdown = ', '.join(f"{name} {sample.phases[name]:.1f}" for name in PHASES if sample.phases[name])
+        message = f"Slow frame {self.frames} in {sample.state}: {sample.total:.1f} ms ({breakdown})"
+        self._slow_since_warning += 1
+
+        now = time.perf_counter()
+        if now - self._last_warning < SLOW_FRAME_WARNING_INTERVAL:
+            self.logger.debug(message)
+            return
+        self.logger.warning(f"{message}; {self._slow_since_warning} slow frames since last warning")
+        self._last_warning = now
+        self._slow_since_warning = 0
+
+    def toggle_overlay(self) -> bool:
+        """Показує або ховає оверлей; повертає новий стан"""
+        self.overlay_visible = not self.overlay_visible
+        self._overlay_rect = None
+        return self.overlay_visible
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Перцентилі p50/p95/p99 для кожної фази та всього кадру"""
+        result = {}
+        for name in PHASES + ('total',):
+            values = sorted(sample.total if name == 'total' else sample.phases[name]
+                            for sample in self.samples)
+            result[name] = {
+                'p50': _percentile(values, 0.50),
+                'p95': _percentile(values, 0.95),
+                'p99': _percentile(values, 0.99)
+            }
+        return result
+
+    def over_budget(self) -> int:
+        """Кількість кадрів у вікні, довших за бюджет"""
+        return sum(1 for sample in self.samples if sample.total > self.budget_ms)
+
+    def slowest_states(self, limit: int = 3) -> List[Tuple[str, float]]:
+        """Стани з найповільнішими кадрами у вікні"""
+        worst: Dict[str, float] = {}
+        for sample in self.samples:
+            if sample.total > worst.get(sample.state, 0.0):
+                worst[sample.state] = sample.total
+        return sorted(worst.items(), key=lambda item: -item[1])[:limit]
+
+    def draw_overlay(self, surface: pygame.Surface, font: pygame.font.Font, glyphs) -> pygame.Rect:
+        """Малює оверлей у правому верхньому куті і повертає його область"""
+        summary = self.summary()
+        over = self.over_budget()
+        lines = [(f"frames {len(self.samples)}  over {self.budget_ms:.0f}ms: {over}",
+                  OVERLAY_WARNING if over else OVERLAY_TEXT),
+                 ("phase      p50    p95    p99", OVERLAY_TEXT)]
+        for name in PHASES + ('total',):
+            stats = summary[name]
+            lines.append((f"{name:<8}{stats['p50']:>7.2f}{stats['p95']:>7.2f}{stats['p99']:>7.2f}",
+                          OVERLAY_WARNING if stats['p99'] > self.budget_ms else OVERLAY_TEXT))
+        for state, worst in self.slowest_states():
+            lines.append((f"{state[:18]:<18}{worst:>8.1f}", OVERLAY_TEXT))
+
+        line_height = font.get_height()
+        width = max(sum(glyphs.get(font, char, color).get_width() for char in text)
+                    for text, color in lines) + 12
+        rect = pygame.Rect(0, 0, width, line_height * len(lines) + 8)
+        rect.topright = (surface.get_width() - 4, 4)
+        previous = self._overlay_rect
+        if previous is not None and previous.right == rect.right:
+            rect.union_ip(previous)
+        self._overlay_rect = rect
+
+        surface.fill(OVERLAY_BACKGROUND, rect)
+        for index, (text, color) in enumerate(lines):
+            glyphs.blit_text(surface, font, text, color, (rect.x + 6, rect.y + 4 + index * line_height))
+        return rect
+
+    def close(self) -> None:
+        """Записує підсумок і закриває журнал"""
+        if self.samples:
+            total = self.summary()['total']
+            self.logger.info(f"Frame times over last {len(self.samples)} frames: "
+                             f"p50 {total['p50']:.2f} ms, p95 {total['p95']:.2f} ms, "
+                             f"p99 {total['p99']:.2f} ms, {self.over_budget()} over budget")
+        if self._log:
+            self._log.close()
+            self._log = None
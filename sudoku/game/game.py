@@ -1,6 +1,7 @@
 import pygame
 import logging
-from typing import Optional, Tuple
+import time
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
 
 from sudoku.game.states.main_menu_state import MainMenuState
 from sudoku.game.states.game_over_state import GameOverState
@@ -8,26 +9,44 @@ from sudoku.game.states.paused_state import PausedState
 from sudoku.game.states.playing_state import PlayingState
 from sudoku.game.states.i_game_state import IGameState
 
-from sudoku.config import GRID_SIZE
+from sudoku.config import GRID_SIZE, EVENT_DRIVEN_LOOP, FRAME_PROFILE_LOG, WHITE
 from sudoku.models import Difficulty
 from sudoku.game.game_builder import GameBuilder
 from sudoku.game.game_facade import GameFacade
-from sudoku.game.database_integration import GameDatabaseManager
+from sudoku.game.frame_profiler import FrameProfiler
+from sudoku.game.startup import StartupProfile, DatabaseWarmup
+from sudoku.ui.layout import Layout
+
+if TYPE_CHECKING:
+    # Модулі бази імпортуються у фоновому потоці під час запуску
+    from sudoku.game.database_integration import GameDatabaseManager
 
 # Константа замість магічного числа
-FPS = 30
+FPS = 30  # для циклу з фіксованою частотою кадрів
+# Як часто (мс) виконувати крок обслуговування бази під час простою
+IDLE_MAINTENANCE_INTERVAL = 5000
 
 
 # ✳️ Хелпер для безпечного доступу до бази даних
 class DatabaseHelper:
-    def __init__(self, db_manager: Optional[GameDatabaseManager]):
+    def __init__(self, db_manager: Optional['GameDatabaseManager'],
+                 profiler: Optional[FrameProfiler] = None,
+                 connect: Optional[Callable[[], None]] = None):
         self.db = db_manager
+        self.profiler = profiler
+        # Приєднує базу, що готується у фоні; викликається при першому запиті
+        self.connect = connect
 
     def execute(self, action, default=None):
+        if not self.db and self.connect:
+            self.connect()
         if not self.db:
             logging.warning("Database not available")
             return default
         try:
+            if self.profiler:
+                with self.profiler.phase('db'):
+                    return action(self.db)
             return action(self.db)
         except Exception as e:
             logging.error(e)
@@ -37,18 +56,30 @@ class DatabaseHelper:
 class Game:
     """Основний клас гри з підтримкою бази даних"""
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, headless: bool = False,
+                 started: Optional[float] = None):
+        # Хронометраж запуску; started — момент старту процесу, якщо відомий
+        self.startup = StartupProfile(started)
+        if started is not None:
+            self.startup.mark('imports')
+
         # Використовуємо Builder для створення компонентів
-        components = (GameBuilder()
-                      .build_pygame()
-                      .build_fonts()
-                      .build_components()
-                      .build_database(db_path)
-                      .build())
+        builder = GameBuilder()
+        builder.build_pygame(headless)
+        self.startup.mark('pygame')
+        builder.build_fonts()
+        self.startup.mark('fonts')
+        builder.build_components()
+        builder.build_database(db_path, background=True)
+        self.startup.mark('components')
+        components = builder.build()
 
         # Ініціалізуємо атрибути з Builder
         self.window_size = components['window_size']
+        self.window = components['window']
+        self.layout: Layout = components['layout']
         self.surface = components['surface']
+        self.fonts = components['fonts']
         self.font = components['font']
         self.small_font = components['small_font']
         self.generator = components['generator']
@@ -57,19 +88,57 @@ class Game:
         self.button_manager = components['button_manager']
         self.timer = components['timer']
         self.db_manager = components['db_manager']
+        self._database_warmup: Optional[DatabaseWarmup] = components['database_warmup']
+
+        # Профайлер кадрів (оверлей вмикається клавішею F3)
+        self.profiler = FrameProfiler(1000 / FPS, log_path=FRAME_PROFILE_LOG)
 
         # Створюємо хелпер та фасад
-        self.db = DatabaseHelper(self.db_manager)
+        self.db = DatabaseHelper(self.db_manager, self.profiler,
+                                 self.ensure_database if self._database_warmup else None)
         self.facade = GameFacade(self.db, self.board, self.timer)
 
-        # Ініціалізуємо налаштування через фасад
-        self.facade.initialize_game_settings()
-
         # Ігрові атрибути
         self.selected_cell: Optional[Tuple[int, int]] = None
-        self.difficulty = self.facade.get_preferred_difficulty()
+        self.difficulty = Difficulty.MEDIUM
         self.state: IGameState = MainMenuState()
         self.game_initialized = False
+        self._last_idle_maintenance = 0
+        # Вікно змінилося поза ігровою областю — наступний кадр показується повністю
+        self._window_changed = True
+
+        if not self._database_warmup:
+            self._apply_database_settings()
+
+    def _apply_database_settings(self):
+        """Ініціалізує налаштування через фасад"""
+        self.facade.initialize_game_settings()
+        self.difficulty = self.facade.get_preferred_difficulty()
+
+    def ensure_database(self) -> bool:
+        """Приєднує базу, підготовлену у фоні, чекаючи на неї за потреби
+
+        Викликається при першому запиті до бази та при виході з
+        головного меню, тож налаштування застосовуються до того, як
+        гравець обере складність.
+        """
+        warmup = self._database_warmup
+        if warmup is None:
+            return self.db_manager is not None
+
+        self._database_warmup = None
+        self.db.connect = None
+        started = time.perf_counter()
+        self.db_manager = self.db.db = warmup.open()
+        self._apply_database_settings()
+
+        attach_ms = (time.perf_counter() - started) * 1000 - warmup.waited_ms
+        self.startup.record('database_background', warmup.elapsed_ms)
+        self.startup.record('database_wait', warmup.waited_ms)
+        self.startup.record('database_attach', attach_ms)
+        logging.info(f"Database ready: prepared in background in {warmup.elapsed_ms:.1f} ms, "
+                     f"waited {warmup.waited_ms:.1f} ms, attached in {attach_ms:.1f} ms")
+        return self.db_manager is not None
 
     def _initialize_game_ui(self):
         if not self.game_initialized:
@@ -113,11 +182,43 @@ class Game:
             self.button_manager.update_pause_button("Пауза")
 
     def set_state(self, new_state: IGameState):
+        if self._database_warmup:
+            self.ensure_database()
         if isinstance(new_state, GameOverState):
             self.timer.pause()
             self.complete_game()
         self.state = new_state
 
+    def resize(self, window_size: Tuple[int, int]):
+        """Перебудовує розмітку під новий розмір вікна
+
+        Шрифти, гліфи та статичні шари залежать лише від масштабу і
+        беруться з кешу або будуються один раз; якщо масштаб не
+        змінився, ігрова область лише переміщується у вікні.
+        """
+        window_size = (int(window_size[0]), int(window_size[1]))
+        window = pygame.display.get_surface()
+        if window is None or window.get_size() != window_size:
+            window = pygame.display.set_mode(window_size, pygame.RESIZABLE)
+        layout = Layout(window_size)
+        scale_changed = layout.scale != self.layout.scale
+
+        self.window = window
+        self.window_size = window_size
+        self.layout = layout
+        self.window.fill(WHITE)
+        self.surface = self.window.subsurface(layout.content_rect)
+
+        if scale_changed:
+            self.font, self.small_font = self.fonts.get(layout.scale)
+            self.renderer.set_layout(layout, self.font, self.small_font)
+            self.button_manager.set_layout(layout, self.small_font)
+            self.state.layout_changed(self)
+        else:
+            self.renderer.invalidate()
+        self._window_changed = True
+        logging.info(f"Window resized: {layout}")
+
     def select_cell(self, row: int, col: int):
         if 0 <= row < GRID_SIZE and 0 <= col < GRID_SIZE:
             self.selected_cell = (row, col)
@@ -137,30 +238,127 @@ class Game:
     def _handle_event(self, event):
         if event.type == pygame.QUIT:
             return False
+        if event.type == pygame.VIDEORESIZE:
+            self.resize(event.size)
+            return True
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            # Вміст вікна втрачено — наступний кадр перемальовується повністю
+            self.renderer.invalidate()
+            self._window_changed = True
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            # Після приховування оверлею під ним лишається старе зображення
+            if not self.profiler.toggle_overlay():
+                self.renderer.invalidate()
+            return True
+        if hasattr(event, 'pos') and self.layout.content_rect.topleft != (0, 0):
+            # Стани працюють у координатах ігрової області
+            event = pygame.event.Event(event.type, {**event.dict, 'pos': self.layout.to_content(event.pos)})
         self.state.handle_event(event, self)
         return True
 
-    def _process_events(self):
-        for event in pygame.event.get():
-            if not self._handle_event(event):
-                return False
+    def _process_events(self, events=None):
+        with self.profiler.phase('events'):
+            for event in pygame.event.get() if events is None else events:
+                if not self._handle_event(event):
+                    return False
         return True
 
     def _render_frame(self):
-        self.state.update(self)
-        self.state.render(self.surface, self)
-        pygame.display.flip()
-
-    def run(self):
+        profiler = self.profiler
+        with profiler.phase('update'):
+            self.state.update(self)
+        with profiler.phase('render'):
+            self.state.render(self.surface, self)
+            # Стани з відстеженням пошкоджень оновлюють лише змінені області
+            damage = self.renderer.take_damage()
+            if profiler.overlay_visible:
+                overlay = profiler.draw_overlay(self.surface, self.small_font, self.renderer.glyphs)
+                if damage is not None:
+                    damage.append(overlay)
+
+        with profiler.phase('present'):
+            if damage is None or self._window_changed:
+                pygame.display.flip()
+                self._window_changed = False
+            elif damage:
+                offset = self.layout.content_rect.topleft
+                if offset != (0, 0):
+                    damage = [rect.move(offset) for rect in damage]
+                pygame.display.update(damage)
+        profiler.end_frame(type(self.state).__name__)
+
+        if not self.startup.finished:
+            self.startup.finish()
+
+    def _next_timeout(self) -> int:
+        """Скільки мс можна чекати на події, не пропустивши запланованої роботи"""
+        timeouts = []
+        wakeup = self.state.next_wakeup(self)
+        if wakeup is not None:
+            timeouts.append(wakeup)
+        if isinstance(self.state, (MainMenuState, PausedState)):
+            since_maintenance = pygame.time.get_ticks() - self._last_idle_maintenance
+            timeouts.append(IDLE_MAINTENANCE_INTERVAL - since_maintenance)
+        if not timeouts:
+            return 0  # чекати лише на введення
+        # 0 для pygame.event.wait означає "без обмеження", тож мінімум 1 мс
+        return max(1, min(timeouts))
+
+    def _run_idle_tasks(self):
+        """Виконує фонове обслуговування бази, поки гравець у меню чи на паузі"""
+        if not isinstance(self.state, (MainMenuState, PausedState)):
+            return
+        now = pygame.time.get_ticks()
+        if now - self._last_idle_maintenance < IDLE_MAINTENANCE_INTERVAL:
+            return
+        self._last_idle_maintenance = now
+        self.db.execute(lambda db: db.run_idle_maintenance())
+
+    def _run_fixed_rate(self):
+        """Перемальовує кожен кадр з частотою FPS"""
         running = True
         clock = pygame.time.Clock()
 
-        try:
-            while running:
-                running = self._process_events()
+        while running:
+            running = self._process_events()
+            self._render_frame()
+            self._run_idle_tasks()
+            clock.tick(FPS)
+
+    def _run_event_driven(self):
+        """Спить до введення або до запланованої зміни стану
+
+        Кадр малюється лише після введення чи коли стан повідомляє про
+        зміну (наприклад, нова секунда таймера). Усі події, що
+        накопичилися, обробляються разом перед одним кадром.
+        """
+        dirty = True
+
+        while True:
+            if dirty or self.state.needs_redraw(self):
                 self._render_frame()
-                clock.tick(FPS)
+                dirty = False
+            self._run_idle_tasks()
+
+            event = pygame.event.wait(self._next_timeout())
+            if event.type == pygame.NOEVENT:
+                continue
+
+            events = [event] + pygame.event.get()
+            if not self._process_events(events):
+                return
+            # Рух миші не змінює жодного зі станів
+            if any(event.type != pygame.MOUSEMOTION for event in events):
+                dirty = True
+
+    def run(self):
+        try:
+            if EVENT_DRIVEN_LOOP:
+                self._run_event_driven()
+            else:
+                self._run_fixed_rate()
         finally:
+            self.profiler.close()
             if self.db_manager:
                 self.db_manager.close()
             pygame.quit()
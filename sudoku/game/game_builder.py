@@ -1,16 +1,17 @@
 """
 Builder для створення об'єкта гри з правильно налаштованими компонентами
 """
+import os
 import pygame
 import logging
 from typing import Optional
 
-from ..config import WINDOW_SIZE
+from ..config import WINDOW_SIZE, SYNC_ENDPOINT, FONT_NAME, FONT_CACHE_PATH
 from ..models import Difficulty
 from ..core import SudokuGenerator, SudokuBoard
-from ..ui import SudokuRenderer, ButtonManager
+from ..ui import SudokuRenderer, ButtonManager, FontPathCache, ScaledFonts, Layout
 from .timer import GameTimer
-from .database_integration import GameDatabaseManager
+from .startup import DatabaseWarmup
 
 
 class GameBuilder:
@@ -18,7 +19,10 @@ class GameBuilder:
 
     def __init__(self):
         self.window_size = None
+        self.window = None
+        self.layout = None
         self.surface = None
+        self.fonts = None
         self.font = None
         self.small_font = None
         self.generator = None
@@ -27,35 +31,56 @@ class GameBuilder:
         self.button_manager = None
         self.timer = None
         self.db_manager = None
+        self.database_warmup = None
 
-    def build_pygame(self):
-        """Ініціалізує Pygame та створює вікно"""
+    def build_pygame(self, headless: bool = False):
+        """Ініціалізує Pygame та створює вікно
+
+        У режимі headless використовуються фіктивні драйвери SDL: вікно
+        не відкривається, але поверхня екрана та черга подій працюють.
+        """
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
         pygame.init()
         self.window_size = WINDOW_SIZE
-        self.surface = pygame.display.set_mode(self.window_size)
+        self.window = pygame.display.set_mode(self.window_size, pygame.RESIZABLE)
         pygame.display.set_caption('Судоку')
+        # Екрани малюються в ігрову область вікна, розмічену під його розмір
+        self.layout = Layout(self.window_size)
+        self.surface = self.window.subsurface(self.layout.content_rect)
         return self
 
-    def build_fonts(self):
-        """Створює шрифти для гри"""
-        self.font = pygame.font.SysFont('Comic Sans MS', 32)
-        self.small_font = pygame.font.SysFont('Comic Sans MS', 16)
+    def build_fonts(self, cache_path: Optional[str] = FONT_CACHE_PATH):
+        """Створює шрифти для гри; шлях до файлу шрифту береться з кешу"""
+        self.fonts = ScaledFonts(FontPathCache(cache_path), FONT_NAME)
+        self.font, self.small_font = self.fonts.get(self.layout.scale if self.layout else 1.0)
         return self
 
     def build_components(self):
         """Створює основні ігрові компоненти"""
         self.generator = SudokuGenerator()
         self.board = SudokuBoard(self.generator)
-        self.renderer = SudokuRenderer(self.font, self.small_font)
-        self.button_manager = ButtonManager(self.small_font)
+        self.renderer = SudokuRenderer(self.font, self.small_font, self.layout)
+        self.button_manager = ButtonManager(self.small_font, self.layout)
         self.timer = GameTimer()
         return self
 
-    def build_database(self, db_path: Optional[str] = None):
-        """Ініціалізує базу даних"""
-        if db_path:
+    def build_database(self, db_path: Optional[str] = None, background: bool = False):
+        """Ініціалізує базу даних
+
+        З ``background=True`` база готується у фоновому потоці, а замість
+        менеджера повертається DatabaseWarmup, з якого гра відкриває
+        базу під час першого звернення.
+        """
+        if db_path and background:
+            self.database_warmup = DatabaseWarmup(db_path)
+        elif db_path:
+            from .database_integration import GameDatabaseManager
             try:
                 self.db_manager = GameDatabaseManager(db_path)
+                if SYNC_ENDPOINT:
+                    self.db_manager.start_sync(SYNC_ENDPOINT)
             except Exception as e:
                 logging.error(f"Failed to initialize database: {e}")
                 self.db_manager = None
@@ -65,7 +90,10 @@ class GameBuilder:
         """Створює та повертає словник з усіма компонентами"""
         return {
             'window_size': self.window_size,
+            'window': self.window,
+            'layout': self.layout,
             'surface': self.surface,
+            'fonts': self.fonts,
             'font': self.font,
             'small_font': self.small_font,
             'generator': self.generator,
@@ -73,5 +101,6 @@ class GameBuilder:
             'renderer': self.renderer,
             'button_manager': self.button_manager,
             'timer': self.timer,
-            'db_manager': self.db_manager
+            'db_manager': self.db_manager,
+            'database_warmup': self.database_warmup
         }
\ No newline at end of file
@@ -13,6 +13,8 @@ class GameFacade:
         self.db = db_helper
         self.board = board
         self.timer = timer
+        # Місце останнього завершеного результату серед рекордів
+        self.last_rank = None
 
     def initialize_game_settings(self):
         """Ініціалізує налаштування гри з бази даних"""
@@ -20,6 +22,17 @@ class GameFacade:
         if max_hints is not None:
             self.board.max_hints = max_hints
 
+        # Реагуємо на зміни налаштувань без повторних запитів до бази
+        self.db.execute(lambda db: db.add_settings_listener(self._on_setting_changed))
+
+    def _on_setting_changed(self, name: str, value: Optional[str]):
+        """Застосовує змінене налаштування до ігрових компонентів"""
+        if name == 'max_hints' and value is not None:
+            try:
+                self.board.max_hints = int(value)
+            except ValueError:
+                logging.warning(f"Invalid max_hints setting: {value}")
+
     def get_preferred_difficulty(self) -> Difficulty:
         """Отримує збережену складність або повертає значення за замовчуванням"""
         pref = self.db.execute(lambda db: db.get_user_setting('preferred_difficulty'))
@@ -54,7 +67,7 @@ class GameFacade:
 
     def complete_game(self, difficulty: Difficulty):
         """Обробляє завершення гри"""
-        self.db.execute(lambda db: db.save_game_record(
+        self.last_rank = self.db.execute(lambda db: db.complete_game(
             difficulty,
             self.timer.get_time() // 1000,
             self.board.hints_used
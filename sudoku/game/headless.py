@@ -0,0 +1,343 @@
+"""
+Headless-режим гри: програвання сценаріїв введення без вікна
+для навантажувального тестування
+
+Гра збирається з фіктивними драйверами SDL, а події подаються
+безпосередньо в машину станів без очікування та обмеження кадрів.
+Сценарій або генерується ботом, що розв'язує судоку через звичайні
+кліки й натискання клавіш, або програється із запису JSONL.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pygame
+
+from .game import Game
+from .states.main_menu_state import MainMenuState
+from .states.difficulty_select_state import DifficultySelectState
+from .states.playing_state import PlayingState
+from .states.game_over_state import GameOverState
+from ..models import Difficulty
+
+# Атрибути подій, що зберігаються в записі
+_RECORDED_ATTRIBUTES = {
+    pygame.KEYDOWN: ('key', 'mod', 'unicode', 'scancode'),
+    pygame.KEYUP: ('key', 'mod', 'unicode', 'scancode'),
+    pygame.MOUSEBUTTONDOWN: ('pos', 'button'),
+    pygame.MOUSEBUTTONUP: ('pos', 'button'),
+    pygame.MOUSEWHEEL: ('x', 'y', 'flipped'),
+    pygame.VIDEORESIZE: ('size', 'w', 'h'),
+    pygame.QUIT: (),
+}
+
+
+@dataclass
+class PhaseTiming:
+    """Накопичений час однієї фази"""
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def add(self, elapsed_ms: float) -> None:
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.mean_ms, 3),
+            'max_ms': round(self.max_ms, 3)
+        }
+
+
+@dataclass
+class LoadTestReport:
+    """Результат навантажувального прогону"""
+    games: int = 0
+    events: int = 0
+    frames: int = 0
+    elapsed: float = 0.0
+    phases: Dict[str, PhaseTiming] = field(default_factory=dict)
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def phase(self, name: str) -> PhaseTiming:
+        timing = self.phases.get(name)
+        if timing is None:
+            timing = self.phases[name] = PhaseTiming()
+        return timing
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'games': self.games,
+            'events': self.events,
+            'frames': self.frames,
+            'elapsed_s': round(self.elapsed, 3),
+            'games_per_second': round(self.games_per_second, 2),
+            'phases': {name: timing.to_dict() for name, timing in sorted(self.phases.items())}
+        }
+
+    def format(self) -> str:
+        """Текстовий звіт для консолі"""
+        lines = [
+            f"games: {self.games}  events: {self.events}  frames: {self.frames}  "
+            f"elapsed: {self.elapsed:.2f}s  games/s: {self.games_per_second:.2f}",
+            f"{'phase':<34}{'calls':>8}{'total ms':>12}{'mean ms':>10}{'max ms':>10}"
+        ]
+        for name, timing in sorted(self.phases.items(), key=lambda item: -item[1].total_ms):
+            lines.append(f"{name:<34}{timing.calls:>8}{timing.total_ms:>12.1f}"
+                         f"{timing.mean_ms:>10.3f}{timing.max_ms:>10.3f}")
+        return '\n'.join(lines)
+
+
+# --- Запис і програвання подій ----------------------------------------
+
+def event_to_dict(event: pygame.event.Event) -> Optional[Dict[str, Any]]:
+    """Серіалізує подію введення; інші події не записуються"""
+    attributes = _RECORDED_ATTRIBUTES.get(event.type)
+    if attributes is None:
+        return None
+    data = {'type': event.type, 'name': pygame.event.event_name(event.type)}
+    for name in attributes:
+        if hasattr(event, name):
+            value = getattr(event, name)
+            data[name] = list(value) if isinstance(value, tuple) else value
+    return data
+
+
+def event_from_dict(data: Dict[str, Any]) -> pygame.event.Event:
+    """Відновлює подію із запису"""
+    attributes = {key: tuple(value) if isinstance(value, list) else value
+                  for key, value in data.items() if key not in ('type', 'name')}
+    return pygame.event.Event(data['type'], **attributes)
+
+
+class EventRecorder:
+    """Записує події, які обробляє гра, у файл JSONL
+
+    Першим рядком записується зерно генератора випадкових чисел, щоб
+    під час програвання генерувалися ті самі головоломки.
+    """
+
+    def __init__(self, path: str, seed: Optional[int] = None):
+        self.path = path
+        self._stream = open(path, 'w', encoding='utf-8')
+        self._stream.write(json.dumps({'seed': seed}) + '\n')
+
+    def attach(self, game: Game) -> None:
+        """Перехоплює обробку подій гри"""
+        handle_event = game._handle_event
+
+        def recording_handle_event(event):
+            self.record(event)
+            return handle_event(event)
+
+        game._handle_event = recording_handle_event
+
+    def record(self, event: pygame.event.Event) -> None:
+        data = event_to_dict(event)
+        if data is not None:
+            self._stream.write(json.dumps(data, separators=(',', ':')) + '\n')
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+def load_recording(path: str) -> Tuple[Optional[int], List[pygame.event.Event]]:
+    """Читає запис і повертає (зерно, події)"""
+    with open(path, 'r', encoding='utf-8') as stream:
+        header = json.loads(stream.readline() or '{}')
+        events = [event_from_dict(json.loads(line)) for line in stream if line.strip()]
+    return header.get('seed'), events
+
+
+# --- Сценарій бота ----------------------------------------------------
+
+def _click(pos) -> pygame.event.Event:
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=tuple(pos), button=1)
+
+
+def _key(key: int, mod: int = 0) -> pygame.event.Event:
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=mod, unicode='', scancode=0)
+
+
+def solver_script(game: Game, games: int, difficulty: Difficulty,
+                  hints: int = 0) -> Iterator[pygame.event.Event]:
+    """Генерує події, що проходять меню та розв'язують ``games`` ігор
+
+    Події залежать від поточного стану гри, тож генератор треба
+    споживати по одній події, передаючи кожну в гру.
+    """
+    started = 0
+    while True:
+        state = game.state
+        if isinstance(state, MainMenuState):
+            yield _click(game.layout.to_window(state._ensure_widgets(game)['play'].rect.center))
+        elif isinstance(state, DifficultySelectState):
+            if started >= games:
+                return
+            started += 1
+            yield _click(game.layout.to_window(state._ensure_widgets(game)[difficulty.name].rect.center))
+            # Частина клітинок заповнюється підказками
+            for _ in range(hints):
+                yield _key(pygame.K_h)
+        elif isinstance(state, PlayingState):
+            cell = next((cell for row in game.board.grid for cell in row
+                         if not cell.is_fixed and cell.value != game.board.solution[cell.row][cell.col]), None)
+            if cell is None:
+                return
+            cell_size = game.layout.cell_size
+            yield _click(game.layout.to_window((cell.col * cell_size + cell_size // 2,
+                                                cell.row * cell_size + cell_size // 2)))
+            yield _key(pygame.K_0 + game.board.solution[cell.row][cell.col])
+        elif isinstance(state, GameOverState):
+            yield _key(pygame.K_n)
+        else:
+            return
+
+
+# --- Прогін -----------------------------------------------------------
+
+class HeadlessRunner:
+    """Подає події в гру без вікна і вимірює час кожної фази"""
+
+    def __init__(self, db_path: Optional[str] = None, render: bool = True, seed: Optional[int] = None):
+        self.seed = seed
+        if seed is not None:
+            random.seed(seed)
+        self.game = Game(db_path, headless=True)
+        # Підготовка бази не повинна потрапити у час першої події
+        self.game.ensure_database()
+        self.render = render
+        self.report = LoadTestReport()
+        self._instrument()
+
+    def _timed(self, name: str, function: Callable) -> Callable:
+        """Обгортає функцію вимірюванням часу під назвою фази"""
+        phase = self.report.phase(name)
+
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                phase.add((time.perf_counter() - started) * 1000)
+        return wrapper
+
+    def _instrument(self) -> None:
+        """Додає вимірювання генерації головоломок і запису результатів у базу"""
+        game = self.game
+        game.board.initialize = self._timed('generate_puzzle', game.board.initialize)
+
+        complete_game = game.facade.complete_game
+
+        def counted_complete_game(difficulty):
+            self.report.games += 1
+            return complete_game(difficulty)
+        game.facade.complete_game = self._timed('db_complete_game', counted_complete_game)
+
+    def feed(self, events: Iterable[pygame.event.Event]) -> LoadTestReport:
+        """Передає події в гру одну за одною без жодних пауз
+
+        Після кожної події, як і в головному циклі, малюється кадр
+        (якщо рендеринг увімкнено). Час обробки введення рахується
+        для стану, який отримав подію, і включає вкладені фази.
+        """
+        game = self.game
+        started = time.perf_counter()
+
+        for event in events:
+            state_name = type(game.state).__name__
+            input_started = time.perf_counter()
+            running = game._process_events([event])
+            self.report.phase(f"input:{state_name}").add((time.perf_counter() - input_started) * 1000)
+            self.report.events += 1
+            if not running:
+                break
+
+            if self.render:
+                state_name = type(game.state).__name__
+                render_started = time.perf_counter()
+                game._render_frame()
+                self.report.phase(f"render:{state_name}").add((time.perf_counter() - render_started) * 1000)
+                self.report.frames += 1
+
+        self.report.elapsed += time.perf_counter() - started
+        return self.report
+
+    def run_solver(self, games: int, difficulty: Difficulty = Difficulty.EASY,
+                   hints: int = 0) -> LoadTestReport:
+        """Розв'язує ``games`` ігор ботом"""
+        return self.feed(solver_script(self.game, games, difficulty, hints))
+
+    def close(self) -> None:
+        if self.game.db_manager:
+            self.game.db_manager.close()
+        pygame.quit()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Headless load test of the Sudoku state machine")
+    parser.add_argument('--games', type=int, default=20, help="Number of games to solve")
+    parser.add_argument('--difficulty', choices=[d.name for d in Difficulty], default=Difficulty.EASY.name)
+    parser.add_argument('--hints', type=int, default=0, help="Hints to request in every game")
+    parser.add_argument('--db', help="Database path (default: temporary file)")
+    parser.add_argument('--no-render', action='store_true', help="Skip rendering frames")
+    parser.add_argument('--seed', type=int, help="Random seed for reproducible puzzles")
+    parser.add_argument('--record', help="Write the event stream to a JSONL file")
+    parser.add_argument('--replay', help="Replay a recorded JSONL event stream instead of the solver")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    parser.add_argument('--window', help="Window size WIDTHxHEIGHT to lay the screens out for")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = args.db or os.path.join(temp_dir, 'loadtest.db')
+
+        seed = args.seed
+        events = None
+        if args.replay:
+            seed, events = load_recording(args.replay)
+
+        runner = HeadlessRunner(db_path, render=not args.no_render, seed=seed)
+        if args.window:
+            width, height = args.window.lower().split('x')
+            runner.game.resize((int(width), int(height)))
+        recorder = None
+        if args.record:
+            recorder = EventRecorder(args.record, seed)
+            recorder.attach(runner.game)
+
+        try:
+            if events is not None:
+                report = runner.feed(events)
+            else:
+                report = runner.run_solver(args.games, Difficulty[args.difficulty], args.hints)
+        finally:
+            if recorder:
+                recorder.close()
+            runner.close()
+
+    print(json.dumps(report.to_dict(), indent=2) if args.json else report.format())
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,183 @@
+"""
+Фонове посторінкове завантаження таблиці рекордів
+
+Запити до бази виконуються в окремому потоці з власним з'єднанням, а
+головний цикл лише забирає готові сторінки. Після кожного результату
+в чергу подій pygame надсилається RECORDS_LOADED, щоб цикл, який чекає
+на події, прокинувся й перемалював екран.
+"""
+import logging
+import queue
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import pygame
+
+from ..models import Difficulty
+
+if TYPE_CHECKING:
+    from ..database import GameRecordService
+
+# Кількість рекордів в одній сторінці запиту
+RECORDS_PAGE_SIZE = 50
+# Скільки завантажених сторінок тримати в пам'яті
+MAX_CACHED_PAGES = 20
+
+# Подія, що повідомляє головний цикл про нові дані
+RECORDS_LOADED = pygame.event.custom_type()
+
+# Рядок таблиці: вже відформатовані тексти колонок
+FormattedRow = Tuple[str, ...]
+
+
+class RecordPageLoader:
+    """Завантажує кількість рекордів, статистику та сторінки таблиці лідерів
+
+    Усі методи, крім ``_run``, викликаються з головного потоку і не
+    блокують його: поки дані не готові, повертається None.
+    Без потоку (``threaded=False``, наприклад для бази в пам'яті) запити
+    виконуються одразу під час виклику.
+    """
+
+    def __init__(self, service: 'GameRecordService',
+                 format_row: Callable[[int, Any], FormattedRow],
+                 page_size: int = RECORDS_PAGE_SIZE,
+                 threaded: bool = True,
+                 on_exit: Optional[Callable[[], None]] = None):
+        self.service = service
+        self.format_row = format_row
+        self.page_size = page_size
+        self.on_exit = on_exit
+        self.threaded = threaded
+        # Збільшується з кожним результатом; стан порівнює його з показаним
+        self.version = 0
+        self.logger = logging.getLogger(__name__)
+
+        self._counts: Dict[Optional[Difficulty], int] = {}
+        self._pages: 'OrderedDict[Tuple[Optional[Difficulty], int], List[FormattedRow]]' = OrderedDict()
+        self._stats: Optional[Dict[str, Any]] = None
+        self._pending: Set[Hashable] = set()
+        self._lock = threading.Lock()
+
+        self._requests: 'queue.Queue[Optional[Tuple]]' = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        if threaded:
+            self._thread = threading.Thread(target=self._run, name='sudoku-records', daemon=True)
+            self._thread.start()
+
+    # --- Головний потік ---------------------------------------------------
+
+    def _request(self, request: Tuple) -> None:
+        with self._lock:
+            if request in self._pending:
+                return
+            self._pending.add(request)
+        if self.threaded:
+            self._requests.put(request)
+        else:
+            self._execute(request)
+
+    def get_count(self, difficulty: Optional[Difficulty]) -> Optional[int]:
+        """Кількість рекордів рівня або None, поки вона завантажується"""
+        with self._lock:
+            count = self._counts.get(difficulty)
+        if count is None:
+            self._request(('count', difficulty))
+            if not self.threaded:
+                count = self._counts.get(difficulty)
+        return count
+
+    def get_stats(self) -> Optional[Dict[str, Any]]:
+        """Персональна статистика або None, поки вона завантажується"""
+        with self._lock:
+            stats = self._stats
+        if stats is None:
+            self._request(('stats',))
+            if not self.threaded:
+                stats = self._stats
+        return stats
+
+    def get_page(self, difficulty: Optional[Difficulty], page: int) -> Optional[List[FormattedRow]]:
+        """Сторінка відформатованих рядків або None, поки вона завантажується"""
+        key = (difficulty, page)
+        with self._lock:
+            rows = self._pages.get(key)
+            if rows is not None:
+                self._pages.move_to_end(key)
+        if rows is None:
+            self._request(('page', difficulty, page))
+            if not self.threaded:
+                rows = self._pages.get(key)
+        return rows
+
+    def get_row(self, difficulty: Optional[Difficulty], index: int) -> Optional[FormattedRow]:
+        """Рядок за абсолютною позицією в таблиці"""
+        rows = self.get_page(difficulty, index // self.page_size)
+        if rows is None:
+            return None
+        offset = index % self.page_size
+        return rows[offset] if offset < len(rows) else None
+
+    def prefetch(self, difficulty: Optional[Difficulty], first: int, last: int) -> None:
+        """Запитує сторінки, що покривають рядки [first, last], і сусідні з ними"""
+        first_page = max(0, first // self.page_size - 1)
+        last_page = last // self.page_size + 1
+        for page in range(first_page, last_page + 1):
+            self.get_page(difficulty, page)
+
+    def close(self) -> None:
+        """Зупиняє потік; з'єднання закривається в ньому самому"""
+        if self._thread:
+            self._requests.put(None)
+            self._thread = None
+        elif self.on_exit:
+            self.on_exit()
+
+    # --- Потік завантаження -----------------------------------------------
+
+    def _execute(self, request: Tuple) -> None:
+        """Виконує запит і публікує результат"""
+        kind = request[0]
+        try:
+            if kind == 'count':
+                result = self.service.count_records(request[1])
+            elif kind == 'stats':
+                result = self.service.get_personal_stats()
+            else:
+                _, difficulty, page = request
+                records = self.service.get_leaderboard(difficulty, self.page_size, page)
+                first = page * self.page_size
+                result = [self.format_row(first + i + 1, record) for i, record in enumerate(records)]
+        except Exception as e:
+            self.logger.error(f"Failed to load records ({kind}): {e}")
+            result = {'count': 0, 'stats': {}, 'page': []}[kind]
+
+        with self._lock:
+            if kind == 'count':
+                self._counts[request[1]] = result
+            elif kind == 'stats':
+                self._stats = result
+            else:
+                self._pages[request[1:]] = result
+                while len(self._pages) > MAX_CACHED_PAGES:
+                    evicted, _ = self._pages.popitem(last=False)
+                    self._pending.discard(('page',) + evicted)
+            self.version += 1
+
+    def _run(self) -> None:
+        """Цикл потоку: виконує запити по черзі до сигналу зупинки"""
+        try:
+            while True:
+                request = self._requests.get()
+                if request is None:
+                    break
+                self._execute(request)
+                try:
+                    pygame.event.post(pygame.event.Event(RECORDS_LOADED))
+                except pygame.error:
+                    # Відео вже закрите — головний цикл завершується
+                    pass
+        finally:
+            if self.on_exit:
+                self.on_exit()
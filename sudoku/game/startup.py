@@ -0,0 +1,106 @@
+"""
+Швидкий запуск гри: фонова підготовка бази та хронометраж старту
+
+Меню не звертається до бази, тож перший кадр малюється одразу, а
+імпорт модулів бази й міграції схеми виконуються у фоновому потоці.
+Гра приєднує базу під час першого звернення до неї або при виході з
+головного меню.
+"""
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+
+from ..config import SYNC_ENDPOINT
+
+if TYPE_CHECKING:
+    from .database_integration import GameDatabaseManager
+
+
+class StartupProfile:
+    """Тривалість етапів запуску, мс"""
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.finished = False
+        self._last = self.started
+
+    def mark(self, name: str) -> None:
+        """Завершує етап, що почався після попередньої позначки"""
+        now = time.perf_counter()
+        self.phases[name] = (now - self._last) * 1000
+        self._last = now
+
+    def record(self, name: str, elapsed_ms: float) -> None:
+        """Додає етап, виміряний окремо (наприклад, у фоновому потоці)"""
+        self.phases[name] = elapsed_ms
+
+    def finish(self) -> None:
+        """Позначає перший показаний кадр і записує підсумок у журнал"""
+        self.mark('first_frame')
+        self.finished = True
+        self.phases['total'] = (self._last - self.started) * 1000
+        logging.info(f"Startup: {self.format()}")
+
+    def format(self) -> str:
+        return ', '.join(f"{name} {elapsed:.1f} ms" for name, elapsed in self.phases.items())
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: round(elapsed, 3) for name, elapsed in self.phases.items()}
+
+
+class DatabaseWarmup:
+    """Готує базу у фоновому потоці: імпорт модулів і міграції схеми
+
+    З'єднання SQLite належать потоку, що їх відкрив, тому фоновий потік
+    закриває своє з'єднання, а менеджер бази гри створюється в
+    головному потоці методом ``open`` — на актуальній схемі це одне
+    читання PRAGMA user_version.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.elapsed_ms = 0.0
+        # Скільки головний потік чекав на завершення підготовки
+        self.waited_ms = 0.0
+        self.error: Optional[Exception] = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sudoku-db-warmup', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        started = time.perf_counter()
+        try:
+            from ..database import DatabaseManager
+            # Імпорт модулів гри, що працюють з базою, теж забирає час
+            from . import database_integration  # noqa: F401
+
+            manager = DatabaseManager(self.db_path)
+            try:
+                manager.initialize_database()
+            finally:
+                manager.disconnect()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.elapsed_ms = (time.perf_counter() - started) * 1000
+            self._done.set()
+
+    def open(self) -> Optional['GameDatabaseManager']:
+        """Чекає на підготовку і створює менеджер бази в поточному потоці"""
+        started = time.perf_counter()
+        self._done.wait()
+        self.waited_ms = (time.perf_counter() - started) * 1000
+        if self.error:
+            logging.warning(f"Background database preparation failed: {self.error}")
+
+        from .database_integration import GameDatabaseManager
+        try:
+            db_manager = GameDatabaseManager(self.db_path)
+            if SYNC_ENDPOINT:
+                db_manager.start_sync(SYNC_ENDPOINT)
+            return db_manager
+        except Exception as e:
+            logging.error(f"Failed to initialize database: {e}")
+            return None
@@ -1,9 +1,11 @@
 import pygame
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from .i_game_state import IGameState
-from ...config import WINDOW_SIZE, WHITE, BLUE, BLACK, GRAY
+from ...config import BLACK, GRAY
 from ...models import Difficulty
+from ...ui.layout import Layout
+from ...ui.widgets import Button, Label, WidgetTree
 
 if TYPE_CHECKING:
     from ..game import Game
@@ -11,16 +13,30 @@ if TYPE_CHECKING:
 class DifficultySelectState(IGameState):
     """Стан вибору складності"""
     def __init__(self):
-        self.difficulty_buttons = {}
-        self.back_button = None
+        self.widgets: Optional[WidgetTree] = None
+        # Розміри в базових одиницях розмітки
         self.button_width = 200
         self.button_height = 50
         self.button_spacing = 20
 
-    def _initialize_difficulty_buttons(self, font):
-        """Ініціалізує кнопки вибору складності"""
-        center_x = WINDOW_SIZE[0] // 2
-        start_y = WINDOW_SIZE[1] // 2 - 80
+    def _ensure_widgets(self, game: 'Game') -> WidgetTree:
+        """Будує віджети екрана при першому зверненні"""
+        if self.widgets is None:
+            self.widgets = self._build_widgets(game.font, game.layout)
+        return self.widgets
+
+    def layout_changed(self, game: 'Game') -> None:
+        self.widgets = None
+
+    def _build_widgets(self, font, layout: Layout) -> WidgetTree:
+        """Створює заголовок, кнопки вибору складності та кнопку повернення"""
+        widgets = WidgetTree()
+        px = layout.px
+        border = layout.size(2)
+        center_x = layout.width // 2
+        start_y = layout.height // 2 - px(80)
+
+        widgets.add(Label("title", "Оберіть складність", font, BLACK, center=(center_x, px(150))))
 
         difficulties = [
             (Difficulty.EASY, "Легко"),
@@ -28,50 +44,47 @@ class DifficultySelectState(IGameState):
             (Difficulty.HARD, "Важко")
         ]
 
+        # Кнопки складності називаються за рівнем: EASY, MEDIUM, HARD
         for i, (difficulty, text) in enumerate(difficulties):
-            y = start_y + i * (self.button_height + self.button_spacing)
+            y = start_y + i * px(self.button_height + self.button_spacing)
             rect = pygame.Rect(
-                center_x - self.button_width // 2,
+                center_x - px(self.button_width) // 2,
                 y,
-                self.button_width,
-                self.button_height
+                px(self.button_width),
+                px(self.button_height)
             )
-            text_surface = font.render(text, True, WHITE)
-            self.difficulty_buttons[difficulty] = (rect, text_surface)
+            widgets.add(Button(difficulty.name, rect, text, font, border=border))
 
         # Кнопка повернення
-        back_y = start_y + len(difficulties) * (self.button_height + self.button_spacing) + 20
+        back_y = start_y + px(len(difficulties) * (self.button_height + self.button_spacing) + 20)
         back_rect = pygame.Rect(
-            center_x - 100,
+            center_x - px(100),
             back_y,
-            200,
-            40
+            px(200),
+            px(40)
         )
-        back_text = font.render("Назад", True, WHITE)
-        self.back_button = (back_rect, back_text)
+        widgets.add(Button("back", back_rect, "Назад", font, color=GRAY, border=border))
+        return widgets
 
     def handle_event(self, event: pygame.event.Event, game: 'Game') -> None:
         if event.type == pygame.MOUSEBUTTONDOWN:
-            x, y = pygame.mouse.get_pos()
-
-            # Ініціалізуємо кнопки, якщо вони ще не створені
-            if not self.difficulty_buttons:
-                self._initialize_difficulty_buttons(game.font)
-
-            # Перевірка натискання на кнопки складності
-            for difficulty, (rect, _) in self.difficulty_buttons.items():
-                if rect.collidepoint(x, y):
-                    game.difficulty = difficulty
-                    game.new_game()
-                    # Імпортуємо тут, щоб уникнути циркулярного імпорту
-                    from .playing_state import PlayingState
-                    game.set_state(PlayingState())
-                    return
+            x, y = event.pos
+
+            button = self._ensure_widgets(game).widget_at(x, y)
+            if button is None:
+                return
 
             # Перевірка натискання на кнопку "Назад"
-            if self.back_button and self.back_button[0].collidepoint(x, y):
+            if button.name == "back":
                 from .main_menu_state import MainMenuState
                 game.set_state(MainMenuState())
+                return
+
+            game.difficulty = Difficulty[button.name]
+            game.new_game()
+            # Імпортуємо тут, щоб уникнути циркулярного імпорту
+            from .playing_state import PlayingState
+            game.set_state(PlayingState())
 
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
@@ -84,30 +97,4 @@ class DifficultySelectState(IGameState):
 
     def render(self, surface: pygame.Surface, game: 'Game') -> None:
         """Відображення меню вибору складності"""
-        surface.fill(WHITE)
-
-        # Ініціалізуємо кнопки, якщо вони ще не створені
-        if not self.difficulty_buttons:
-            self._initialize_difficulty_buttons(game.font)
-
-        # Заголовок
-        title_text = game.font.render("Оберіть складність", True, BLACK)
-        title_rect = title_text.get_rect(center=(WINDOW_SIZE[0] // 2, 150))
-        surface.blit(title_text, title_rect)
-
-        # Малювання кнопок складності
-        for difficulty, (rect, text_surface) in self.difficulty_buttons.items():
-            pygame.draw.rect(surface, BLUE, rect)
-            pygame.draw.rect(surface, BLACK, rect, 2)
-
-            text_rect = text_surface.get_rect(center=rect.center)
-            surface.blit(text_surface, text_rect)
-
-        # Малювання кнопки "Назад"
-        if self.back_button:
-            rect, text_surface = self.back_button
-            pygame.draw.rect(surface, GRAY, rect)
-            pygame.draw.rect(surface, BLACK, rect, 2)
-
-            text_rect = text_surface.get_rect(center=rect.center)
-            surface.blit(text_surface, text_rect)
\ No newline at end of file
+        game.renderer.draw_widgets(surface, self._ensure_widgets(game))
@@ -30,10 +30,14 @@ class GameOverState(IGameState):
         # Спочатку відображаємо ігрову дошку
         surface.fill(WHITE)
         game.renderer.draw_grid(surface, game.board.grid, None)
-        game.renderer.draw_buttons(surface, game.button_manager.buttons)
+        game.renderer.draw_buttons(surface, game.button_manager.widgets)
 
         # Відображення фінального часу
         game.renderer.draw_timer(surface, game.timer.get_formatted_time())
 
-        # Потім відображаємо повідомлення про завершення
-        game.renderer.draw_game_over(surface)
\ No newline at end of file
+        # Потім відображаємо повідомлення про завершення разом з місцем результату
+        rank = game.facade.last_rank
+        rank_text = None
+        if rank is not None:
+            rank_text = f"Місце: {rank.rank} з {rank.total} (краще за {rank.percentile:g}% ігор)"
+        game.renderer.draw_game_over(surface, rank_text)
\ No newline at end of file
@@ -1,6 +1,6 @@
 import pygame
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 from abc import ABC, abstractmethod
 if TYPE_CHECKING:
     from ..game import Game
@@ -21,3 +21,23 @@ class IGameState(ABC):
     def render(self, surface: pygame.Surface, game: 'Game') -> None:
         """Відображає стан гри"""
         pass
+
+    def needs_redraw(self, game: 'Game') -> bool:
+        """Чи змінився вигляд стану без участі користувача
+
+        Введення завжди спричиняє перемальовування, тож стани без
+        анімацій і таймерів можуть не перевизначати цей метод.
+        """
+        return False
+
+    def next_wakeup(self, game: 'Game') -> Optional[int]:
+        """Через скільки мс стан зміниться сам; None — лише після введення"""
+        return None
+
+    def layout_changed(self, game: 'Game') -> None:
+        """Викликається після зміни масштабу інтерфейсу (розміру вікна)
+
+        Стани, що кешують віджети чи поверхні, скидають їх тут, щоб
+        побудувати заново за ``game.layout``.
+        """
+        pass
@@ -1,9 +1,11 @@
 import pygame
 import sys
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from .i_game_state import IGameState
-from ...config import WINDOW_SIZE, WHITE, BLACK, BLUE, GRAY
+from ...config import BLACK
+from ...ui.layout import Layout
+from ...ui.widgets import Button, Label, WidgetTree
 
 if TYPE_CHECKING:
     from ..game import Game
@@ -12,15 +14,29 @@ if TYPE_CHECKING:
 class MainMenuState(IGameState):
     """Стан головного меню"""
     def __init__(self):
-        self.menu_buttons = {}
+        self.widgets: Optional[WidgetTree] = None
+        # Розміри в базових одиницях розмітки
         self.button_width = 200
         self.button_height = 50
         self.button_spacing = 20
 
-    def _initialize_menu_buttons(self, font):
-        """Ініціалізує кнопки головного меню"""
-        center_x = WINDOW_SIZE[0] // 2
-        start_y = WINDOW_SIZE[1] // 2 - 100
+    def _ensure_widgets(self, game: 'Game') -> WidgetTree:
+        """Будує віджети меню при першому зверненні"""
+        if self.widgets is None:
+            self.widgets = self._build_widgets(game.font, game.layout)
+        return self.widgets
+
+    def layout_changed(self, game: 'Game') -> None:
+        self.widgets = None
+
+    def _build_widgets(self, font, layout: Layout) -> WidgetTree:
+        """Створює заголовок і кнопки головного меню"""
+        widgets = WidgetTree()
+        px = layout.px
+        center_x = layout.width // 2
+        start_y = layout.height // 2 - px(100)
+
+        widgets.add(Label("title", "СУДОКУ", font, BLACK, center=(center_x, px(100))))
 
         buttons_data = [
             ("play", "Грати"),
@@ -29,28 +45,23 @@ class MainMenuState(IGameState):
         ]
 
         for i, (key, text) in enumerate(buttons_data):
-            y = start_y + i * (self.button_height + self.button_spacing)
+            y = start_y + i * px(self.button_height + self.button_spacing)
             rect = pygame.Rect(
-                center_x - self.button_width // 2,
+                center_x - px(self.button_width) // 2,
                 y,
-                self.button_width,
-                self.button_height
+                px(self.button_width),
+                px(self.button_height)
             )
-            text_surface = font.render(text, True, WHITE)
-            self.menu_buttons[key] = (rect, text_surface)
+            widgets.add(Button(key, rect, text, font, border=layout.size(2)))
+        return widgets
 
     def handle_event(self, event: pygame.event.Event, game: 'Game') -> None:
         if event.type == pygame.MOUSEBUTTONDOWN:
-            x, y = pygame.mouse.get_pos()
+            x, y = event.pos
 
-            # Ініціалізуємо кнопки, якщо вони ще не створені
-            if not self.menu_buttons:
-                self._initialize_menu_buttons(game.font)
-
-            for button_name, (rect, _) in self.menu_buttons.items():
-                if rect.collidepoint(x, y):
-                    self._handle_menu_click(button_name, game)
-                    break
+            button = self._ensure_widgets(game).widget_at(x, y)
+            if button:
+                self._handle_menu_click(button.name, game)
 
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
@@ -87,26 +98,4 @@ class MainMenuState(IGameState):
 
     def render(self, surface: pygame.Surface, game: 'Game') -> None:
         """Відображення головного меню"""
-        surface.fill(WHITE)
-
-        # Ініціалізуємо кнопки, якщо вони ще не створені
-        if not self.menu_buttons:
-            self._initialize_menu_buttons(game.font)
-
-        # Заголовок
-        title_text = game.font.render("СУДОКУ", True, BLACK)
-        title_rect = title_text.get_rect(center=(WINDOW_SIZE[0] // 2, 100))
-        surface.blit(title_text, title_rect)
-
-        # Малювання кнопок меню
-        for button_name, (rect, text_surface) in self.menu_buttons.items():
-            # Вибір кольору кнопки
-            button_color = BLUE
-
-
-            pygame.draw.rect(surface, button_color, rect)
-            pygame.draw.rect(surface, BLACK, rect, 2)
-
-            # Центрування тексту на кнопці
-            text_rect = text_surface.get_rect(center=rect.center)
-            surface.blit(text_surface, text_rect)
+        game.renderer.draw_widgets(surface, self._ensure_widgets(game))
@@ -2,7 +2,7 @@ import pygame
 from typing import TYPE_CHECKING
 
 from .i_game_state import IGameState
-from ...config import WHITE, GRID_SIZE, CELL_SIZE, BLACK
+from ...config import WHITE
 
 if TYPE_CHECKING:
     from ..game import Game
@@ -11,7 +11,7 @@ class PausedState(IGameState):
     """Стан гри на паузі"""
     def handle_event(self, event: pygame.event.Event, game: 'Game') -> None:
         if event.type == pygame.MOUSEBUTTONDOWN:
-            x, y = pygame.mouse.get_pos()
+            x, y = event.pos
 
             # Перевірка натискання на кнопки (тільки пауза та меню)
             clicked_button = game.button_manager.get_clicked_button(x, y)
@@ -41,7 +41,7 @@ class PausedState(IGameState):
         game.renderer.draw_blurred_grid(surface)
 
         # Відображення кнопок
-        game.renderer.draw_buttons(surface, game.button_manager.buttons)
+        game.renderer.draw_buttons(surface, game.button_manager.widgets)
 
         # Відображення таймеру (зупиненого)
         game.renderer.draw_timer(surface, game.timer.get_formatted_time())
@@ -50,9 +50,4 @@ class PausedState(IGameState):
         game.renderer.draw_pause_message(surface)
 
         # Відображення кількості використаних підказок
-        second_row_y = GRID_SIZE * CELL_SIZE + 95  # Під другим рядом кнопок
-        hints_text = game.small_font.render(
-            f"Підказки: {game.board.hints_used}/{game.board.max_hints}",
-            True, BLACK
-        )
-        surface.blit(hints_text, (10, second_row_y))
\ No newline at end of file
+        game.renderer.draw_hints(surface, f"Підказки: {game.board.hints_used}/{game.board.max_hints}")
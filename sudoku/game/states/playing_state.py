@@ -1,17 +1,21 @@
 import pygame
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from .i_game_state import IGameState
-from ...config import GRID_SIZE, CELL_SIZE, WHITE, BLACK
+from ...config import GRID_SIZE
 
 if TYPE_CHECKING:
     from ..game import Game
 
 class PlayingState(IGameState):
     """Стан гри під час гри"""
+    def __init__(self):
+        # Час, показаний у останньому кадрі
+        self._shown_time: Optional[str] = None
+
     def handle_event(self, event: pygame.event.Event, game: 'Game') -> None:
         if event.type == pygame.MOUSEBUTTONDOWN:
-            x, y = pygame.mouse.get_pos()
+            x, y = event.pos
 
             # Перевірка натискання на кнопки
             clicked_button = game.button_manager.get_clicked_button(x, y)
@@ -20,9 +24,10 @@ class PlayingState(IGameState):
                 return
 
             # Вибір клітинки
-            if y < GRID_SIZE * CELL_SIZE:  # У межах сітки
-                col = x // CELL_SIZE
-                row = y // CELL_SIZE
+            cell_size = game.layout.cell_size
+            if y < GRID_SIZE * cell_size:  # У межах сітки
+                col = x // cell_size
+                row = y // cell_size
                 game.select_cell(row, col)
 
         elif event.type == pygame.KEYDOWN:
@@ -30,7 +35,7 @@ class PlayingState(IGameState):
                 from .main_menu_state import MainMenuState
                 game.set_state(MainMenuState())
             else:
-                self._handle_key_press(event.key, game)
+                self._handle_key_press(event.key, game, event.mod)
 
     def _handle_button_click(self, button_name: str, game: 'Game') -> None:
         """Обробка натискання кнопок"""
@@ -47,7 +52,7 @@ class PlayingState(IGameState):
             from .main_menu_state import MainMenuState
             game.set_state(MainMenuState())
 
-    def _handle_key_press(self, key: int, game: 'Game') -> None:
+    def _handle_key_press(self, key: int, game: 'Game', mods: int = 0) -> None:
         """Обробка натискання клавіш"""
         if game.selected_cell:
             row, col = game.selected_cell
@@ -58,7 +63,6 @@ class PlayingState(IGameState):
                 number = key - pygame.K_0
 
                 # Якщо натиснуто Shift, додаємо/видаляємо замітку
-                mods = pygame.key.get_mods()
                 if mods & pygame.KMOD_SHIFT:
                     game.board.toggle_note(row, col, number)
                 else:
@@ -92,23 +96,28 @@ class PlayingState(IGameState):
         # Оновлюємо таймер тільки якщо гра не на паузі
         game.timer.update()
 
-    def render(self, surface: pygame.Surface, game: 'Game') -> None:
-        """Відображення стану гри"""
-        surface.fill(WHITE)
-
-        # Відображення сітки
-        game.renderer.draw_grid(surface, game.board.grid, game.selected_cell)
+    def needs_redraw(self, game: 'Game') -> bool:
+        """Перемальовуємо, коли таймер перейшов на нову секунду"""
+        return game.timer.get_formatted_time() != self._shown_time
 
-        # Відображення кнопок
-        game.renderer.draw_buttons(surface, game.button_manager.buttons)
+    def next_wakeup(self, game: 'Game') -> Optional[int]:
+        """Час до наступної секунди таймера"""
+        if not game.timer.is_running:
+            return None
+        return 1000 - game.timer.get_time() % 1000
 
-        # Відображення таймеру
-        game.renderer.draw_timer(surface, game.timer.get_formatted_time())
-
-        # Відображення кількості використаних підказок
-        second_row_y = GRID_SIZE * CELL_SIZE + 95  # Під другим рядом кнопок
-        hints_text = game.small_font.render(
-            f"Підказки: {game.board.hints_used}/{game.board.max_hints}",
-            True, BLACK
+    def render(self, surface: pygame.Surface, game: 'Game') -> None:
+        """Відображення стану гри
+
+        Рендерер сам визначає, які області змінилися з попереднього кадру,
+        і перемальовує лише їх.
+        """
+        self._shown_time = game.timer.get_formatted_time()
+        game.renderer.draw_playing_screen(
+            surface,
+            game.board.grid,
+            game.selected_cell,
+            game.button_manager.widgets,
+            self._shown_time,
+            f"Підказки: {game.board.hints_used}/{game.board.max_hints}"
         )
-        surface.blit(hints_text, (10, second_row_y))
\ No newline at end of file
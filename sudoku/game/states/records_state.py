@@ -1,28 +1,50 @@
 import pygame
 import sys
-from typing import TYPE_CHECKING, Optional, List
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Tuple
 from datetime import datetime
 
 from .i_game_state import IGameState
-from ...config import WINDOW_SIZE, WHITE, BLACK, BLUE, GRAY, GREEN
+from ..records_loader import RecordPageLoader
+from ...config import WHITE, BLACK, BLUE, GRAY, GREEN
 from ...models import Difficulty
+from ...ui.layout import Layout
+from ...ui.widgets import Button, Canvas, Label, Picture, WidgetTree
 
 if TYPE_CHECKING:
     from ..game import Game
 
+DIFFICULTY_NAMES = {
+    Difficulty.EASY: "Легкий",
+    Difficulty.MEDIUM: "Середній",
+    Difficulty.HARD: "Важкий"
+}
+# Позиції колонок таблиці (у базових одиницях розмітки, як і решта розмірів екрана)
+COLUMN_POSITIONS = [80, 150, 220, 320, 400]
+TABLE_LEFT = 50
+STRIPE_COLOR = (245, 245, 245)
+# Скільки відрендерених рядків тримати в пам'яті
+MAX_ROW_SURFACES = 100
+
 
 class RecordsState(IGameState):
     """Стан показу таблиці рекордів"""
 
     def __init__(self):
         self.selected_difficulty: Optional[Difficulty] = None
-        self.records = []
+        self.loader: Optional[RecordPageLoader] = None
+        self.record_count: Optional[int] = None
         self.personal_stats = {}
         self.scroll_offset = 0
         self.max_scroll = 0
-        self.difficulty_buttons = {}
-        self.back_button = None
-        self.records_loaded = False
+        self.widgets: Optional[WidgetTree] = None
+        self._font: Optional[pygame.font.Font] = None
+        self._layout: Optional[Layout] = None
+
+        # Відрендерені рядки: (складність, позиція) -> поверхня
+        self._row_surfaces: 'OrderedDict[Tuple[Optional[Difficulty], int], pygame.Surface]' = OrderedDict()
+        self._stats_loaded = False
+        self._shown_version = -1
 
         # Налаштування інтерфейсу
         self.button_height = 40
@@ -30,67 +52,108 @@ class RecordsState(IGameState):
         self.records_per_page = 15
         self.header_height = 150
 
-    def _initialize_buttons(self, font, small_font):
+    def _ensure_widgets(self, game: 'Game') -> WidgetTree:
+        """Будує віджети екрана при першому зверненні"""
+        if self.widgets is None:
+            self.widgets = self._build_widgets(game.font, game.small_font, game.layout)
+        return self.widgets
+
+    def layout_changed(self, game: 'Game') -> None:
+        """Віджети й рядки таблиці будуються заново для нового масштабу"""
+        self.widgets = None
+        self._row_surfaces.clear()
+
+    def _build_widgets(self, font, small_font, layout: Layout) -> WidgetTree:
+        """Створює віджети екрана в порядку малювання"""
+        widgets = WidgetTree()
+        self._font = small_font
+        self._layout = layout
+        px = layout.px
+        border = layout.size(2)
+
+        widgets.add(Label("title", "ТАБЛИЦЯ РЕКОРДІВ", font, BLACK, center=(layout.width // 2, px(30))))
+
         difficulties = [None] + list(Difficulty)  # None = "Всі рівні"
         button_count = len(difficulties)
-        total_spacing = 20  # Загальний простір між кнопками
 
         # Визначаємо ширину кнопки як частину від загальної ширини вікна
-        max_total_button_width = WINDOW_SIZE[0] * 0.9  # 90% ширини вікна
-        spacing = 10
+        max_total_button_width = layout.width * 0.9  # 90% ширини вікна
+        spacing = px(10)
         button_width = (max_total_button_width - spacing * (button_count - 1)) // button_count
-        start_x = (WINDOW_SIZE[0] - ((button_width + spacing) * button_count - spacing)) // 2
-
-        # Відображувані назви
-        difficulty_names = {
-            None: "Всі рівні",
-            Difficulty.EASY: "Легкий",
-            Difficulty.MEDIUM: "Середній",
-            Difficulty.HARD: "Важкий"
-        }
-
-        # Створюємо кнопки
-        self.difficulty_buttons = {}
+        start_x = (layout.width - ((button_width + spacing) * button_count - spacing)) // 2
+
+        # Кнопки складності називаються за рівнем, "ALL" — всі рівні
         for i, difficulty in enumerate(difficulties):
             x = start_x + i * (button_width + spacing)
-            rect = pygame.Rect(x, 80, button_width, self.button_height)
+            rect = pygame.Rect(x, px(80), button_width, px(self.button_height))
+            text = DIFFICULTY_NAMES[difficulty] if difficulty is not None else "Всі рівні"
+            color = GREEN if difficulty == self.selected_difficulty else BLUE
+            widgets.add(Button(self._button_name(difficulty), rect, text, small_font,
+                               color=color, border=border))
 
-            if difficulty is not None:
-                text = difficulty_names.get(difficulty, difficulty.name.capitalize())
-            else:
-                text = "Всі рівні"
+        stats = widgets.add(Label("stats", "", small_font, BLACK, topleft=(px(50), px(130))))
+        stats.set_visible(False)
+
+        headers, headers_y = self._build_headers(small_font)
+        widgets.add(Picture("headers", headers, (px(TABLE_LEFT), headers_y)))
 
-            text_surface = small_font.render(text, True, WHITE)
-            self.difficulty_buttons[difficulty] = (rect, text_surface)
+        records_start_y = self.header_height + 55
+        table_rect = pygame.Rect(px(TABLE_LEFT), px(records_start_y - 2), self._table_width(),
+                                 self.records_per_page * px(self.record_height))
+        widgets.add(Canvas("table", table_rect, self._paint_table))
 
         # Кнопка "Назад" — фіксовано зліва внизу
-        self.back_button = (
-            pygame.Rect(50, WINDOW_SIZE[1] - 60, 100, self.button_height),
-            small_font.render("Назад", True, WHITE)
-        )
+        back_rect = pygame.Rect(px(50), layout.height - px(60), px(100), px(self.button_height))
+        widgets.add(Button("back", back_rect, "Назад", small_font, border=border))
 
-    def _load_records(self, game: 'Game'):
-        """Завантажує рекорди з бази даних"""
-        if not game.db_manager:
-            self.records = []
-            self.personal_stats = {}
-            return
+        scroll_info = widgets.add(Label("scroll_info", "", small_font, GRAY,
+                                        topleft=(layout.width - px(250), layout.height - px(30))))
+        scroll_info.set_visible(False)
+        return widgets
 
-        try:
-            # Завантажуємо рекорди
-            self.records = game.get_leaderboard(self.selected_difficulty, limit=50)
+    def _table_width(self) -> int:
+        return self._layout.width - 2 * self._layout.px(TABLE_LEFT)
 
-            # Завантажуємо персональну статистику
-            self.personal_stats = game.get_personal_stats()
+    @staticmethod
+    def _button_name(difficulty: Optional[Difficulty]) -> str:
+        return difficulty.name if difficulty is not None else "ALL"
 
-            # Розраховуємо максимальний скрол
-            visible_records = min(len(self.records), self.records_per_page)
-            self.max_scroll = max(0, len(self.records) - visible_records)
+    def _open_loader(self, game: 'Game') -> None:
+        """Запускає фонове завантаження рекордів
 
-        except Exception as e:
-            print(f"Помилка завантаження рекордів: {e}")
-            self.records = []
-            self.personal_stats = {}
+        Для файлової бази сторінки читаються в окремому потоці з власним
+        з'єднанням; для бази в пам'яті — одразу, через спільний сервіс.
+        """
+        if not game.ensure_database():
+            return
+        reader = game.db.execute(lambda db: db.open_record_reader())
+        if reader:
+            service, close = reader
+            self.loader = RecordPageLoader(service, self._format_row, on_exit=close)
+        else:
+            self.loader = RecordPageLoader(game.db_manager.game_record_service, self._format_row,
+                                           threaded=False)
+
+    def _close_loader(self) -> None:
+        if self.loader:
+            self.loader.close()
+            self.loader = None
+
+    def _leave(self, game: 'Game') -> None:
+        """Повертається до головного меню, зупиняючи завантаження"""
+        self._close_loader()
+        from .main_menu_state import MainMenuState
+        game.set_state(MainMenuState())
+
+    def _format_row(self, rank: int, record) -> Tuple[str, ...]:
+        """Готує тексти колонок рядка; викликається в потоці завантаження"""
+        return (
+            str(rank),
+            self._format_time(record.completion_time),
+            DIFFICULTY_NAMES.get(record.difficulty, str(record.difficulty)),
+            str(record.hints_used),
+            self._format_date(record)
+        )
 
     def _format_time(self, seconds: int) -> str:
         """Форматує час у читабельний вигляд"""
@@ -147,155 +210,193 @@ class RecordsState(IGameState):
 
     def handle_event(self, event: pygame.event.Event, game: 'Game') -> None:
         if event.type == pygame.MOUSEBUTTONDOWN:
-            x, y = pygame.mouse.get_pos()
+            x, y = event.pos
 
-            # Ініціалізуємо кнопки, якщо потрібно
-            if not self.difficulty_buttons:
-                self._initialize_buttons(game.font, game.small_font)
-
-            # Перевіряємо натискання на кнопки складності
-            for difficulty, (rect, _) in self.difficulty_buttons.items():
-                if rect.collidepoint(x, y):
-                    if self.selected_difficulty != difficulty:
-                        self.selected_difficulty = difficulty
-                        self.records_loaded = False
-                        self.scroll_offset = 0
-                    break
+            widgets = self._ensure_widgets(game)
+            button = widgets.widget_at(x, y)
+            if button is None:
+                return
 
             # Перевіряємо кнопку "Назад"
-            if self.back_button and self.back_button[0].collidepoint(x, y):
-                from .main_menu_state import MainMenuState
-                game.set_state(MainMenuState())
+            if button.name == "back":
+                self._leave(game)
+                return
+
+            # Кнопки складності
+            difficulty = None if button.name == "ALL" else Difficulty[button.name]
+            if self.selected_difficulty != difficulty:
+                widgets[self._button_name(self.selected_difficulty)].set_color(BLUE)
+                button.set_color(GREEN)
+                self.selected_difficulty = difficulty
+                self.record_count = None
+                self.max_scroll = 0
+                self.scroll_offset = 0
 
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
-                from .main_menu_state import MainMenuState
-                game.set_state(MainMenuState())
+                self._leave(game)
             elif event.key == pygame.K_UP:
-                self.scroll_offset = max(0, self.scroll_offset - 1)
+                self._scroll_to(self.scroll_offset - 1)
             elif event.key == pygame.K_DOWN:
-                self.scroll_offset = min(self.max_scroll, self.scroll_offset + 1)
+                self._scroll_to(self.scroll_offset + 1)
+            elif event.key == pygame.K_PAGEUP:
+                self._scroll_to(self.scroll_offset - self.records_per_page)
+            elif event.key == pygame.K_PAGEDOWN:
+                self._scroll_to(self.scroll_offset + self.records_per_page)
+            elif event.key == pygame.K_HOME:
+                self._scroll_to(0)
+            elif event.key == pygame.K_END:
+                self._scroll_to(self.max_scroll)
 
         elif event.type == pygame.MOUSEWHEEL:
             # Прокрутка колесом миші
-            self.scroll_offset = max(0, min(self.max_scroll, self.scroll_offset - event.y))
+            self._scroll_to(self.scroll_offset - event.y)
+
+    def _scroll_to(self, offset: int) -> None:
+        self.scroll_offset = max(0, min(self.max_scroll, offset))
 
     def update(self, game: 'Game') -> None:
-        """Оновлення стану"""
-        if not self.records_loaded:
-            self._load_records(game)
-            self.records_loaded = True
+        """Забирає готові дані завантаження; сам не чекає на базу"""
+        if self.loader is None:
+            self._open_loader(game)
+            if self.loader is None:
+                self.record_count = 0
+                return
+        self._shown_version = self.loader.version
+
+        if self.record_count is None:
+            self.record_count = self.loader.get_count(self.selected_difficulty)
+            if self.record_count is not None:
+                self.max_scroll = max(0, self.record_count - self.records_per_page)
+                self._scroll_to(self.scroll_offset)
+
+        if not self._stats_loaded:
+            stats = self.loader.get_stats()
+            if stats is not None:
+                self.personal_stats = stats
+                self._stats_loaded = True
+
+        if self.record_count:
+            last = min(self.record_count, self.scroll_offset + self.records_per_page) - 1
+            self.loader.prefetch(self.selected_difficulty, self.scroll_offset, last)
+
+    def needs_redraw(self, game: 'Game') -> bool:
+        """Перемальовує екран, коли потік завантаження приніс нові дані"""
+        return self.loader is not None and self.loader.version != self._shown_version
 
     def render(self, surface: pygame.Surface, game: 'Game') -> None:
-        """Відображення таблиці рекордів"""
-        surface.fill(WHITE)
-
-        # ✅ Ініціалізація кнопок при першому рендері
-        if not self.difficulty_buttons:
-            self._initialize_buttons(game.font, game.small_font)
-
-        # ✅ Винесено в окремі методи для читабельності
-        self._render_title(surface, game.font)  # додано метод для заголовка
-        self._render_difficulty_buttons(surface, game.small_font)  #  кнопки рівня складності
-        self._render_personal_stats(surface, game.small_font)  #  персональна статистика
-        self._render_table_headers(surface, game.small_font)  #  заголовки таблиці
-        self._render_records(surface, game.small_font)  #  самі записи
-        self._render_back_button(surface)  #  кнопка "Назад"
-        self._render_scroll_info(surface, game.small_font)  #  інформація про прокрутку
-
-    # ✅ Відображення заголовка таблиці
-    def _render_title(self, surface, font):
-        title_text = font.render("ТАБЛИЦЯ РЕКОРДІВ", True, BLACK)
-        title_rect = title_text.get_rect(center=(WINDOW_SIZE[0] // 2, 30))
-        surface.blit(title_text, title_rect)
-
-    # ✅ Відображення кнопок вибору складності (Easy, Medium, Hard)
-    def _render_difficulty_buttons(self, surface, font):
-        for difficulty, (rect, text_surface) in self.difficulty_buttons.items():
-            color = GREEN if difficulty == self.selected_difficulty else BLUE  # 👉 підсвітка вибраної складності
-            pygame.draw.rect(surface, color, rect)
-            pygame.draw.rect(surface, BLACK, rect, 2)
-            text_rect = text_surface.get_rect(center=rect.center)
-            surface.blit(text_surface, text_rect)
-
-    # ✅ Персональна статистика гравця (ігри + середній час)
-    def _render_personal_stats(self, surface, font):
+        """Відображення таблиці рекордів
+
+        Екран складається з віджетів; тут лише передаються їм актуальні
+        дані, а перемальовуються ті, що змінилися.
+        """
+        widgets = self._ensure_widgets(game)
+
+        stats_text = self._stats_text()
+        widgets["stats"].set_text(stats_text)
+        widgets["stats"].set_visible(bool(stats_text))
+
+        widgets["table"].set_key(self._table_key())
+
+        scroll_text = self._scroll_text()
+        widgets["scroll_info"].set_text(scroll_text)
+        widgets["scroll_info"].set_visible(bool(scroll_text))
+
+        game.renderer.draw_widgets(surface, widgets)
+
+    # Персональна статистика гравця (ігри + середній час)
+    def _stats_text(self) -> str:
         if self.personal_stats and self.personal_stats.get('total_games', 0) > 0:
-            stats_y = 130
             total_games = self.personal_stats.get('total_games', 0)
             avg_time = self.personal_stats.get('average_time', 0)
-            stats_text = f"Ваша статистика: Зіграно ігор: {total_games}, Середній час: {self._format_time(avg_time)}"
-            stats_surface = font.render(stats_text, True, BLACK)
-            surface.blit(stats_surface, (50, stats_y))
+            return f"Ваша статистика: Зіграно ігор: {total_games}, Середній час: {self._format_time(avg_time)}"
+        return ""
 
-    # ✅ Заголовки колонок таблиці ("#", "Час", тощо)
-    def _render_table_headers(self, surface, font):
+    # Заголовки колонок таблиці ("#", "Час", тощо) разом з лінією під ними
+    def _build_headers(self, font) -> Tuple[pygame.Surface, int]:
         headers = ["#", "Час", "Рівень", "Підказок", "Дата"]
-        header_positions = [80, 150, 220, 320, 400]
-        headers_y = self.header_height + 20
+        px = self._layout.px
+        headers_y = px(self.header_height + 20)
 
-        for header, x_pos in zip(headers, header_positions):
-            header_surface = font.render(header, True, BLACK)
-            surface.blit(header_surface, (x_pos, headers_y))
+        # Поверхня охоплює смугу заголовків; лінія включає крайню праву точку
+        picture = pygame.Surface((self._table_width() + 1, px(28)))
+        picture.fill(WHITE)
+        for header, x_pos in zip(headers, COLUMN_POSITIONS):
+            picture.blit(font.render(header, True, BLACK), (px(x_pos - TABLE_LEFT), 0))
 
         #  лінія під заголовками
-        pygame.draw.line(surface, GRAY, (50, headers_y + 25), (WINDOW_SIZE[0] - 50, headers_y + 25), 2)
-
-    # ✅ Основна таблиця рекордів
-    def _render_records(self, surface, font):
-        if not self.records:
+        pygame.draw.line(picture, GRAY, (0, px(25)), (picture.get_width() - 1, px(25)), self._layout.size(2))
+        return picture, headers_y
+
+    def _row_surface(self, font, index: int) -> Optional[pygame.Surface]:
+        """Повертає відрендерений рядок таблиці або None, поки його сторінка завантажується
+
+        Рядок рендериться один раз; чергування кольору залежить від
+        позиції в таблиці, тож поверхня не змінюється під час прокрутки.
+        """
+        key = (self.selected_difficulty, index)
+        row_surface = self._row_surfaces.get(key)
+        if row_surface is not None:
+            self._row_surfaces.move_to_end(key)
+            return row_surface
+
+        row = self.loader.get_row(self.selected_difficulty, index)
+        if row is None:
+            return None
+
+        px = self._layout.px
+        row_surface = pygame.Surface((self._table_width(), px(self.record_height)))
+        row_surface.fill(STRIPE_COLOR if index % 2 == 1 else WHITE)
+        for text, x_pos in zip(row, COLUMN_POSITIONS):
+            row_surface.blit(font.render(text, True, BLACK), (px(x_pos - TABLE_LEFT), px(2)))
+
+        self._row_surfaces[key] = row_surface
+        if len(self._row_surfaces) > MAX_ROW_SURFACES:
+            self._row_surfaces.popitem(last=False)
+        return row_surface
+
+    def _visible_rows(self) -> int:
+        if not self.record_count:
+            return 0
+        return min(self.records_per_page, self.record_count - self.scroll_offset)
+
+    def _table_key(self) -> Tuple:
+        """Ключ вмісту таблиці: змінюється з прокруткою та завантаженням рядків"""
+        loaded = tuple(self._row_surface(self._font, self.scroll_offset + i) is not None
+                       for i in range(self._visible_rows()))
+        return (self.selected_difficulty, self.scroll_offset, self.record_count, loaded)
+
+    # Основна таблиця рекордів (віртуальне вікно над сторінками з бази)
+    def _paint_table(self, canvas: pygame.Surface) -> None:
+        font = self._font
+        if self.record_count is None:
+            self._paint_message(canvas, font, "Завантаження...")
+            return
+        if not self.record_count:
             # 👉 Повідомлення, якщо записів немає
-            no_records_text = font.render("Рекордів поки немає", True, GRAY)
-            no_records_rect = no_records_text.get_rect(center=(WINDOW_SIZE[0] // 2, WINDOW_SIZE[1] // 2))
-            surface.blit(no_records_text, no_records_rect)
+            self._paint_message(canvas, font, "Рекордів поки немає")
             return
 
-        records_start_y = self.header_height + 55
-        difficulty_names = {
-            Difficulty.EASY: "Легкий",
-            Difficulty.MEDIUM: "Середній",
-            Difficulty.HARD: "Важкий"
-        }
-        header_positions = [80, 150, 220, 320, 400]
-
-        for i, record in enumerate(self.records[self.scroll_offset:self.scroll_offset + self.records_per_page]):
-            y_pos = records_start_y + i * self.record_height
-
-            if i % 2 == 1:
-                #  Чергування кольору рядків для зручності читання
-                row_rect = pygame.Rect(50, y_pos - 2, WINDOW_SIZE[0] - 100, self.record_height)
-                pygame.draw.rect(surface, (245, 245, 245), row_rect)
-
-            #  Дані для кожного запису
-            rank_text = font.render(str(self.scroll_offset + i + 1), True, BLACK)
-            surface.blit(rank_text, (header_positions[0], y_pos))
-
-            time_text = font.render(self._format_time(record.completion_time), True, BLACK)
-            surface.blit(time_text, (header_positions[1], y_pos))
-
-            # Перевірка .get() у разі None, щоб уникнути AttributeError
-            difficulty = difficulty_names.get(record.difficulty, str(record.difficulty))
-            diff_text = font.render(difficulty, True, BLACK)
-            surface.blit(diff_text, (header_positions[2], y_pos))
-
-            hints_text = font.render(str(record.hints_used), True, BLACK)
-            surface.blit(hints_text, (header_positions[3], y_pos))
-
-            date_text = font.render(self._format_date(record), True, BLACK)
-            surface.blit(date_text, (header_positions[4], y_pos))
-
-    # ✅ Відображення кнопки "Назад"
-    def _render_back_button(self, surface):
-        if self.back_button:
-            rect, text_surface = self.back_button
-            pygame.draw.rect(surface, BLUE, rect)
-            pygame.draw.rect(surface, BLACK, rect, 2)
-            text_rect = text_surface.get_rect(center=rect.center)
-            surface.blit(text_surface, text_rect)
-
-    # ✅ Інформація про поточну сторінку (наприклад: Записи 1–10 з 25)
-    def _render_scroll_info(self, surface, font):
-        if len(self.records) > self.records_per_page:
-            scroll_text = f"Записи {self.scroll_offset + 1}-{min(self.scroll_offset + self.records_per_page, len(self.records))} з {len(self.records)}"
-            scroll_surface = font.render(scroll_text, True, GRAY)
-            surface.blit(scroll_surface, (WINDOW_SIZE[0] - 250, WINDOW_SIZE[1] - 30))
+        px = self._layout.px
+        for i in range(self._visible_rows()):
+            y_pos = i * px(self.record_height)
+            row_surface = self._row_surface(font, self.scroll_offset + i)
+            if row_surface is not None:
+                canvas.blit(row_surface, (0, y_pos))
+            else:
+                # Сторінка ще завантажується
+                placeholder = font.render("...", True, GRAY)
+                canvas.blit(placeholder, (px(COLUMN_POSITIONS[0] - TABLE_LEFT), y_pos + px(2)))
+
+    def _paint_message(self, canvas: pygame.Surface, font, text: str) -> None:
+        """Повідомлення по центру вікна, у координатах таблиці"""
+        table_rect = self.widgets["table"].rect
+        center = (self._layout.width // 2 - table_rect.x, self._layout.height // 2 - table_rect.y)
+        message = font.render(text, True, GRAY)
+        canvas.blit(message, message.get_rect(center=center))
+
+    # Інформація про поточну сторінку (наприклад: Записи 1–10 з 25)
+    def _scroll_text(self) -> str:
+        if self.record_count and self.record_count > self.records_per_page:
+            return f"Записи {self.scroll_offset + 1}-{min(self.scroll_offset + self.records_per_page, self.record_count)} з {self.record_count}"
+        return ""
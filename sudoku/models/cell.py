@@ -1,7 +1,7 @@
 """
 Модуль для клітинки судоку
 """
-from typing import Set
+from typing import Any, Dict, Set
 
 
 class Cell:
@@ -29,4 +29,23 @@ class Cell:
             if value in self.notes:
                 self.notes.remove(value)
             else:
-                self.notes.add(value)
\ No newline at end of file
+                self.notes.add(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Конвертує клітинку у JSON-серіалізований словник"""
+        return {
+            'row': self.row,
+            'col': self.col,
+            'value': self.value,
+            'is_fixed': self.is_fixed,
+            'notes': sorted(self.notes),
+            'is_valid': self.is_valid
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Cell':
+        """Відновлює клітинку зі словника"""
+        cell = cls(data['row'], data['col'], data.get('value', 0), data.get('is_fixed', False))
+        cell.notes = set(data.get('notes', []))
+        cell.is_valid = data.get('is_valid', True)
+        return cell
@@ -3,5 +3,10 @@
 """
 from .renderer import SudokuRenderer
 from .buttons import ButtonManager
+from .glyphs import GlyphCache
+from .fonts import FontPathCache, ScaledFonts
+from .layout import Layout
+from .widgets import Widget, Label, Button, Picture, Canvas, WidgetTree
 
-__all__ = ['SudokuRenderer', 'ButtonManager']
\ No newline at end of file
+__all__ = ['SudokuRenderer', 'ButtonManager', 'GlyphCache', 'FontPathCache', 'ScaledFonts', 'Layout',
+           'Widget', 'Label', 'Button', 'Picture', 'Canvas', 'WidgetTree']
\ No newline at end of file
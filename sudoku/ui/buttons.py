@@ -2,64 +2,69 @@
 Модуль для управління кнопками інтерфейсу
 """
 import pygame
-from typing import Dict, Tuple
+from typing import Optional
 
-from ..config import GRID_SIZE, CELL_SIZE, WHITE
+from ..config import GRID_SIZE, WINDOW_SIZE
+from .layout import Layout
+from .widgets import Button, WidgetTree
+
+# Кнопки ігрового екрана: (назва, текст, ширина)
+GAME_BUTTONS = (
+    ("new_game", "Нова гра", 90),  # веде до вибору складності
+    ("hint", "Підказка", 80),
+    ("pause", "Пауза", 70),
+    ("auto_notes", "Авто-замітки", 110),
+    ("menu", "Меню", 70),
+)
 
 
 class ButtonManager:
     """Клас для управління кнопками інтерфейсу"""
-    def __init__(self, small_font: pygame.font.Font):
+    def __init__(self, small_font: pygame.font.Font, layout: Optional[Layout] = None):
         self.small_font = small_font
-        self.buttons: Dict[str, Tuple[pygame.Rect, pygame.Surface]] = {}
-        self.button_height = 35
-        self.button_y = GRID_SIZE * CELL_SIZE + 50  # Рядок для кнопок
+        self.layout = layout or Layout(WINDOW_SIZE)
+        self.widgets = WidgetTree()
+
+    @property
+    def button_height(self) -> int:
+        return self.layout.px(35)
+
+    @property
+    def button_y(self) -> int:
+        # Рядок для кнопок під сіткою
+        return GRID_SIZE * self.layout.cell_size + self.layout.px(50)
 
     def initialize_buttons(self):
         """Ініціалізує кнопки інтерфейсу в один рядок"""
-        margin_left = 10
-        spacing = 10
+        px = self.layout.px
+        margin_left = px(10)
+        spacing = px(10)
         current_x = margin_left
-        y = self.button_y
-
-        # Кнопка нової гри (тепер веде до вибору складності)
-        new_game_text = self.small_font.render("Нова гра", True, WHITE)
-        new_game_rect = pygame.Rect(current_x, y, 90, self.button_height)
-        self.buttons["new_game"] = (new_game_rect, new_game_text)
-        current_x += 90 + spacing
 
-        # Кнопка підказки
-        hint_text = self.small_font.render("Підказка", True, WHITE)
-        hint_rect = pygame.Rect(current_x, y, 80, self.button_height)
-        self.buttons["hint"] = (hint_rect, hint_text)
-        current_x += 80 + spacing
+        for name, text, width in GAME_BUTTONS:
+            rect = pygame.Rect(current_x, self.button_y, px(width), self.button_height)
+            self.widgets.add(Button(name, rect, text, self.small_font, border=self.layout.size(2)))
+            current_x += px(width) + spacing
 
-        # Кнопка паузи
-        pause_text = self.small_font.render("Пауза", True, WHITE)
-        pause_rect = pygame.Rect(current_x, y, 70, self.button_height)
-        self.buttons["pause"] = (pause_rect, pause_text)
-        current_x += 70 + spacing
-
-        # Кнопка авто-заміток
-        auto_notes_text = self.small_font.render("Авто-замітки", True, WHITE)
-        auto_notes_rect = pygame.Rect(current_x, y, 110, self.button_height)
-        self.buttons["auto_notes"] = (auto_notes_rect, auto_notes_text)
-        current_x += 110 + spacing
-
-        # Кнопка меню (замість кнопки складності)
-        menu_text = self.small_font.render("Меню", True, WHITE)
-        menu_rect = pygame.Rect(current_x, y, 70, self.button_height)
-        self.buttons["menu"] = (menu_rect, menu_text)
+    def set_layout(self, layout: Layout, small_font: pygame.font.Font):
+        """Перебудовує кнопки для нової розмітки, зберігаючи їхні тексти"""
+        self.layout = layout
+        self.small_font = small_font
+        if not len(self.widgets):
+            return
+        texts = {button.name: button.text for button in self.widgets}
+        self.widgets.clear()
+        self.initialize_buttons()
+        for button in self.widgets:
+            button.set_text(texts.get(button.name, button.text))
 
     def update_pause_button(self, text: str):
-        """Оновлює текст кнопки паузи"""
-        pause_text = self.small_font.render(text, True, WHITE)
-        pause_rect = pygame.Rect(10 + 90 + 10 + 80, self.button_y, 70, self.button_height)
-        self.buttons["pause"] = (pause_rect, pause_text)
+        """Оновлює текст кнопки паузи; розташування кнопки не змінюється"""
+        button = self.widgets.get("pause")
+        if button:
+            button.set_text(text)
 
     def get_clicked_button(self, x: int, y: int) -> str:
         """Повертає назву кнопки, на яку натиснули, або пусту строку"""
-        for button_name, (rect, _) in self.buttons.items():
-            if rect.collidepoint(x, y):
-                return button_name
-        return ""
\ No newline at end of file
+        button: Optional[Button] = self.widgets.widget_at(x, y)
+        return button.name if button else ""
@@ -0,0 +1,97 @@
+"""
+Завантаження системних шрифтів з кешем шляхів на диску
+"""
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+from ..config import FONT_SIZE, SMALL_FONT_SIZE, MAX_CACHED_SCALES
+
+
+class FontPathCache:
+    """Кеш відповідності "назва шрифту -> шлях до файлу"
+
+    ``pygame.font.SysFont`` під час першого виклику сканує системні
+    каталоги шрифтів (на Linux запускає fc-list), а це найдовша частина
+    запуску гри. Знайдений шлях зберігається в JSON-файлі, тож наступні
+    запуски відкривають файл шрифту напряму. Ненайдений шрифт теж
+    кешується (як null) — тоді використовується шрифт pygame за
+    замовчуванням, як і в SysFont. Щоб знайти шрифт заново, достатньо
+    видалити файл кешу.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._paths: Optional[Dict[str, Optional[str]]] = None
+
+    def _load(self) -> Dict[str, Optional[str]]:
+        if self._paths is None:
+            self._paths = {}
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as stream:
+                        self._paths = json.load(stream)
+                except (OSError, ValueError) as e:
+                    logging.warning(f"Ignoring unreadable font cache {self.path}: {e}")
+        return self._paths
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as stream:
+                json.dump(self._paths, stream, indent=2)
+        except OSError as e:
+            logging.warning(f"Failed to write font cache {self.path}: {e}")
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Повертає шлях до файлу шрифту або None для шрифту за замовчуванням"""
+        paths = self._load()
+        if name in paths:
+            cached = paths[name]
+            # Файл міг зникнути після оновлення системи — тоді шукаємо знову
+            if cached is None or os.path.exists(cached):
+                return cached
+
+        resolved = pygame.font.match_font(name)
+        paths[name] = resolved
+        self._save()
+        return resolved
+
+    def load(self, name: str, size: int) -> pygame.font.Font:
+        """Створює шрифт так само, як SysFont, але без сканування системи"""
+        return pygame.font.Font(self.resolve(name), size)
+
+
+class ScaledFonts:
+    """Основний і дрібний шрифти гри для кожного масштабу інтерфейсу
+
+    Шрифти створюються один раз для масштабу і зберігаються для
+    останніх ``max_scales`` масштабів, тож повернення до попереднього
+    розміру вікна не відкриває файли шрифтів заново.
+    """
+
+    def __init__(self, paths: FontPathCache, name: str, max_scales: int = MAX_CACHED_SCALES):
+        self.paths = paths
+        self.name = name
+        self.max_scales = max_scales
+        self._fonts: 'OrderedDict[float, Tuple[pygame.font.Font, pygame.font.Font]]' = OrderedDict()
+
+    def get(self, scale: float) -> Tuple[pygame.font.Font, pygame.font.Font]:
+        """Повертає пару (шрифт, дрібний шрифт) для масштабу"""
+        fonts = self._fonts.get(scale)
+        if fonts is not None:
+            self._fonts.move_to_end(scale)
+            return fonts
+
+        fonts = (self.paths.load(self.name, max(1, round(FONT_SIZE * scale))),
+                 self.paths.load(self.name, max(1, round(SMALL_FONT_SIZE * scale))))
+        self._fonts[scale] = fonts
+        while len(self._fonts) > self.max_scales:
+            self._fonts.popitem(last=False)
+        return fonts
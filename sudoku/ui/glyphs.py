@@ -0,0 +1,49 @@
+"""
+Кеш попередньо відрендерених гліфів
+"""
+import pygame
+from typing import Dict, Iterable, Tuple
+
+
+class GlyphCache:
+    """Кеш поверхонь тексту для пар (шрифт, колір)
+
+    Цифри клітинок і заміток рендеряться один раз, після чого малювання
+    зводиться до blit. Рядки, що часто змінюються (таймер, лічильник
+    підказок), складаються з окремих символів, тож кеш не росте з
+    кожним новим значенням.
+    """
+
+    def __init__(self):
+        self._glyphs: Dict[Tuple[pygame.font.Font, str, tuple], pygame.Surface] = {}
+
+    def get(self, font: pygame.font.Font, text: str, color) -> pygame.Surface:
+        """Повертає поверхню тексту, рендерячи її лише при першому зверненні"""
+        # Кортежі кольорів з config уже придатні як ключ
+        key = (font, text, color if isinstance(color, tuple) else tuple(pygame.Color(color)))
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            glyph = self._glyphs[key] = font.render(text, True, color)
+        return glyph
+
+    def preload(self, font: pygame.font.Font, texts: Iterable[str], color) -> None:
+        """Заздалегідь рендерить набір текстів"""
+        for text in texts:
+            self.get(font, text, color)
+
+    def blit_text(self, surface: pygame.Surface, font: pygame.font.Font, text: str,
+                  color, topleft: Tuple[int, int]) -> pygame.Rect:
+        """Малює рядок посимвольно з кешованих гліфів і повертає зайняту область"""
+        x, y = topleft
+        for char in text:
+            glyph = self.get(font, char, color)
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+        return pygame.Rect(topleft[0], y, x - topleft[0], font.get_height())
+
+    def clear(self) -> None:
+        """Очищає кеш, наприклад після зміни шрифтів"""
+        self._glyphs.clear()
+
+    def __len__(self) -> int:
+        return len(self._glyphs)
@@ -0,0 +1,60 @@
+"""
+Розмітка інтерфейсу, що залежить від розміру вікна
+
+Екрани описані в базових одиницях — пікселях вікна WINDOW_SIZE з
+клітинкою CELL_SIZE. Масштаб обирається так, щоб розмір клітинки був
+цілим, тож сітка не розпливається, а всі ресурси, залежні від розміру
+(шрифти, гліфи, статичні шари), можна кешувати за масштабом.
+"""
+import pygame
+from typing import Tuple
+
+from ..config import CELL_SIZE, WINDOW_SIZE, MIN_CELL_SIZE
+
+
+class Layout:
+    """Масштаб і положення ігрової області у вікні заданого розміру
+
+    Ігрова область зберігає пропорції базового вікна і центрується;
+    ``content_rect`` — її положення у вікні. Усі координати екранів
+    відраховуються від лівого верхнього кута ігрової області.
+    """
+
+    def __init__(self, window_size: Tuple[int, int]):
+        self.window_size = (int(window_size[0]), int(window_size[1]))
+        base_width, base_height = WINDOW_SIZE
+        fit = min(self.window_size[0] / base_width, self.window_size[1] / base_height)
+
+        # Масштаб кратний 1/CELL_SIZE: клітинка завжди має цілий розмір
+        self.cell_size = max(MIN_CELL_SIZE, int(CELL_SIZE * fit))
+        self.scale = self.cell_size / CELL_SIZE
+        self.width = self.px(base_width)
+        self.height = self.px(base_height)
+
+        window_rect = pygame.Rect((0, 0), self.window_size)
+        content = pygame.Rect(0, 0, self.width, self.height)
+        content.center = window_rect.center
+        # Вікно, менше за мінімальний масштаб, обрізає ігрову область
+        self.content_rect = content.clip(window_rect)
+
+    def px(self, value: float) -> int:
+        """Переводить базові пікселі в пікселі поточного масштабу"""
+        return int(round(value * self.scale))
+
+    def size(self, value: float) -> int:
+        """Як ``px``, але не менше 1 — для товщини ліній і розмірів шрифтів"""
+        return max(1, self.px(value))
+
+    def rect(self, x: float, y: float, width: float, height: float) -> pygame.Rect:
+        return pygame.Rect(self.px(x), self.px(y), self.px(width), self.px(height))
+
+    def to_content(self, pos: Tuple[int, int]) -> Tuple[int, int]:
+        """Координати вікна -> координати ігрової області"""
+        return pos[0] - self.content_rect.x, pos[1] - self.content_rect.y
+
+    def to_window(self, pos: Tuple[int, int]) -> Tuple[int, int]:
+        """Координати ігрової області -> координати вікна"""
+        return pos[0] + self.content_rect.x, pos[1] + self.content_rect.y
+
+    def __repr__(self) -> str:
+        return f"Layout(window={self.window_size}, scale={self.scale:.3f}, cell={self.cell_size})"
@@ -2,65 +2,155 @@
 Модуль для відображення дошки судоку та інтерфейсу
 """
 import pygame
-from typing import List, Optional, Tuple, Dict
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple, Dict
 
 from ..config import (
-    GRID_SIZE, SUB_GRID_SIZE, CELL_SIZE, WINDOW_SIZE,
-    BLACK, WHITE, GRAY, BLUE, GREEN, LIGHT_BLUE, LIGHT_BLUE_ALT
+    GRID_SIZE, SUB_GRID_SIZE, CELL_SIZE, WINDOW_SIZE, MAX_CACHED_SCALES,
+    BLACK, WHITE, GRAY, GREEN, RED, LIGHT_BLUE, LIGHT_BLUE_ALT
 )
 from ..models import Cell
+from .glyphs import GlyphCache
+from .layout import Layout
+from .widgets import WidgetTree
+
+# Стилі цифр клітинок: фіксовані, введені гравцем, невірні
+FIXED_DIGIT_COLOR = BLACK
+VALUE_DIGIT_COLOR = BLACK
+INVALID_DIGIT_COLOR = RED
+NOTE_COLOR = GRAY
 
 
 class SudokuRenderer:
     """Клас для відображення судоку"""
-    def __init__(self, font, small_font):
+    def __init__(self, font, small_font, layout: Optional[Layout] = None):
+        self.layout = layout or Layout(WINDOW_SIZE)
         self.font = font
         self.small_font = small_font
-        self.cell_size = CELL_SIZE
+        self.cell_size = self.layout.cell_size
 
-    def draw_grid(self, surface: pygame.Surface, grid: List[List[Cell]], selected_cell: Optional[Tuple[int, int]]):
-        """Малює сітку судоку"""
-        # Малювання клітинок
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                cell = grid[row][col]
-                rect = pygame.Rect(col * self.cell_size, row * self.cell_size,
-                                   self.cell_size, self.cell_size)
-
-                # Встановлення кольору фону клітинки
-                bg_color = WHITE
-                if selected_cell and selected_cell[0] == row and selected_cell[1] == col:
-                    bg_color = LIGHT_BLUE  # Світло-блакитний для виділеної клітинки
-                elif selected_cell and (selected_cell[0] == row or selected_cell[1] == col):
-                    bg_color = LIGHT_BLUE_ALT  # Світло-синій для виділеного рядка/колонки
-
-                pygame.draw.rect(surface, bg_color, rect)
-
-                # Малювання значення клітинки
-                if cell.value != 0:
-                    color = BLACK if cell.is_fixed or cell.is_valid else pygame.Color("red")
-                    text = self.font.render(str(cell.value), True, color)
-                    text_rect = text.get_rect(
-                        center=(col * self.cell_size + self.cell_size // 2,
-                               row * self.cell_size + self.cell_size // 2)
-                    )
-                    surface.blit(text, text_rect)
-                # Малювання заміток
-                elif len(cell.notes) > 0:
-                    for note in cell.notes:
-                        # Визначення позиції для кожної примітки (3x3 сітка всередині клітинки)
-                        note_row = (note - 1) // 3
-                        note_col = (note - 1) % 3
-                        note_x = col * self.cell_size + note_col * (self.cell_size // 3) + self.cell_size // 6
-                        note_y = row * self.cell_size + note_row * (self.cell_size // 3) + self.cell_size // 6
-
-                        text = self.small_font.render(str(note), True, GRAY)
-                        text_rect = text.get_rect(center=(note_x, note_y))
-                        surface.blit(text, text_rect)
-
-        # Малювання ліній сітки
+        # Гліфи цифр готуються один раз для кожного масштабу; клітинки далі
+        # лише копіюються blit'ом
+        self._glyph_caches: 'OrderedDict[float, GlyphCache]' = OrderedDict()
+        # Статичні шари (лінії сітки, затемнення, вікна повідомлень)
+        self._layers: Dict[Tuple[str, int], pygame.Surface] = {}
+        self.glyphs = self._glyphs_for_scale()
+        # Текст місця в рейтингу свій для кожної гри, тож зберігається лише
+        # останній, а не в GlyphCache: ключ (шрифт, текст) і поверхня
+        self._rank_surface: Optional[Tuple[Tuple[Any, str], pygame.Surface]] = None
+
+        # Стан відстеження пошкоджених областей ігрового екрана
+        self._cell_keys: Dict[Tuple[int, int], tuple] = {}
+        self._widget_keys: Dict[str, Tuple[Any, pygame.Rect]] = {}
+        self._damage: Optional[List[pygame.Rect]] = None
+        # Екран, повністю намальований з відстеженням; None — жоден
+        self._tracking: Any = None
+
+    def _glyphs_for_scale(self) -> GlyphCache:
+        """Кеш гліфів поточного масштабу; найстаріший масштаб витісняється разом з його шарами"""
+        scale = self.layout.scale
+        glyphs = self._glyph_caches.get(scale)
+        if glyphs is not None:
+            self._glyph_caches.move_to_end(scale)
+            return glyphs
+
+        glyphs = self._glyph_caches[scale] = GlyphCache()
+        digits = [str(digit) for digit in range(1, GRID_SIZE + 1)]
+        for color in (FIXED_DIGIT_COLOR, VALUE_DIGIT_COLOR, INVALID_DIGIT_COLOR):
+            glyphs.preload(self.font, digits, color)
+        glyphs.preload(self.small_font, digits, NOTE_COLOR)
+
+        while len(self._glyph_caches) > MAX_CACHED_SCALES:
+            evicted, _ = self._glyph_caches.popitem(last=False)
+            evicted_cell = round(evicted * CELL_SIZE)
+            for key in [key for key in self._layers if key[1] == evicted_cell]:
+                del self._layers[key]
+        return glyphs
+
+    def set_layout(self, layout: Layout, font, small_font) -> None:
+        """Переходить на розмітку нового розміру вікна
+
+        Шрифти передаються вже створені для масштабу розмітки. Гліфи та
+        статичні шари беруться з кешу, якщо цей масштаб уже був, і
+        будуються один раз, якщо ні. Екран перемальовується повністю.
+        """
+        self.layout = layout
+        self.font = font
+        self.small_font = small_font
+        self.cell_size = layout.cell_size
+        self.glyphs = self._glyphs_for_scale()
+        self.invalidate()
+
+    def _cell_background(self, row: int, col: int, selected_cell: Optional[Tuple[int, int]]):
+        """Колір фону клітинки з урахуванням виділення"""
+        if selected_cell and selected_cell[0] == row and selected_cell[1] == col:
+            return LIGHT_BLUE  # Світло-блакитний для виділеної клітинки
+        if selected_cell and (selected_cell[0] == row or selected_cell[1] == col):
+            return LIGHT_BLUE_ALT  # Світло-синій для виділеного рядка/колонки
+        return WHITE
+
+    def _cell_rect(self, row: int, col: int) -> pygame.Rect:
+        return pygame.Rect(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
+
+    def _draw_cell(self, surface: pygame.Surface, cell: Cell, rect: pygame.Rect, bg_color) -> None:
+        """Малює фон і вміст однієї клітинки"""
+        surface.fill(bg_color, rect)
+
+        # Малювання значення клітинки
+        if cell.value != 0:
+            if cell.is_fixed:
+                color = FIXED_DIGIT_COLOR
+            else:
+                color = VALUE_DIGIT_COLOR if cell.is_valid else INVALID_DIGIT_COLOR
+            text = self.glyphs.get(self.font, str(cell.value), color)
+            surface.blit(text, text.get_rect(center=rect.center))
+        # Малювання заміток
+        elif len(cell.notes) > 0:
+            for note in cell.notes:
+                # Визначення позиції для кожної примітки (3x3 сітка всередині клітинки)
+                note_row = (note - 1) // 3
+                note_col = (note - 1) % 3
+                note_x = rect.x + note_col * (self.cell_size // 3) + self.cell_size // 6
+                note_y = rect.y + note_row * (self.cell_size // 3) + self.cell_size // 6
+
+                text = self.glyphs.get(self.small_font, str(note), NOTE_COLOR)
+                surface.blit(text, text.get_rect(center=(note_x, note_y)))
+
+    # --- Кеш статичних шарів ------------------------------------------
+
+    def _layer(self, name: str, build: Callable[[], pygame.Surface]) -> pygame.Surface:
+        """Повертає закешований шар, будуючи його при першому зверненні
+
+        Ключ включає розмір клітинки, тож для кожного масштабу шар
+        будується один раз.
+        """
+        key = (name, self.cell_size)
+        layer = self._layers.get(key)
+        if layer is None:
+            layer = self._layers[key] = build()
+        return layer
+
+    def invalidate_layers(self) -> None:
+        """Скидає всі кешовані шари, наприклад після зміни теми"""
+        self._layers.clear()
+        self.invalidate()
+
+    def _grid_area_size(self) -> Tuple[int, int]:
+        return GRID_SIZE * self.cell_size, GRID_SIZE * self.cell_size
+
+    def _build_grid_lines(self) -> pygame.Surface:
+        """Прозорий шар з лініями сітки"""
+        # Товсті лінії виходять за межі сітки на половину своєї товщини
+        width, height = self._grid_area_size()
+        thick = self.layout.size(3)
+        layer = pygame.Surface((width + thick, height + thick), pygame.SRCALPHA)
+        self._draw_grid_lines(layer)
+        return layer
+
+    def _draw_grid_lines(self, surface: pygame.Surface) -> None:
+        """Малює лінії сітки"""
         for i in range(GRID_SIZE + 1):
-            line_thickness = 3 if i % SUB_GRID_SIZE == 0 else 1
+            line_thickness = self.layout.size(3 if i % SUB_GRID_SIZE == 0 else 1)
 
             # Горизонтальні лінії
             pygame.draw.line(
@@ -80,98 +170,214 @@ class SudokuRenderer:
                 line_thickness
             )
 
-    def draw_blurred_grid(self, surface: pygame.Surface):
-        """Малює розмиту сітку для стану паузи"""
-        # Створюємо напівпрозорий overlay
-        overlay = pygame.Surface((GRID_SIZE * self.cell_size, GRID_SIZE * self.cell_size))
-        overlay.set_alpha(200)
-        overlay.fill(GRAY)
+    def draw_grid(self, surface: pygame.Surface, grid: List[List[Cell]], selected_cell: Optional[Tuple[int, int]]):
+        """Малює сітку судоку"""
+        for row in range(GRID_SIZE):
+            for col in range(GRID_SIZE):
+                self._draw_cell(surface, grid[row][col], self._cell_rect(row, col),
+                                self._cell_background(row, col, selected_cell))
 
-        # Малюємо основну структуру сітки без значень
-        for i in range(GRID_SIZE + 1):
-            line_thickness = 3 if i % SUB_GRID_SIZE == 0 else 1
+        surface.blit(self._layer('grid_lines', self._build_grid_lines), (0, 0))
 
-            # Горизонтальні лінії
-            pygame.draw.line(
-                overlay,
-                BLACK,
-                (0, i * self.cell_size),
-                (GRID_SIZE * self.cell_size, i * self.cell_size),
-                line_thickness
-            )
+    # --- Відстеження пошкоджених областей ------------------------------
 
-            # Вертикальні лінії
-            pygame.draw.line(
-                overlay,
-                BLACK,
-                (i * self.cell_size, 0),
-                (i * self.cell_size, GRID_SIZE * self.cell_size),
-                line_thickness
-            )
+    def invalidate(self) -> None:
+        """Змушує наступний кадр з відстеженням перемалювати весь екран"""
+        self._cell_keys.clear()
+        self._widget_keys.clear()
+        self._tracking = None
 
-        surface.blit(overlay, (0, 0))
+    def mark_dirty(self, rect: pygame.Rect) -> None:
+        """Додає область, яку треба вивести на екран у цьому кадрі"""
+        if self._damage is None:
+            self._damage = []
+        self._damage.append(pygame.Rect(rect))
 
-    def draw_buttons(self, surface: pygame.Surface, buttons: Dict):
-        """Малює кнопки керування грою"""
-        for button_name, button in buttons.items():
-            rect, text = button
-            pygame.draw.rect(surface, BLUE, rect)
-            pygame.draw.rect(surface, BLACK, rect, 2)  # Рамка кнопки
-            surface.blit(text, text.get_rect(center=rect.center))
+    def take_damage(self) -> Optional[List[pygame.Rect]]:
+        """Повертає змінені за кадр області та скидає їх
 
-    def draw_timer(self, surface: pygame.Surface, time_str: str):
-        """Малює таймер"""
-        timer_text = self.font.render(f"Час: {time_str}", True, BLACK)
-        timer_rect = timer_text.get_rect()
-        # Розміщуємо таймер під сіткою, але над кнопками
-        timer_rect.topleft = (10, GRID_SIZE * self.cell_size + 5)
-        surface.blit(timer_text, timer_rect)
+        None означає, що кадр намальовано без відстеження і його треба
+        показати повністю; тоді наступний кадр з відстеженням теж
+        перемальовує все.
+        """
+        damage, self._damage = self._damage, None
+        if damage is None:
+            self.invalidate()
+        return damage
 
-    def draw_pause_message(self, surface: pygame.Surface):
-        """Малює повідомлення про паузу"""
-        # Створюємо напівпрозорий фон для повідомлення
-        message_width = 350
-        message_height = 120
-        message_bg = pygame.Surface((message_width, message_height))
-        message_bg.set_alpha(240)
-        message_bg.fill(WHITE)
+    def _begin_tracked_frame(self, owner: Any) -> bool:
+        """Починає кадр з відстеженням; повертає True, якщо екран треба намалювати повністю
 
-        # Центруємо повідомлення відносно ігрової області (без UI)
-        game_area_center_x = (GRID_SIZE * self.cell_size) // 2
-        game_area_center_y = (GRID_SIZE * self.cell_size) // 2
+        Повне малювання потрібне, коли попередній кадр показував інший
+        екран (``owner``) або був намальований без відстеження.
+        """
+        if self._damage is None:
+            self._damage = []
+        full = self._tracking is not owner
+        if full:
+            self._cell_keys.clear()
+            self._widget_keys.clear()
+            self._tracking = owner
+        return full
+
+    def draw_widgets(self, surface: pygame.Surface, widgets: WidgetTree) -> None:
+        """Малює екран з дерева віджетів, перемальовуючи лише змінені віджети"""
+        if self._begin_tracked_frame(widgets):
+            surface.fill(widgets.background)
+            widgets.render(surface, full=True)
+            self._damage = [surface.get_rect()]
+        else:
+            for rect in widgets.render(surface):
+                self.mark_dirty(rect)
+
+    def _update_widget(self, surface: pygame.Surface, name: str, key: Any,
+                       draw: Callable[[], pygame.Rect]) -> None:
+        """Перемальовує елемент інтерфейсу, лише якщо змінився його ключ
+
+        ``draw`` малює елемент і повертає зайняту ним область; попередня
+        область спершу затирається фоном.
+        """
+        previous = self._widget_keys.get(name)
+        if previous is not None and previous[0] == key:
+            return
+
+        if previous is not None:
+            surface.fill(WHITE, previous[1])
+        rect = pygame.Rect(draw())
+        self._widget_keys[name] = (key, rect)
+        self.mark_dirty(rect if previous is None else rect.union(previous[1]))
+
+    def draw_playing_screen(self, surface: pygame.Surface, grid: List[List[Cell]],
+                            selected_cell: Optional[Tuple[int, int]], buttons: WidgetTree,
+                            time_str: str, hints_str: str) -> None:
+        """Малює ігровий екран, перемальовуючи лише змінені області
+
+        Для кожної клітинки запам'ятовується все, що впливає на її вигляд;
+        клітинка перемальовується (разом з лініями сітки в її межах) лише
+        тоді, коли цей ключ змінився. Так само відстежуються таймер,
+        лічильник підказок, а кнопки перемальовує їхнє дерево віджетів.
+        """
+        full = self._begin_tracked_frame('playing')
+        if full:
+            surface.fill(WHITE)
+
+        dirty_cells = []
+        for row in range(GRID_SIZE):
+            for col in range(GRID_SIZE):
+                cell = grid[row][col]
+                bg_color = self._cell_background(row, col, selected_cell)
+                key = (cell.value, cell.is_fixed, cell.is_valid, frozenset(cell.notes), bg_color)
+                if self._cell_keys.get((row, col)) != key:
+                    self._cell_keys[(row, col)] = key
+                    dirty_cells.append((cell, self._cell_rect(row, col), bg_color))
+
+        grid_lines = self._layer('grid_lines', self._build_grid_lines)
+        if full:
+            for cell, rect, bg_color in dirty_cells:
+                self._draw_cell(surface, cell, rect, bg_color)
+            surface.blit(grid_lines, (0, 0))
+        else:
+            for cell, rect, bg_color in dirty_cells:
+                self._draw_cell(surface, cell, rect, bg_color)
+                # Лінії сітки в межах клітинки беруться з того самого шару
+                surface.blit(grid_lines, rect, area=rect)
+                self.mark_dirty(rect)
+
+        for rect in buttons.render(surface, full):
+            self.mark_dirty(rect)
+
+        self._update_widget(surface, 'timer', time_str, lambda: self.draw_timer(surface, time_str))
+        self._update_widget(surface, 'hints', hints_str, lambda: self.draw_hints(surface, hints_str))
 
-        message_rect = message_bg.get_rect(center=(game_area_center_x, game_area_center_y))
-        surface.blit(message_bg, message_rect)
+        if full:
+            self._damage = [surface.get_rect()]
+
+    def _build_blurred_grid(self) -> pygame.Surface:
+        """Напівпрозорий шар з порожньою сіткою для стану паузи"""
+        overlay = pygame.Surface(self._grid_area_size())
+        overlay.set_alpha(200)
+        overlay.fill(GRAY)
+
+        # Основна структура сітки без значень
+        self._draw_grid_lines(overlay)
+        return overlay
+
+    def draw_blurred_grid(self, surface: pygame.Surface):
+        """Малює розмиту сітку для стану паузи"""
+        surface.blit(self._layer('blurred_grid', self._build_blurred_grid), (0, 0))
+
+    def draw_buttons(self, surface: pygame.Surface, buttons: WidgetTree):
+        """Малює всі кнопки керування грою (екрани без відстеження)"""
+        buttons.render(surface, full=True)
+
+    def draw_timer(self, surface: pygame.Surface, time_str: str) -> pygame.Rect:
+        """Малює таймер і повертає його область"""
+        # Розміщуємо таймер під сіткою, але над кнопками
+        return self.glyphs.blit_text(surface, self.font, f"Час: {time_str}", BLACK,
+                                     (self.layout.px(10), GRID_SIZE * self.cell_size + self.layout.px(5)))
+
+    def draw_hints(self, surface: pygame.Surface, hints_str: str) -> pygame.Rect:
+        """Малює лічильник підказок під другим рядом кнопок і повертає його область"""
+        return self.glyphs.blit_text(surface, self.small_font, hints_str, BLACK,
+                                     (self.layout.px(10), GRID_SIZE * self.cell_size + self.layout.px(95)))
+
+    def _build_pause_message(self) -> pygame.Surface:
+        """Шар з вікном повідомлення про паузу"""
+        px = self.layout.px
+        message_width = px(350)
+        message_height = px(120)
+        layer = pygame.Surface((message_width, message_height), pygame.SRCALPHA)
+        layer.fill((*WHITE, 240))
 
         # Рамка навколо повідомлення
-        pygame.draw.rect(surface, BLACK, message_rect, 3)
+        pygame.draw.rect(layer, BLACK, layer.get_rect(), self.layout.size(3))
+
+        center_x = message_width // 2
+        center_y = message_height // 2
 
         # Текст повідомлення
         pause_text = self.font.render("ПАУЗА", True, BLACK)
-        pause_rect = pause_text.get_rect(center=(game_area_center_x, game_area_center_y - 15))
-        surface.blit(pause_text, pause_rect)
+        layer.blit(pause_text, pause_text.get_rect(center=(center_x, center_y - px(15))))
 
         # Інструкція
         instruction_text = self.small_font.render("Натисніть 'P' або 'Пробіл' для продовження", True, BLACK)
-        instruction_rect = instruction_text.get_rect(center=(game_area_center_x, game_area_center_y + 15))
-        surface.blit(instruction_text, instruction_rect)
+        layer.blit(instruction_text, instruction_text.get_rect(center=(center_x, center_y + px(15))))
+        return layer
 
-    def draw_game_over(self, surface: pygame.Surface):
-        """Малює повідомлення про завершення гри"""
-        # Напівпрозорий overlay тільки для ігрової області
-        overlay = pygame.Surface((GRID_SIZE * self.cell_size, GRID_SIZE * self.cell_size))
-        overlay.set_alpha(180)
-        overlay.fill(BLACK)
-        surface.blit(overlay, (0, 0))
+    def draw_pause_message(self, surface: pygame.Surface):
+        """Малює повідомлення про паузу"""
+        layer = self._layer('pause_message', self._build_pause_message)
+
+        # Центруємо повідомлення відносно ігрової області (без UI)
+        width, height = self._grid_area_size()
+        surface.blit(layer, layer.get_rect(center=(width // 2, height // 2)))
+
+    def _build_game_over(self) -> pygame.Surface:
+        """Затемнення ігрової області разом з незмінним текстом привітання"""
+        width, height = self._grid_area_size()
+        layer = pygame.Surface((width, height), pygame.SRCALPHA)
+        layer.fill((*BLACK, 180))
 
         # Центруємо повідомлення відносно ігрової області
-        game_area_center_x = (GRID_SIZE * self.cell_size) // 2
-        game_area_center_y = (GRID_SIZE * self.cell_size) // 2
+        center_x = width // 2
+        center_y = height // 2
 
         text = self.font.render("Вітаємо! Ви розв'язали Судоку!", True, GREEN)
-        text_rect = text.get_rect(center=(game_area_center_x, game_area_center_y))
-        surface.blit(text, text_rect)
+        layer.blit(text, text.get_rect(center=(center_x, center_y)))
 
         subtext = self.small_font.render("Натисніть 'N', щоб почати нову гру", True, WHITE)
-        subtext_rect = subtext.get_rect(center=(game_area_center_x, game_area_center_y + 40))
-        surface.blit(subtext, subtext_rect)
\ No newline at end of file
+        layer.blit(subtext, subtext.get_rect(center=(center_x, center_y + self.layout.px(40))))
+        return layer
+
+    def draw_game_over(self, surface: pygame.Surface, rank_text: Optional[str] = None):
+        """Малює повідомлення про завершення гри"""
+        surface.blit(self._layer('game_over', self._build_game_over), (0, 0))
+
+        if rank_text:
+            width, height = self._grid_area_size()
+            key = (self.small_font, rank_text)
+            if self._rank_surface is None or self._rank_surface[0] != key:
+                self._rank_surface = (key, self.small_font.render(rank_text, True, WHITE))
+            rank_surface = self._rank_surface[1]
+            rank_rect = rank_surface.get_rect(center=(width // 2, height // 2 + self.layout.px(70)))
+            surface.blit(rank_surface, rank_rect)
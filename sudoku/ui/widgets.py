@@ -0,0 +1,308 @@
+"""
+Шар віджетів у режимі збереженого стану (retained mode)
+
+Екрани описуються один раз набором віджетів, кожен з яких тримає
+готову поверхню і перебудовує її лише після зміни тексту чи кольору.
+Дерево пам'ятає, які віджети змінилися, і перемальовує тільки їхні
+області, а натискання шукає через просторову сітку замість перебору
+всіх прямокутників.
+"""
+import pygame
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..config import BLACK, BLUE, WHITE
+
+# Розмір комірки просторової сітки для пошуку віджета під курсором, px
+HIT_GRID_CELL = 64
+
+
+class Widget:
+    """Базовий віджет: прямокутник і закешована поверхня
+
+    Підкласи реалізують ``_build`` — малювання вмісту на поверхню
+    розміру ``rect``. Поверхня будується при першому малюванні та після
+    ``invalidate``.
+    """
+
+    # Чи може віджет отримувати натискання
+    interactive = False
+
+    def __init__(self, name: str, rect: pygame.Rect):
+        self.name = name
+        self.rect = pygame.Rect(rect)
+        self.visible = True
+        self.dirty = True
+        self.tree: Optional['WidgetTree'] = None
+        self._surface: Optional[pygame.Surface] = None
+
+    def _build(self) -> pygame.Surface:
+        raise NotImplementedError
+
+    def invalidate(self) -> None:
+        """Позначає віджет для перебудови і перемальовування"""
+        self._surface = None
+        self.dirty = True
+
+    def set_rect(self, rect: pygame.Rect) -> None:
+        rect = pygame.Rect(rect)
+        if rect != self.rect:
+            self.rect = rect
+            self.invalidate()
+            if self.tree is not None:
+                self.tree.layout_changed()
+
+    def set_visible(self, visible: bool) -> None:
+        if visible != self.visible:
+            self.visible = visible
+            self.dirty = True
+            if self.tree is not None:
+                self.tree.layout_changed()
+
+    @property
+    def surface(self) -> pygame.Surface:
+        if self._surface is None:
+            self._surface = self._build()
+        return self._surface
+
+    def draw(self, target: pygame.Surface) -> None:
+        target.blit(self.surface, self.rect)
+
+
+class Label(Widget):
+    """Рядок тексту, вирівняний відносно точки прив'язки"""
+
+    def __init__(self, name: str, text: str, font: pygame.font.Font, color=BLACK,
+                 center: Optional[Tuple[int, int]] = None,
+                 topleft: Optional[Tuple[int, int]] = None):
+        self.text = text
+        self.font = font
+        self.color = color
+        self.anchor = ('center', center) if center is not None else ('topleft', topleft or (0, 0))
+        super().__init__(name, self._measure())
+
+    def _measure(self) -> pygame.Rect:
+        rect = pygame.Rect((0, 0), self.font.size(self.text))
+        setattr(rect, self.anchor[0], self.anchor[1])
+        return rect
+
+    def _build(self) -> pygame.Surface:
+        return self.font.render(self.text, True, self.color)
+
+    def set_text(self, text: str) -> None:
+        """Змінює текст; область віджета перераховується"""
+        if text != self.text:
+            self.text = text
+            self.set_rect(self._measure())
+            self.invalidate()
+
+
+class Button(Widget):
+    """Прямокутна кнопка з рамкою та текстом по центру"""
+
+    interactive = True
+
+    def __init__(self, name: str, rect: pygame.Rect, text: str, font: pygame.font.Font,
+                 color=BLUE, text_color=WHITE, border_color=BLACK, border: int = 2):
+        super().__init__(name, rect)
+        self.text = text
+        self.font = font
+        self.color = color
+        self.text_color = text_color
+        self.border_color = border_color
+        self.border = border
+
+    def _build(self) -> pygame.Surface:
+        surface = pygame.Surface(self.rect.size)
+        bounds = surface.get_rect()
+        surface.fill(self.color)
+        pygame.draw.rect(surface, self.border_color, bounds, self.border)
+        text = self.font.render(self.text, True, self.text_color)
+        surface.blit(text, text.get_rect(center=bounds.center))
+        return surface
+
+    def set_text(self, text: str) -> None:
+        if text != self.text:
+            self.text = text
+            self.invalidate()
+
+    def set_color(self, color) -> None:
+        if color != self.color:
+            self.color = color
+            self.invalidate()
+
+
+class Picture(Widget):
+    """Готова поверхня, наприклад заголовки колонок таблиці"""
+
+    def __init__(self, name: str, surface: pygame.Surface, topleft: Tuple[int, int]):
+        super().__init__(name, surface.get_rect(topleft=topleft))
+        self._picture = surface
+
+    def _build(self) -> pygame.Surface:
+        return self._picture
+
+
+class Canvas(Widget):
+    """Область, вміст якої малює функція ``paint(surface)``
+
+    Вміст перебудовується лише тоді, коли змінюється ключ, переданий у
+    ``set_key`` — наприклад позиція прокрутки таблиці.
+    """
+
+    def __init__(self, name: str, rect: pygame.Rect,
+                 paint: Callable[[pygame.Surface], None], background=WHITE):
+        super().__init__(name, rect)
+        self.paint = paint
+        self.background = background
+        self.key = None
+
+    def _build(self) -> pygame.Surface:
+        surface = pygame.Surface(self.rect.size)
+        surface.fill(self.background)
+        self.paint(surface)
+        return surface
+
+    def set_key(self, key) -> None:
+        if key != self.key:
+            self.key = key
+            self.invalidate()
+
+
+class WidgetTree:
+    """Впорядкований набір віджетів одного екрана
+
+    Віджети малюються в порядку додавання; пізніші лежать вище. Дерево
+    плоске — екранам гри вистачає одного рівня, — але області
+    перекриття враховуються: перемальована область відновлює всі
+    віджети, що в неї потрапляють, з обрізанням по її межах.
+    """
+
+    def __init__(self, background=WHITE, hit_cell: int = HIT_GRID_CELL):
+        self.background = background
+        self.hit_cell = hit_cell
+        self._widgets: List[Widget] = []
+        self._by_name: Dict[str, Widget] = {}
+        # Області, які віджети займали під час останнього малювання
+        self._drawn: Dict[str, pygame.Rect] = {}
+        # Області видалених віджетів, які ще треба затерти
+        self._removed_rects: List[pygame.Rect] = []
+        self._hit_grid: Optional[Dict[Tuple[int, int], List[Widget]]] = None
+
+    def add(self, widget: Widget) -> Widget:
+        if widget.name in self._by_name:
+            self.remove(widget.name)
+        widget.tree = self
+        widget.dirty = True
+        self._widgets.append(widget)
+        self._by_name[widget.name] = widget
+        self.layout_changed()
+        return widget
+
+    def remove(self, name: str) -> None:
+        widget = self._by_name.pop(name, None)
+        if widget is None:
+            return
+        self._widgets.remove(widget)
+        widget.tree = None
+        # Місце видаленого віджета треба затерти
+        if name in self._drawn:
+            self._removed_rects.append(self._drawn.pop(name))
+        self.layout_changed()
+
+    def clear(self) -> None:
+        for name in list(self._by_name):
+            self.remove(name)
+
+    def get(self, name: str) -> Optional[Widget]:
+        return self._by_name.get(name)
+
+    def __getitem__(self, name: str) -> Widget:
+        return self._by_name[name]
+
+    def __iter__(self) -> Iterator[Widget]:
+        return iter(self._widgets)
+
+    def __len__(self) -> int:
+        return len(self._widgets)
+
+    # --- Пошук за координатами ----------------------------------------
+
+    def layout_changed(self) -> None:
+        """Скидає просторову сітку після зміни розташування віджетів"""
+        self._hit_grid = None
+
+    def _build_hit_grid(self) -> Dict[Tuple[int, int], List[Widget]]:
+        grid: Dict[Tuple[int, int], List[Widget]] = {}
+        cell = self.hit_cell
+        for widget in self._widgets:
+            if not widget.interactive or not widget.visible:
+                continue
+            rect = widget.rect
+            for gx in range(rect.left // cell, (rect.right - 1) // cell + 1):
+                for gy in range(rect.top // cell, (rect.bottom - 1) // cell + 1):
+                    grid.setdefault((gx, gy), []).append(widget)
+        return grid
+
+    def widget_at(self, x: int, y: int) -> Optional[Widget]:
+        """Повертає верхній інтерактивний віджет у точці або None"""
+        if self._hit_grid is None:
+            self._hit_grid = self._build_hit_grid()
+        candidates = self._hit_grid.get((x // self.hit_cell, y // self.hit_cell))
+        if candidates:
+            for widget in reversed(candidates):
+                if widget.rect.collidepoint(x, y):
+                    return widget
+        return None
+
+    # --- Малювання ----------------------------------------------------
+
+    def invalidate(self) -> None:
+        """Позначає всі віджети для перемальовування (поверхні лишаються)"""
+        for widget in self._widgets:
+            widget.dirty = True
+
+    def render(self, surface: pygame.Surface, full: bool = False) -> List[pygame.Rect]:
+        """Малює віджети і повертає змінені області
+
+        З ``full=True`` малюються всі віджети (фон екрана заповнює
+        викликач); інакше — лише змінені, разом з тим, що лежить під
+        ними й над ними в тих самих областях.
+        """
+        if full:
+            self._removed_rects.clear()
+            damage = []
+            for widget in self._widgets:
+                widget.dirty = False
+                if widget.visible:
+                    widget.draw(surface)
+                    self._drawn[widget.name] = widget.rect.copy()
+                    damage.append(widget.rect.copy())
+                else:
+                    self._drawn.pop(widget.name, None)
+            return damage
+
+        damage = list(self._removed_rects)
+        self._removed_rects.clear()
+        for widget in self._widgets:
+            if not widget.dirty:
+                continue
+            widget.dirty = False
+            previous = self._drawn.pop(widget.name, None)
+            if widget.visible:
+                self._drawn[widget.name] = widget.rect.copy()
+                damage.append(widget.rect if previous is None else widget.rect.union(previous))
+            elif previous is not None:
+                damage.append(previous)
+
+        if not damage:
+            return damage
+
+        clip = surface.get_clip()
+        for area in damage:
+            surface.set_clip(area)
+            surface.fill(self.background, area)
+            for widget in self._widgets:
+                if widget.visible and widget.rect.colliderect(area):
+                    widget.draw(surface)
+        surface.set_clip(clip)
+        return damage
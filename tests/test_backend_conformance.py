@@ -0,0 +1,322 @@
+"""
+Спільний набір перевірок для всіх сховищ DatabaseFactory
+
+Кожен тест виконується для SQLite, пам'яті та журналу JSONL, тож нове
+сховище достатньо додати до BACKENDS, щоб перевірити його поведінку.
+"""
+import io
+import random
+
+import pytest
+
+from sudoku.database import BACKENDS, BACKEND_MEMORY, DatabaseFactory
+from sudoku.database.repositories import RAW_RECORD_COLUMNS
+from sudoku.models import Cell, Difficulty
+
+_SUFFIXES = {'sqlite': '.db', 'log': '.jsonl'}
+
+
+def _open_factory(backend, tmp_path, name='conformance'):
+    path = None if backend == BACKEND_MEMORY else str(tmp_path / f"{name}{_SUFFIXES[backend]}")
+    return DatabaseFactory(path, backend)
+
+
+@pytest.fixture(params=BACKENDS)
+def factory(request, tmp_path):
+    factory = _open_factory(request.param, tmp_path)
+    yield factory
+    factory.close()
+
+
+@pytest.fixture
+def services(factory):
+    return factory.initialize()
+
+
+def _raw_rows(count, seed=7):
+    """Детерміновані рядки у порядку RAW_RECORD_COLUMNS"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        difficulty = rng.choice(list(Difficulty)).name
+        rows.append((difficulty, rng.randint(60, 3600), rng.randint(0, 3),
+                     rng.randint(0, 500), f"2024-05-{i % 28 + 1:02d}T12:00:00"))
+    return rows
+
+
+def _csv(rows):
+    stream = io.StringIO()
+    stream.write(','.join(RAW_RECORD_COLUMNS) + '\n')
+    for row in rows:
+        stream.write(','.join(str(value) for value in row) + '\n')
+    stream.seek(0)
+    return stream
+
+
+def _order(records):
+    return [(record.score, record.completion_time) for record in records]
+
+
+# --- Статистика ---------------------------------------------------------
+
+def test_personal_stats(services):
+    records, _, _ = services
+    assert records.get_personal_stats()['total_games'] == 0
+
+    records.save_game_record(Difficulty.EASY, 100, 0)
+    records.save_game_record(Difficulty.EASY, 300, 1)
+    records.save_game_record(Difficulty.HARD, 200, 0)
+
+    stats = records.get_personal_stats()
+    assert stats['total_games'] == 3
+    assert stats['total_time'] == 600
+    assert stats['average_time'] == 200
+    assert stats['games_by_difficulty'] == {'EASY': 2, 'HARD': 1}
+    assert stats['best_scores']['EASY']['time'] == 100
+    assert stats['best_scores']['EASY']['hints_used'] == 0
+
+
+def test_imported_best_score_prefers_faster_game(services):
+    records, _, _ = services
+    records.import_records(_csv([
+        ('HARD', 900, 0, 250, '2024-05-01T12:00:00'),
+        ('HARD', 300, 2, 250, '2024-05-02T12:00:00'),
+        ('HARD', 100, 0, 120, '2024-05-03T12:00:00'),
+        ('HARD', 600, 1, 250, '2024-05-04T12:00:00'),
+    ]), chunk_size=2)
+
+    best = records.get_personal_stats()['best_scores']['HARD']
+    assert (best['score'], best['time'], best['hints_used']) == (250, 300, 2)
+
+
+# --- Таблиця лідерів ----------------------------------------------------
+
+def test_leaderboard_pagination(services):
+    records, _, _ = services
+    records.import_records(_csv(_raw_rows(57)))
+
+    for difficulty in [None] + list(Difficulty):
+        total = records.count_records(difficulty)
+        pages = []
+        page = 0
+        while True:
+            rows = records.get_leaderboard(difficulty, limit=10, page=page)
+            if not rows:
+                break
+            assert len(rows) <= 10
+            pages.extend(rows)
+            page += 1
+
+        assert len(pages) == total
+        assert len({record.id for record in pages}) == total
+        # Найкращий бал першим, за рівного балу — швидша гра
+        assert _order(pages) == sorted(_order(pages), key=lambda item: (-item[0], item[1]))
+        if difficulty is not None:
+            assert all(record.difficulty == difficulty for record in pages)
+
+    assert records.count_records() == 57
+
+
+# --- Місце та перцентиль ------------------------------------------------
+
+def test_rank_and_percentile(services):
+    records, _, _ = services
+    records.import_records(_csv(_raw_rows(40)))
+
+    board = records.get_leaderboard(Difficulty.MEDIUM, limit=100)
+    assert board
+    for position, record in enumerate(board):
+        rank = records.get_record_rank(record.id)
+        better = sum(1 for other in board
+                     if (other.score, -other.completion_time) > (record.score, -record.completion_time))
+        assert rank.rank == better + 1
+        assert rank.total == len(board)
+        assert 0.0 <= rank.percentile <= 100.0
+
+    # Ще не збережений результат враховується в загальній кількості
+    unsaved = records.get_rank(Difficulty.MEDIUM, 10_000, 1)
+    assert (unsaved.rank, unsaved.total) == (1, len(board))
+
+    low = records.estimate_percentile(Difficulty.MEDIUM, 0)
+    high = records.estimate_percentile(Difficulty.MEDIUM, 10_000)
+    assert low == 0.0 and high == 100.0
+    assert records.estimate_percentile(Difficulty.MEDIUM, board[len(board) // 2].score) is not None
+    assert records.get_record_rank(10_000) is None
+
+
+# --- Видалення ----------------------------------------------------------
+
+def test_delete_record(services):
+    records, _, _ = services
+    keep = records.save_game_record(Difficulty.EASY, 100, 0)
+    gone = records.save_game_record(Difficulty.EASY, 50, 0)
+    assert records.count_records(Difficulty.EASY) == 2
+
+    assert records.delete_record(gone)
+    assert not records.delete_record(gone)
+    assert records.repository.get_by_id(gone) is None
+    assert [record.id for record in records.get_leaderboard(Difficulty.EASY)] == [keep]
+    assert records.count_records(Difficulty.EASY) == 1
+    assert records.get_personal_stats()['total_games'] == 1
+
+
+# --- Збереження ігор ----------------------------------------------------
+
+def _grid(value):
+    return [[Cell(row, col, value if (row + col) % 2 else 0, is_fixed=row == 0)
+             for col in range(9)] for row in range(9)]
+
+
+def test_saved_games(services):
+    _, saves, _ = services
+    assert not saves.has_saves()
+    assert saves.get_latest_save() is None
+
+    solution = [[(row * 3 + row // 3 + col) % 9 + 1 for col in range(9)] for row in range(9)]
+    first = saves.save_game(Difficulty.EASY, _grid(1), solution, 30, 0)
+    second = saves.save_game(Difficulty.HARD, _grid(2), solution, 90, 2)
+
+    assert saves.has_saves()
+    assert saves.count_saves() == 2
+    assert {summary.id for summary in saves.get_save_summaries()} == {first, second}
+    assert len(saves.get_save_summaries(limit=1)) == 1
+
+    loaded = saves.load_game(second)
+    assert loaded.difficulty == Difficulty.HARD
+    assert loaded.solution == solution
+    assert loaded.current_state[0][1]['value'] == 2
+    assert (loaded.elapsed_time, loaded.hints_used) == (90, 2)
+
+    loaded.elapsed_time = 120
+    assert saves.update_save(loaded)
+    assert saves.load_game(second).elapsed_time == 120
+
+    assert saves.delete_save(first)
+    assert not saves.delete_save(first)
+    assert saves.load_game(first) is None
+    assert saves.count_saves() == 1
+    assert saves.get_latest_save().id == second
+
+
+# --- Налаштування -------------------------------------------------------
+
+def test_settings(services):
+    _, _, settings = services
+    assert settings.get_max_hints() == 5
+    assert settings.get_theme() == 'light'
+
+    assert settings.set_max_hints(3)
+    assert settings.set_settings({'theme': 'dark', 'sound_enabled': 'false'})
+    assert settings.get_max_hints() == 3
+    assert settings.get_theme() == 'dark'
+    assert not settings.is_sound_enabled()
+
+    # Значення читаються зі сховища, а не лише з кешу сервісу
+    settings.reload()
+    assert settings.get_all_settings()['theme'] == 'dark'
+
+    assert settings.set_setting('custom', 'x')
+    assert settings.delete_setting('custom')
+    assert settings.get_setting('custom') is None
+
+    assert settings.reset_settings()
+    assert settings.get_theme() == 'light'
+
+
+# --- Імпорт та експорт --------------------------------------------------
+
+@pytest.mark.parametrize('fmt', ['csv', 'jsonl'])
+def test_export_import_round_trip(factory, tmp_path, fmt):
+    records, _, _ = factory.initialize()
+    rows = _raw_rows(120)
+    assert records.import_records(_csv(rows)) == len(rows)
+
+    exported = io.StringIO()
+    assert records.export_records(exported, fmt, batch_size=16) == len(rows)
+
+    target = _open_factory(factory.backend, tmp_path, name='target')
+    try:
+        target_records, _, _ = target.initialize()
+        exported.seek(0)
+        assert target_records.import_records(exported, fmt, chunk_size=32) == len(rows)
+
+        again = io.StringIO()
+        target_records.export_records(again, fmt)
+        assert again.getvalue() == exported.getvalue()
+        assert target_records.get_personal_stats() == records.get_personal_stats()
+    finally:
+        target.close()
+
+
+def test_import_rejects_bad_input(services):
+    records, _, _ = services
+    with pytest.raises(ValueError):
+        records.import_records(io.StringIO("a,b,c\n1,2,3\n"))
+    with pytest.raises(ValueError):
+        records.import_records(_csv([('NIGHTMARE', 1, 0, 1, '2024-01-01T00:00:00')]))
+    with pytest.raises(ValueError):
+        records.export_records(io.StringIO(), 'xml')
+
+
+# --- Профілі ------------------------------------------------------------
+
+def test_profile_scoping(factory):
+    records, saves, settings = factory.initialize()
+    profiles = factory.create_profile_service()
+
+    alice_id = profiles.create_profile('Alice')
+    with pytest.raises(ValueError):
+        profiles.create_profile('Alice')
+    alice_records, alice_saves, alice_settings = factory.create_services(alice_id)
+
+    records.save_game_record(Difficulty.EASY, 100, 0)
+    alice_records.save_game_record(Difficulty.HARD, 200, 1)
+    alice_records.save_game_record(Difficulty.HARD, 250, 1)
+    alice_settings.set_theme('dark')
+    alice_saves.save_game(Difficulty.HARD, _grid(3), [[1] * 9] * 9, 10, 0)
+
+    assert records.count_records() == 1
+    assert alice_records.count_records() == 2
+    assert records.get_personal_stats()['games_by_difficulty'] == {'EASY': 1}
+    assert settings.get_theme() == 'light'
+    assert alice_settings.get_theme() == 'dark'
+    assert not saves.has_saves()
+    assert alice_saves.count_saves() == 1
+
+    exported = io.StringIO()
+    assert alice_records.export_records(exported) == 2
+
+    assert profiles.rename_profile(alice_id, 'Alicia')
+    assert profiles.get_profile(alice_id).name == 'Alicia'
+    assert profiles.delete_profile(alice_id)
+    assert profiles.get_profile(alice_id) is None
+
+    fresh_records, fresh_saves, _ = factory.create_services(alice_id)
+    assert fresh_records.count_records() == 0
+    assert not fresh_saves.has_saves()
+    assert records.count_records() == 1
+
+
+# --- Узгодженість між сховищами -----------------------------------------
+
+def test_backends_agree(tmp_path):
+    rows = _raw_rows(80, seed=11)
+    results = {}
+    for backend in BACKENDS:
+        factory = _open_factory(backend, tmp_path, name=f"agree-{backend}")
+        try:
+            records, _, _ = factory.initialize()
+            records.import_records(_csv(rows))
+            board = records.get_leaderboard(None, limit=25, page=1)
+            results[backend] = {
+                'stats': records.get_personal_stats(),
+                'board': [(r.difficulty, r.score, r.completion_time, r.hints_used) for r in board],
+                'rank': records.get_rank(Difficulty.EASY, 250, 600),
+                'percentile': records.estimate_percentile(Difficulty.HARD, 250),
+            }
+        finally:
+            factory.close()
+
+    expected = results[BACKENDS[0]]
+    for backend, result in results.items():
+        assert result == expected, backend
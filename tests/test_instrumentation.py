@@ -0,0 +1,49 @@
+"""
+Журнал повільних запитів InstrumentedConnection
+"""
+import logging
+import sqlite3
+import threading
+
+import pytest
+
+from sudoku.database import InstrumentedConnection, QueryMetrics
+from sudoku.database.instrumentation import COMMIT_STATEMENT
+
+
+@pytest.fixture
+def connection():
+    # Нульовий поріг: кожен запит, до якого застосовується поріг, повільний
+    metrics = QueryMetrics(slow_query_ms=0.0, logger=logging.getLogger('test.instrumentation'))
+    raw = sqlite3.connect(':memory:', check_same_thread=False)
+    raw.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value INTEGER)")
+    yield InstrumentedConnection(raw, metrics)
+    raw.close()
+
+
+def test_bulk_statements_and_commit_are_not_reported_as_slow(connection, caplog):
+    caplog.set_level(logging.WARNING, logger='test.instrumentation')
+    connection.executemany("INSERT INTO items (value) VALUES (?)", [(i,) for i in range(100)])
+    connection.commit()
+
+    assert not caplog.records
+    stats = connection.metrics.snapshot()
+    insert = stats["INSERT INTO items (value) VALUES (?)"]
+    assert (insert['calls'], insert['rows'], insert['slow_calls']) == (1, 100, 0)
+    assert stats[COMMIT_STATEMENT]['calls'] == 1
+    assert stats[COMMIT_STATEMENT]['slow_calls'] == 0
+
+
+def test_slow_query_is_explained_once(connection, caplog):
+    caplog.set_level(logging.WARNING, logger='test.instrumentation')
+    threads = [threading.Thread(target=lambda: connection.execute("SELECT value FROM items WHERE value > ?", (1,)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert sum(message.startswith('Slow query') for message in messages) == 8
+    assert sum(message.strip().startswith('plan:') for message in messages) == 1
+    assert connection.metrics.snapshot()["SELECT value FROM items WHERE value > ?"]['slow_calls'] == 8
@@ -0,0 +1,135 @@
+"""
+Обслуговування бази: згортання старих рекордів порціями під час простою
+"""
+import io
+
+import pytest
+
+from sudoku.database import DatabaseFactory, DatabaseMaintenance, MigrationRunner
+from sudoku.database.migrations import MIGRATION_VACUUM_MAX_PAGES
+from sudoku.database.repositories import RAW_RECORD_COLUMNS
+from sudoku.game.database_integration import GameDatabaseManager
+from sudoku.models import Difficulty
+
+
+def _old_records(difficulty, count):
+    lines = [','.join(RAW_RECORD_COLUMNS)]
+    lines += [f"{difficulty},{100 + i},0,{i % 300},2020-01-{i % 28 + 1:02d}T12:00:00" for i in range(count)]
+    return io.StringIO('\n'.join(lines) + '\n')
+
+
+@pytest.fixture
+def database(tmp_path):
+    factory = DatabaseFactory(str(tmp_path / 'maintenance.db'))
+    records, _, _ = factory.initialize()
+    records.import_records(_old_records('EASY', 1200))
+    records.import_records(_old_records('MEDIUM', 300))
+    yield factory, records
+    factory.close()
+
+
+def test_idle_steps_are_bounded(database):
+    factory, records = database
+    stats_before = records.get_personal_stats()
+    maintenance = DatabaseMaintenance(factory.db_manager, keep_top=50, rollup_batch=500)
+
+    steps = []
+    while not maintenance.idle_job_done:
+        steps.append(maintenance.run_idle_step())
+        assert len(steps) < 20
+
+    rolled = [step.records_rolled_up for step in steps]
+    assert max(rolled) <= 500
+    assert sum(rolled) == (1200 - 50) + (300 - 50)
+    # Кожен крок торкається лише одного профілю
+    assert all(len(step.details) <= 1 for step in steps)
+
+    records.invalidate_cache()
+    assert records.count_records(Difficulty.EASY) == 50
+    assert records.count_records(Difficulty.MEDIUM) == 50
+    assert records.get_personal_stats() == stats_before
+
+    # Після згортання кроки лише звільняють сторінки
+    assert maintenance.run_idle_step().records_rolled_up == 0
+
+
+def test_full_run_matches_idle_steps(database):
+    factory, records = database
+    report = DatabaseMaintenance(factory.db_manager, keep_top=50).run()
+    assert report.records_rolled_up == (1200 - 50) + (300 - 50)
+    records.invalidate_cache()
+    assert records.count_records() == 100
+
+
+def _auto_vacuum(conn):
+    return conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+
+def test_small_database_is_converted_by_migration(database):
+    factory, _ = database
+    assert _auto_vacuum(factory.db_manager.get_connection()) == 2
+    assert not DatabaseMaintenance(factory.db_manager).needs_full_vacuum()
+
+
+def test_large_database_is_converted_only_by_full_run(tmp_path):
+    db_path = str(tmp_path / 'large.db')
+    factory = DatabaseFactory(db_path)
+    factory.initialize()
+    conn = factory.db_manager.get_connection()
+    # База версії 4: без auto_vacuum і більша за MIGRATION_VACUUM_MAX_PAGES
+    conn.execute("PRAGMA auto_vacuum = NONE")
+    conn.execute("VACUUM")
+    conn.execute("CREATE TABLE filler (data BLOB)")
+    conn.executemany("INSERT INTO filler VALUES (zeroblob(1048576))", [()] * (MIGRATION_VACUUM_MAX_PAGES // 256 + 2))
+    conn.execute("DELETE FROM filler WHERE rowid % 2 = 0")
+    conn.commit()
+    conn.execute("PRAGMA user_version = 4")
+
+    MigrationRunner().migrate(conn)
+    assert _auto_vacuum(conn) == 0
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+
+    maintenance = DatabaseMaintenance(factory.db_manager)
+    assert maintenance.needs_full_vacuum()
+    # Кроки простою не переписують файл бази
+    for _ in range(5):
+        maintenance.run_idle_step()
+    assert maintenance.idle_job_done
+    assert _auto_vacuum(conn) == 0
+    assert conn.execute("PRAGMA page_count").fetchone()[0] == pages
+
+    report = maintenance.run()
+    assert _auto_vacuum(conn) == 2
+    assert report.pages_freed > 0
+    assert conn.execute("PRAGMA page_count").fetchone()[0] == pages - report.pages_freed
+    assert not maintenance.needs_full_vacuum()
+    factory.close()
+
+
+def test_rank_after_rollup_uses_all_games(tmp_path):
+    game_db = GameDatabaseManager(str(tmp_path / 'rank.db'))
+    try:
+        records = game_db.game_record_service
+        lines = [','.join(RAW_RECORD_COLUMNS)]
+        lines += [f"EASY,{600 + i},0,{50 + i % 51},2020-01-{i % 28 + 1:02d}T12:00:00" for i in range(1200)]
+        records.import_records(io.StringIO('\n'.join(lines) + '\n'))
+        # 25 хвилин без підказок — бал 75, середина розподілу
+        before = records.get_rank(Difficulty.EASY, 75, 1500)
+
+        game_db.maintenance = DatabaseMaintenance(game_db.db_manager, keep_top=50)
+        assert game_db.maintenance.run().records_rolled_up == 1200 - 50
+        records.invalidate_cache()
+
+        rank = game_db.complete_game(Difficulty.EASY, 1500, 0)
+        assert rank.total == 1201
+        assert abs(rank.rank - before.rank) <= 1201 * 0.05
+        assert abs(rank.percentile - before.percentile) <= 5.0
+
+        # Результат серед збережених найкращих і далі рахується точно
+        best = game_db.complete_game(Difficulty.EASY, 60, 0)
+        better = sum(1 for record in records.get_leaderboard(Difficulty.EASY, limit=100)
+                     if (record.score, -record.completion_time) > (99, -60))
+        assert (best.rank, best.total) == (better + 1, 1202)
+        assert best.rank < 50
+    finally:
+        game_db.close()
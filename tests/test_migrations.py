@@ -0,0 +1,68 @@
+"""
+Повторне застосування міграцій до вже оновленої бази
+"""
+import sqlite3
+
+import pytest
+
+from sudoku.database import DatabaseFactory, LATEST_VERSION, MigrationRunner
+from sudoku.models import Difficulty
+
+
+@pytest.fixture
+def populated(tmp_path):
+    """База останньої версії з даними у двох профілях"""
+    db_path = str(tmp_path / 'migrations.db')
+    factory = DatabaseFactory(db_path)
+    records, _, settings = factory.initialize()
+    records.save_game_record(Difficulty.EASY, 120, 0)
+    records.save_game_record(Difficulty.HARD, 600, 2)
+    settings.set_theme('dark')
+
+    other_id = factory.create_profile_service().create_profile('second')
+    other_records, _, other_settings = factory.create_services(other_id)
+    other_records.save_game_record(Difficulty.MEDIUM, 300, 1)
+    other_settings.set_max_hints(2)
+    factory.close()
+    return db_path, other_id
+
+
+@pytest.mark.parametrize('from_version', [0, 5])
+def test_replaying_migrations_keeps_data(populated, from_version):
+    db_path, other_id = populated
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute(f"PRAGMA user_version = {from_version}")
+    assert MigrationRunner().migrate(conn) == LATEST_VERSION
+
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(game_records)")]
+    assert columns.count('profile_id') == 1
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert not {name for name in tables if name.endswith('_new')}
+    conn.close()
+
+    factory = DatabaseFactory(db_path)
+    try:
+        records, _, settings = factory.initialize()
+        assert records.count_records() == 2
+        assert settings.get_theme() == 'dark'
+        stats = records.get_personal_stats()
+        assert stats['games_by_difficulty'] == {'EASY': 1, 'HARD': 1}
+
+        other_records, _, other_settings = factory.create_services(other_id)
+        assert other_records.count_records() == 1
+        assert other_settings.get_max_hints() == 2
+    finally:
+        factory.close()
+
+
+def test_profile_export_reads_only_its_rows(populated):
+    db_path, other_id = populated
+    conn = sqlite3.connect(db_path)
+    plan = ' '.join(row[-1] for row in conn.execute("""
+        EXPLAIN QUERY PLAN
+        SELECT * FROM game_records INDEXED BY idx_game_records_profile
+        WHERE profile_id = ? ORDER BY id
+    """, (other_id,)))
+    conn.close()
+    assert 'SEARCH game_records USING INDEX idx_game_records_profile' in plan
+    assert 'TEMP B-TREE' not in plan
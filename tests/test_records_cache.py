@@ -0,0 +1,88 @@
+"""
+Спільний кеш запитів рекордів між основним сервісом і читачем екрана рекордів
+"""
+import threading
+
+from sudoku.database import QueryCache
+from sudoku.game.database_integration import GameDatabaseManager
+from sudoku.models import Difficulty
+
+
+def _count_queries(service):
+    """Підраховує звернення сервісу до репозиторію"""
+    calls = []
+    for name in ('count_by_difficulty', 'get_by_difficulty', 'get_difficulty_stats'):
+        original = getattr(service.repository, name)
+
+        def wrapper(*args, _original=original, _name=name, **kwargs):
+            calls.append(_name)
+            return _original(*args, **kwargs)
+
+        setattr(service.repository, name, wrapper)
+    return calls
+
+
+def _read_page(service):
+    return (service.count_records(Difficulty.EASY),
+            [record.id for record in service.get_leaderboard(Difficulty.EASY, limit=10)],
+            service.get_personal_stats()['total_games'])
+
+
+def test_reader_shares_cache_with_game(tmp_path):
+    game_db = GameDatabaseManager(str(tmp_path / 'records.db'))
+    try:
+        game_db.complete_game(Difficulty.EASY, 120, 0)
+
+        first, close_first = game_db.open_record_reader()
+        assert first.cache is game_db.game_record_service.cache
+        before = _read_page(first)
+        close_first()
+
+        # Повторне відкриття екрана не звертається до бази
+        second, close_second = game_db.open_record_reader()
+        calls = _count_queries(second)
+        assert _read_page(second) == before
+        assert calls == []
+
+        # Новий рекорд скидає кеш і для читача
+        game_db.complete_game(Difficulty.EASY, 90, 0)
+        count, board, total = _read_page(second)
+        assert calls
+        assert (count, total) == (2, 2)
+        assert len(board) == 2
+        close_second()
+    finally:
+        game_db.close()
+
+
+def test_load_started_before_invalidate_is_not_stored():
+    cache = QueryCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_load():
+        started.set()
+        release.wait(5)
+        return 'stale'
+
+    worker = threading.Thread(target=lambda: cache.get_or_load(('count', None), slow_load))
+    worker.start()
+    assert started.wait(5)
+    cache.invalidate()
+    release.set()
+    worker.join(5)
+
+    assert len(cache) == 0
+    assert cache.get_or_load(('count', None), lambda: 'fresh') == 'fresh'
+
+
+def test_invalidate_by_difficulty():
+    cache = QueryCache()
+    for key in (('count', Difficulty.EASY), ('count', Difficulty.HARD), ('count', None), ('stats',)):
+        cache.get_or_load(key, lambda: 1)
+
+    cache.invalidate(Difficulty.EASY)
+    assert cache.get_or_load(('count', Difficulty.HARD), lambda: 2) == 1
+    assert cache.get_or_load(('count', Difficulty.EASY), lambda: 2) == 2
+    assert cache.get_or_load(('count', None), lambda: 2) == 2
+    assert cache.get_or_load(('stats',), lambda: 2) == 2
@@ -0,0 +1,83 @@
+"""
+Синхронізація рекордів із сервером-заглушкою: повтори не дублюють дані
+"""
+import pytest
+
+from sudoku.database import DatabaseFactory, RecordSync, SyncError
+from sudoku.database.sync_stub_server import SyncStubServer
+from sudoku.models import Difficulty
+
+
+@pytest.fixture
+def records(tmp_path):
+    factory = DatabaseFactory(str(tmp_path / 'sync.db'))
+    record_service, _, _ = factory.initialize()
+    yield factory.db_path, record_service
+    factory.close()
+
+
+@pytest.fixture
+def server():
+    stub = SyncStubServer().start()
+    yield stub
+    stub.stop()
+
+
+def _add(record_service, count):
+    for _ in range(count):
+        record_service.save_game_record(Difficulty.EASY, 120, 0)
+
+
+def _sync(db_path, server, **kwargs):
+    return RecordSync(db_path, server.url, backoff_base=0.01, timeout=2.0, **kwargs)
+
+
+def test_uploads_new_records_in_batches(records, server):
+    db_path, record_service = records
+    _add(record_service, 7)
+    sync = _sync(db_path, server, batch_size=3)
+    try:
+        assert sync.run_once() == 7
+        assert sync.run_once() == 0
+        assert server.record_ids == list(range(1, 8))
+        assert sync.get_high_water_mark() == 7
+        assert sync.get_pending_range() is None
+    finally:
+        sync.stop()
+
+
+def test_lost_response_with_record_inserted_before_retry(records, server):
+    db_path, record_service = records
+    _add(record_service, 3)
+    sync = _sync(db_path, server, batch_size=10)
+    try:
+        # Сервер зберігає пакет 1-3, але обидві спроби лишаються без відповіді
+        server.drop_next_responses(2)
+        with pytest.raises(SyncError):
+            sync.run_once()
+        assert server.record_ids == [1, 2, 3]
+        assert sync.get_high_water_mark() == 0
+        assert sync.get_pending_range() == (1, 3)
+
+        _add(record_service, 1)
+        assert sync.run_once() == 4
+        assert server.record_ids == [1, 2, 3, 4]
+        assert sync.get_pending_range() is None
+    finally:
+        sync.stop()
+
+
+def test_retry_after_server_error(records, server):
+    db_path, record_service = records
+    _add(record_service, 2)
+    sync = _sync(db_path, server)
+    try:
+        server.fail_next(503)
+        with pytest.raises(SyncError) as error:
+            sync.run_once()
+        assert error.value.retryable
+        _add(record_service, 1)
+        sync.run_once()
+        assert server.record_ids == [1, 2, 3]
+    finally:
+        sync.stop()